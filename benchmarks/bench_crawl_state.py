@@ -0,0 +1,61 @@
+"""
+Crawl Step Overhead Benchmark
+
+Time per crawl step (one pass through the five graph nodes)
+with the pydantic CrawlState as graph state ("before") against
+the slotted LoopState ("after"), for crawls that already carry
+N visited pages and N action records.
+
+The page is a dashboard so every step continues; the run is
+cut off by the recursion limit.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_crawl_state.py
+"""
+
+import time
+from langgraph.errors import GraphRecursionError
+from crawlergraph.graph import build_graph
+from crawlergraph.loop_state import LoopState
+from crawlergraph.state import ActionRecord, ActionType, CrawlState, PageFeatures
+
+HISTORY_SIZES = (0, 1_000, 10_000, 50_000)
+STEPS = 40
+NODES_PER_STEP = 5
+REPEAT = 3
+
+
+def make_state(schema: type, history: int):
+    state = CrawlState(
+        run_id="bench",
+        current_url="https://example.com/dashboard",
+        page_features=PageFeatures(content_block_count=4),
+        max_pages=10**9,
+        visited_pages={f"https://example.com/p/{i}" for i in range(history)},
+        url_visit_counts={f"https://example.com/p/{i}": 1 for i in range(history)},
+        action_history=[ActionRecord(action=ActionType.CLICK, target=None) for _ in range(history)],
+    )
+    return state if schema is CrawlState else LoopState.from_crawl_state(state)
+
+def per_step_us(schema: type, history: int) -> float:
+    graph = build_graph(schema)
+    best = float("inf")
+    for _ in range(REPEAT):
+        state = make_state(schema, history)
+        start = time.perf_counter()
+        try:
+            graph.invoke(state, {"recursion_limit": STEPS * NODES_PER_STEP})
+        except GraphRecursionError:
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best / STEPS * 1e6
+
+def main() -> None:
+    print(f"{'history':>8}{'CrawlState us':>16}{'LoopState us':>15}{'speedup':>9}")
+    for history in HISTORY_SIZES:
+        before = per_step_us(CrawlState, history)
+        after = per_step_us(LoopState, history)
+        print(f"{history:>8}{before:>16.0f}{after:>15.0f}{before / after:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
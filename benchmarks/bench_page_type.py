@@ -0,0 +1,55 @@
+"""
+Page Type Classifier Microbenchmark
+
+Per-call latency of the compiled rule cascade against the
+interpreted rule spec, over a mix of inputs that exit at
+early, middle and late rules.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_page_type.py
+"""
+
+import timeit
+from crawlergraph.classifiers.page_type import classify_page_type
+from crawlergraph.classifiers.page_type_rules import FALLBACK, PAGE_TYPE_RULES
+from crawlergraph.state import PageFeatures, RuntimeSignals
+
+CASES = {
+    "server_error": (PageFeatures(), RuntimeSignals(status_code=500)),
+    "login_form": (
+        PageFeatures(has_password_input=True, has_username_input=True, submit_button_count=1),
+        RuntimeSignals(),
+    ),
+    "listing": (PageFeatures(table_count=2), RuntimeSignals()),
+    "dashboard": (PageFeatures(content_block_count=4), RuntimeSignals()),
+    "unknown": (PageFeatures(), RuntimeSignals()),
+}
+
+NUMBER = 200_000
+REPEAT = 5
+
+
+def interpreted(features, signals):
+    inputs = {"features": features, "signals": signals}
+    for rule in PAGE_TYPE_RULES:
+        if all(c.evaluate(inputs) for c in rule.when):
+            return rule.page_type, rule.confidence
+    return FALLBACK
+
+def per_call_ns(function, features, signals) -> float:
+    best = min(timeit.repeat(
+        lambda: function(features, signals),
+        number=NUMBER,
+        repeat=REPEAT,
+    ))
+    return best / NUMBER * 1e9
+
+def main() -> None:
+    print(f"{'case':<14}{'compiled ns':>14}{'interpreted ns':>16}")
+    for name, (features, signals) in CASES.items():
+        compiled = per_call_ns(classify_page_type, features, signals)
+        reference = per_call_ns(interpreted, features, signals)
+        print(f"{name:<14}{compiled:>14.0f}{reference:>16.0f}")
+
+if __name__ == "__main__":
+    main()
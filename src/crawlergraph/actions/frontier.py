@@ -0,0 +1,371 @@
+"""
+Crawl Frontier
+
+decide_action picks one action for the current page; when that
+page is a dead end the crawl has nowhere to go. The Frontier
+queues every candidate (a URL, optionally with an action to take
+on it) and hands back the best one that may be fetched now:
+
+    priority    pluggable scorer (see actions.scoring), computed
+                once at push time; highest first, ties within a
+                host in push order
+    dedup       a candidate is queued at most once and never
+                after it was taken: plain URLs are keyed by URL
+                (and dropped when in `visited`), actions by the
+                fingerprint of the page they act on (`source`,
+                else the URL) and action_key, like page
+                transitions (see memory.transitions)
+    politeness  per host: at most `max_in_flight` candidates
+                popped and not yet done(), and at least
+                `min_delay` seconds between pops
+
+Each host has its own heap; hosts that may be fetched now sit in
+an IndexedHeap keyed by their best score, hosts in their delay in
+a heap by ready time. Push, pop and done are O(log n).
+
+With `spill_path`, candidates beyond `max_in_memory` are written
+to a SQLite table indexed by (host, score, seq) instead of the
+heaps. A host's spilled candidates are read back in batches when
+they outrank its in-memory ones, so pop order is unchanged. For
+millions of candidates, pass a ScalableBloomFilter as `seen` to
+bound the dedup memory too.
+
+Actions taken outside the frontier, such as decide_action's own
+decision, are recorded with mark_taken(): the frontier never
+hands them out, and drops a queued copy when it comes up.
+
+new_frontier() builds one from CrawlConfig. In a run,
+decide_action queues each page's links and alternative actions
+and, on a dead end, takes the best candidate instead of stopping.
+
+NO LangGraph logic
+"""
+
+import heapq
+import json
+import sqlite3
+import time
+from typing import Any, Callable, Container, Dict, List, Optional, Tuple
+from crawlergraph.actions.models import ActionDecision, FrontierEntry
+from crawlergraph.actions.scoring import NoveltyScorer, Scorer, bfs_score, dfs_score
+from crawlergraph.io.input_schema import CrawlConfig
+from crawlergraph.memory.transitions import action_key
+from crawlergraph.memory.url_templates import TemplateMiner, new_template_miner
+from crawlergraph.utils.heaps import IndexedHeap
+from crawlergraph.utils.urls import canonicalize_url
+
+# Spilled candidates read back per refill
+SPILL_BATCH = 1024
+
+
+class _Host:
+    __slots__ = ("heap", "disk_best", "in_flight", "ready_at")
+
+    def __init__(self) -> None:
+        # (-score, seq, entry)
+        self.heap: List[Tuple[float, int, FrontierEntry]] = []
+        # (score, -seq) of the best spilled candidate, None when
+        # nothing is spilled
+        self.disk_best: Optional[Tuple[float, int]] = None
+        self.in_flight = 0
+        self.ready_at = 0.0
+
+    def best(self) -> Optional[float]:
+        memory = -self.heap[0][0] if self.heap else None
+        if self.disk_best is None:
+            return memory
+        if memory is None:
+            return self.disk_best[0]
+        return max(memory, self.disk_best[0])
+
+    def disk_first(self) -> bool:
+        # Spilled candidate outranks every in-memory one
+        if self.disk_best is None:
+            return False
+        if not self.heap:
+            return True
+        score, seq, _ = self.heap[0]
+        return self.disk_best > (-score, -seq)
+
+
+class Frontier:
+    """
+    Priority queue of crawl candidates with per-host politeness.
+
+    Args:
+        scorer: Priority of a candidate (default breadth-first)
+        visited: Container of visited canonical URLs (e.g. the
+            state's visited_pages) checked on push
+        seen: Dedup container for queued and taken keys
+            (default a set)
+        min_delay: Seconds between pops for one host
+        max_in_flight: Popped, not yet done() candidates per host
+            (None: unlimited)
+        max_in_memory: Candidates kept in memory when spilling
+        spill_path: SQLite file for candidates beyond
+            `max_in_memory` (None: keep everything in memory)
+    """
+
+    def __init__(
+        self,
+        scorer: Scorer = bfs_score,
+        visited: Container[str] | None = None,
+        seen: Any = None,
+        min_delay: float = 0.0,
+        max_in_flight: int | None = None,
+        max_in_memory: int = 100_000,
+        spill_path: str | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.scorer = scorer
+        self.visited = visited
+        self.min_delay = min_delay
+        self.max_in_flight = max_in_flight
+        self.max_in_memory = max_in_memory
+        self._clock = clock
+
+        self._seen = seen if seen is not None else set()
+        # Keys taken while possibly queued; dropped when popped
+        self._taken: set = set()
+        self._hosts: Dict[str, _Host] = {}
+        # Hosts with candidates that may be fetched now, by best score
+        self._ready: IndexedHeap[str] = IndexedHeap()
+        # (ready_at, host) of hosts in their politeness delay
+        self._waiting: List[Tuple[float, str]] = []
+        self._seq = 0
+        self._size = 0
+        self._in_memory = 0
+
+        self._disk: sqlite3.Connection | None = None
+        if spill_path is not None:
+            self._disk = _open_spill(spill_path)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def in_memory(self) -> int:
+        return self._in_memory
+
+    def push(
+        self,
+        url: str,
+        action: ActionDecision | None = None,
+        depth: int = 0,
+        source: str | None = None,
+    ) -> bool:
+        """
+        Queue a candidate; False if it is a duplicate, was taken,
+        or is a plain URL already visited.
+        """
+        url = canonicalize_url(url)
+        key = _candidate_key(url, action, source)
+        if key in self._seen:
+            return False
+        if action is None and self.visited is not None and url in self.visited:
+            return False
+        self._seen.add(key)
+
+        entry = FrontierEntry(url, action, depth, source)
+        entry.score = self.scorer(entry)
+        self._seq += 1
+        host = self._hosts.get(entry.host)
+        if host is None:
+            host = self._hosts[entry.host] = _Host()
+
+        if self._disk is not None and self._in_memory >= self.max_in_memory:
+            self._spill(entry, self._seq)
+            rank = (entry.score, -self._seq)
+            if host.disk_best is None or rank > host.disk_best:
+                host.disk_best = rank
+        else:
+            heapq.heappush(host.heap, (-entry.score, self._seq, entry))
+            self._in_memory += 1
+
+        self._size += 1
+        self._schedule(entry.host, self._clock())
+        return True
+
+    def mark_taken(
+        self,
+        url: str,
+        action: ActionDecision | None = None,
+        source: str | None = None,
+    ) -> None:
+        """
+        Record a candidate taken outside the frontier, so it is
+        neither queued nor popped afterwards.
+        """
+        key = _candidate_key(canonicalize_url(url), action, source)
+        if key in self._seen:
+            self._taken.add(key)
+        else:
+            self._seen.add(key)
+
+    def pop(self) -> FrontierEntry | None:
+        """
+        Best candidate whose host may be fetched now, or None
+        (see next_ready_at for when to try again).
+        """
+        now = self._clock()
+        self._wake(now)
+        while True:
+            top = self._ready.peek()
+            if top is None:
+                return None
+
+            name = top[0]
+            host = self._hosts[name]
+            if host.disk_first():
+                self._refill(name, host)
+            entry = heapq.heappop(host.heap)[2]
+            self._in_memory -= 1
+            self._size -= 1
+
+            if not self._taken:
+                break
+            key = _candidate_key(entry.url, entry.action, entry.source)
+            if key not in self._taken:
+                break
+            self._taken.discard(key)
+            self._schedule(name, now)
+
+        host.in_flight += 1
+        if self.min_delay > 0:
+            host.ready_at = now + self.min_delay
+            heapq.heappush(self._waiting, (host.ready_at, name))
+        self._schedule(name, now)
+        return entry
+
+    def done(self, entry: FrontierEntry) -> None:
+        """
+        Mark a popped candidate as fetched, freeing its host slot.
+        """
+        host = self._hosts[entry.host]
+        host.in_flight = max(0, host.in_flight - 1)
+        self._schedule(entry.host, self._clock())
+
+    def next_ready_at(self) -> float | None:
+        """
+        Clock time at which pop() can next return a candidate
+        held back by a politeness delay.
+        """
+        self._wake(self._clock())
+        while self._waiting:
+            ready_at, name = self._waiting[0]
+            if self._hosts[name].ready_at == ready_at:
+                return ready_at
+            heapq.heappop(self._waiting)
+        return None
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    # Internals
+    def _schedule(self, name: str, now: float) -> None:
+        host = self._hosts[name]
+        best = host.best()
+        fetchable = (
+            best is not None
+            and host.ready_at <= now
+            and (self.max_in_flight is None or host.in_flight < self.max_in_flight)
+        )
+        if fetchable:
+            self._ready.push(name, best)
+        elif name in self._ready:
+            self._ready.remove(name)
+
+    def _wake(self, now: float) -> None:
+        while self._waiting and self._waiting[0][0] <= now:
+            _, name = heapq.heappop(self._waiting)
+            self._schedule(name, now)
+
+    def _spill(self, entry: FrontierEntry, seq: int) -> None:
+        self._disk.execute(
+            "INSERT INTO frontier (host, score, seq, url, depth, action, source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                entry.host,
+                entry.score,
+                seq,
+                entry.url,
+                entry.depth,
+                entry.action.model_dump_json() if entry.action is not None else None,
+                entry.source,
+            ),
+        )
+
+    def _refill(self, name: str, host: _Host) -> None:
+        rows = self._disk.execute(
+            "SELECT rowid, score, seq, url, depth, action, source FROM frontier "
+            "WHERE host = ? ORDER BY score DESC, seq LIMIT ?",
+            (name, SPILL_BATCH),
+        ).fetchall()
+        self._disk.executemany("DELETE FROM frontier WHERE rowid = ?", [(row[0],) for row in rows])
+
+        for _, score, seq, url, depth, action, source in rows:
+            entry = FrontierEntry(
+                url,
+                ActionDecision.model_validate(json.loads(action)) if action is not None else None,
+                depth,
+                source,
+            )
+            entry.score = score
+            heapq.heappush(host.heap, (-score, seq, entry))
+        self._in_memory += len(rows)
+
+        top = self._disk.execute(
+            "SELECT score, seq FROM frontier WHERE host = ? ORDER BY score DESC, seq LIMIT 1",
+            (name,),
+        ).fetchone()
+        host.disk_best = (top[0], -top[1]) if top is not None else None
+
+# Public API
+def new_frontier(
+    config: CrawlConfig | None = None,
+    templates: TemplateMiner | None = None,
+) -> Frontier | None:
+    """
+    Frontier for the configured scorer, or None when disabled.
+    The "novelty" scorer reads `templates` (the run's miner).
+    """
+    config = config or CrawlConfig()
+    if config.frontier_scorer is None:
+        return None
+    if config.frontier_scorer == "novelty":
+        scorer: Scorer = NoveltyScorer(templates or new_template_miner(config))
+    else:
+        scorer = dfs_score if config.frontier_scorer == "dfs" else bfs_score
+    return Frontier(
+        scorer=scorer,
+        min_delay=config.frontier_min_delay,
+        max_in_memory=config.frontier_max_in_memory,
+        spill_path=config.frontier_spill_path,
+    )
+
+# Helpers
+def _candidate_key(url: str, action: ActionDecision | None, source: str | None) -> str:
+    if action is None:
+        return url
+    return f"{source or url} {action_key(action)}"
+
+def _open_spill(path: str) -> sqlite3.Connection:
+    # Scratch space for this process: no durability needed
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("DROP TABLE IF EXISTS frontier")
+    conn.execute(
+        "CREATE TABLE frontier ("
+        " host TEXT NOT NULL,"
+        " score REAL NOT NULL,"
+        " seq INTEGER NOT NULL,"
+        " url TEXT NOT NULL,"
+        " depth INTEGER NOT NULL,"
+        " action TEXT,"
+        " source TEXT)"
+    )
+    conn.execute("CREATE INDEX frontier_order ON frontier (host, score DESC, seq)")
+    return conn
@@ -1,21 +1,49 @@
-from enum import Enum
+"""
+Action Models
+
+ActionType and ActionDecision are defined with the crawl state
+(crawlergraph.state) so decisions can be stored on CrawlState
+without conversion; they are re-exported here for policies.
+
+FrontierEntry is a crawl candidate queued in the frontier (see
+actions.frontier): a URL, optionally with an action to take on
+it. It is a slotted class rather than a model because frontiers
+hold millions of them.
+"""
+
 from typing import Optional
-from pydantic import BaseModel, Field
+from urllib.parse import urlsplit
+from crawlergraph.state import ActionDecision, ActionType
+
+__all__ = ["ActionDecision", "ActionType", "FrontierEntry"]
 
 
-class ActionType(str, Enum):
-    CLICK = "CLICK"
-    TYPE = "TYPE"
-    SUBMIT = "SUBMIT"
-    PAGINATE = "PAGINATE"
-    WAIT = "WAIT"
-    STOP = "STOP"
+class FrontierEntry:
+    """
+    Args:
+        url: Canonical URL to visit
+        action: Action to take there (None: just visit)
+        depth: Crawl depth of the visit
+        source: Fingerprint of the page the candidate was found on
+    """
 
+    __slots__ = ("url", "host", "action", "depth", "source", "score")
 
-class ActionDecision(BaseModel):
-    action: ActionType
-    target: Optional[str] = None
-    value: Optional[str] = None
+    def __init__(
+        self,
+        url: str,
+        action: Optional[ActionDecision] = None,
+        depth: int = 0,
+        source: Optional[str] = None,
+    ) -> None:
+        self.url = url
+        self.host = urlsplit(url).netloc
+        self.action = action
+        self.depth = depth
+        self.source = source
+        # Set by the frontier's scorer when pushed
+        self.score = 0.0
 
-    rationale: str
-    confidence: float = Field(ge=0.0, le=1.0)
+    def __repr__(self) -> str:
+        action = self.action.action.value if self.action is not None else None
+        return f"FrontierEntry({self.url!r}, action={action}, depth={self.depth}, score={self.score:g})"
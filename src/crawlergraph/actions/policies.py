@@ -6,8 +6,9 @@ Maps:
 →   ActionDecision
 """
 
+from typing import List
 from crawlergraph.state import CrawlState, PageType
-from crawlergraph.actions.models import ActionDecision, ActionType
+from crawlergraph.actions.models import ActionDecision, ActionType, FrontierEntry
 
 def decide_action(state: CrawlState) -> ActionDecision:
     """
@@ -60,3 +61,47 @@ def decide_action(state: CrawlState) -> ActionDecision:
         rationale="No deterministic action available",
         confidence=0.5,
     )
+
+def alternative_actions(state: CrawlState) -> List[ActionDecision]:
+    """
+    Every action the page's features support, for the frontier to
+    fall back on when the crawl reaches a dead end.
+    """
+    features = state.page_features
+    alternatives = []
+
+    if features.pagination_controls:
+        alternatives.append(ActionDecision(
+            action=ActionType.PAGINATE,
+            rationale="Pagination controls present",
+            confidence=0.6,
+        ))
+
+    if features.has_form:
+        alternatives.append(ActionDecision(
+            action=ActionType.SUBMIT,
+            rationale="Form present",
+            confidence=0.5,
+        ))
+
+    if features.content_block_count:
+        alternatives.append(ActionDecision(
+            action=ActionType.CLICK,
+            rationale="Content blocks present; explore",
+            confidence=0.4,
+        ))
+
+    return alternatives
+
+def frontier_decision(entry: FrontierEntry) -> ActionDecision:
+    """
+    Decision that takes a candidate popped from the frontier.
+    """
+    if entry.action is None:
+        return ActionDecision(
+            action=ActionType.NAVIGATE,
+            target=entry.url,
+            rationale="Dead end; visit the best queued link",
+            confidence=0.5,
+        )
+    return entry.action.model_copy(update={"url": entry.url})
@@ -0,0 +1,76 @@
+"""
+Frontier Scoring
+
+A scorer maps a FrontierEntry to a priority; the frontier pops
+the highest first (ties in push order). Scores are computed once,
+when a candidate is pushed, so pops stay O(log n).
+
+    bfs_score               shallowest first (breadth-first)
+    dfs_score               deepest first
+    NoveltyScorer           URL templates visited least first
+    DefectLikelihoodScorer  templates with the highest-scoring
+                            defects first
+    WeightedScorer          weighted sum of other scorers
+
+NO LangGraph logic
+"""
+
+from typing import Callable, Sequence, Tuple
+from crawlergraph.actions.models import FrontierEntry
+from crawlergraph.defects.aggregator import DefectAggregator
+from crawlergraph.memory.url_templates import TemplateMiner
+
+Scorer = Callable[[FrontierEntry], float]
+
+
+class NoveltyScorer:
+    """
+    1 / (1 + visits) of the candidate's URL template, so pages of
+    an unseen shape outrank the 1,000th detail view.
+    """
+
+    __slots__ = ("templates",)
+
+    def __init__(self, templates: TemplateMiner) -> None:
+        self.templates = templates
+
+    def __call__(self, entry: FrontierEntry) -> float:
+        return 1.0 / (1 + self.templates.visits(entry.url))
+
+
+class DefectLikelihoodScorer:
+    """
+    Highest defect group score on the candidate's URL template:
+    templates that already show defects are likely to show more
+    (see DefectAggregator.template_score).
+    """
+
+    __slots__ = ("defects",)
+
+    def __init__(self, defects: DefectAggregator) -> None:
+        self.defects = defects
+
+    def __call__(self, entry: FrontierEntry) -> float:
+        return self.defects.template_score(entry.url)
+
+
+class WeightedScorer:
+    """
+    sum(weight * scorer(entry)), e.g. novelty with a depth
+    penalty: WeightedScorer((1.0, novelty), (0.1, bfs_score)).
+    """
+
+    __slots__ = ("scorers",)
+
+    def __init__(self, *scorers: Tuple[float, Scorer]) -> None:
+        self.scorers: Sequence[Tuple[float, Scorer]] = scorers
+
+    def __call__(self, entry: FrontierEntry) -> float:
+        return sum(weight * scorer(entry) for weight, scorer in self.scorers)
+
+# Public API
+def bfs_score(entry: FrontierEntry) -> float:
+    return -float(entry.depth)
+
+def dfs_score(entry: FrontierEntry) -> float:
+    return float(entry.depth)
@@ -0,0 +1,140 @@
+"""
+Batch Page Type Classification
+
+Vectorized form of classify_page_type for re-scoring large
+archives after a rule change. The fields PAGE_TYPE_RULES read
+are packed into columns (one NumPy array per condition field,
+see column_key) and the rule cascade is evaluated with boolean
+masks built by Condition.mask, first matching rule wins. The
+spec is the only copy of the rules: editing it changes the
+scalar and batch classifiers alike.
+
+Set-membership conditions ("contains_any") cannot be evaluated
+over a column of sets, so each is packed as its own boolean
+column of the condition's outcome.
+
+Results are PageType codes (indices into PAGE_TYPES) and
+confidences identical to the scalar classifier's.
+
+Requires numpy (optional dependency).
+
+NO LangGraph logic
+NO LLMs
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+from crawlergraph.classifiers.page_type_rules import FALLBACK, PAGE_TYPE_RULES, PageTypeRule
+from crawlergraph.state import PageFeatures, PageType, RuntimeSignals
+from crawlergraph.utils.conditions import Condition
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Code i in batch results is PAGE_TYPES[i]
+PAGE_TYPES: Tuple[PageType, ...] = tuple(PageType)
+PAGE_TYPE_CODES: Dict[PageType, int] = {t: i for i, t in enumerate(PAGE_TYPES)}
+
+# Public API
+def column_key(condition: Condition) -> str:
+    """
+    Column a condition is evaluated over: its field
+    ("signals.status_code"), or for a contains_any condition
+    the field and its sorted values
+    ("features.url_patterns~login,signin").
+    """
+    if condition.op == "contains_any":
+        return f"{condition.field}~{','.join(sorted(condition.value))}"
+    return condition.field
+
+def build_feature_columns(
+    pages: Iterable[Tuple[PageFeatures, RuntimeSignals]],
+    rules: Sequence[PageTypeRule] = PAGE_TYPE_RULES,
+) -> Dict[str, "np.ndarray"]:
+    """
+    Pack (PageFeatures, RuntimeSignals) pairs into the columns
+    `rules` read, keyed by column_key.
+
+    Fields become float64 columns (missing values as NaN, which
+    no comparison matches); contains_any conditions become
+    boolean columns. Archives that already store these columns
+    can skip this step.
+    """
+    _require_numpy()
+
+    pages = list(pages)
+    columns = {}
+    for key, condition in _conditions(rules).items():
+        source, attribute = condition.path
+        index = 0 if source == "features" else 1
+        values = (getattr(page[index], attribute) for page in pages)
+        if condition.op == "contains_any":
+            columns[key] = np.fromiter(
+                (condition.test(value) for value in values), dtype=bool, count=len(pages),
+            )
+        else:
+            columns[key] = np.fromiter(
+                (_number(value) for value in values), dtype=np.float64, count=len(pages),
+            )
+    return columns
+
+def classify_page_types_batch(
+    columns: Dict[str, "np.ndarray"],
+    rules: Sequence[PageTypeRule] = PAGE_TYPE_RULES,
+    fallback: Tuple[PageType, float] = FALLBACK,
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Classify every row of a column set.
+
+    Args:
+        columns: Output of build_feature_columns, or any mapping
+            with the same keys and equal-length arrays
+        rules: Rule cascade (must match the columns)
+        fallback: Result when no rule matches
+
+    Returns:
+        (codes, confidences): int8 indices into PAGE_TYPES and
+        float64 confidences, one per row
+    """
+    _require_numpy()
+
+    c = {key: np.asarray(values) for key, values in columns.items()}
+    n = len(next(iter(c.values()))) if c else 0
+
+    codes = np.full(n, PAGE_TYPE_CODES[fallback[0]], dtype=np.int8)
+    confidences = np.full(n, fallback[1], dtype=np.float64)
+    undecided = np.ones(n, dtype=bool)
+
+    for rule in rules:
+        hit = undecided.copy()
+        for condition in rule.when:
+            column = c[column_key(condition)]
+            hit &= column if condition.op == "contains_any" else condition.mask(column)
+        codes[hit] = PAGE_TYPE_CODES[rule.page_type]
+        confidences[hit] = rule.confidence
+        undecided &= ~hit
+
+    return codes, confidences
+
+def decode_page_types(codes: "np.ndarray") -> List[PageType]:
+    """
+    Map batch codes back to PageType members.
+    """
+    return [PAGE_TYPES[code] for code in codes.tolist()]
+
+# Helpers
+def _conditions(rules: Sequence[PageTypeRule]) -> Dict[str, Condition]:
+    # One condition per column, in first-use order
+    conditions: Dict[str, Condition] = {}
+    for rule in rules:
+        for condition in rule.when:
+            conditions.setdefault(column_key(condition), condition)
+    return conditions
+
+def _number(value) -> float:
+    return float("nan") if value is None else float(value)
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required for batch page classification")
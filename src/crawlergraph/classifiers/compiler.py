@@ -0,0 +1,74 @@
+"""
+Rule Cascade Compiler
+
+Turns an ordered list of PageTypeRule into one generated Python
+function of straight-line `if` statements:
+
+    def classify_page_type(features, signals):
+        signals_status_code = signals.status_code
+        if signals_status_code >= 500:
+            return _R0
+        ...
+        return _FALLBACK
+
+Each input field is read once, just before the first rule that
+needs it, and every result tuple is a prebuilt constant, so a
+call allocates nothing.
+
+With `traced=True` the function takes an extra `_record`
+callback and, per rule, evaluates every condition (no short
+circuit) and calls `_record(rule_index, outcomes, started_ns)`,
+which returns the timestamp the next rule starts from. The
+untraced function contains none of this.
+
+The generated source is kept on the function as `__source__`.
+
+NO LangGraph logic
+NO LLMs
+"""
+
+import time
+from typing import Callable, Sequence, Tuple
+from crawlergraph.state import PageType
+from crawlergraph.classifiers.page_type_rules import PageTypeRule
+from crawlergraph.utils.conditions import FunctionBuilder
+
+RuleFunction = Callable[..., Tuple[PageType, float]]
+
+# Public API
+def compile_page_type_rules(
+    rules: Sequence[PageTypeRule],
+    fallback: Tuple[PageType, float],
+    name: str = "classify_page_type",
+    inputs: Tuple[str, ...] = ("features", "signals"),
+    traced: bool = False,
+) -> RuleFunction:
+    """
+    Compile a rule cascade into a function of `inputs`.
+
+    Raises:
+        ValueError: if a condition reads an input not in `inputs`
+    """
+    builder = FunctionBuilder(name, inputs, ["_record"] if traced else [])
+    builder.constant(fallback, "_FALLBACK")
+    if traced:
+        builder.constant(time.perf_counter_ns, "_ns")
+        builder.line("_started = _ns()")
+
+    for index, rule in enumerate(rules):
+        builder.load(rule.when, rule.name)
+        result = builder.constant((rule.page_type, rule.confidence), f"_R{index}")
+        tests = builder.tests(rule.when)
+
+        if traced:
+            outcomes = "".join(f"{t}, " for t in tests)
+            builder.line(f"_outcomes = ({outcomes})  # {rule.name}")
+            builder.line(f"_started = _record({index}, _outcomes, _started)")
+            builder.line("if all(_outcomes):")
+        else:
+            builder.line(f"if {' and '.join(tests) or 'True'}:  # {rule.name}")
+        builder.line(f"return {result}", indent=2)
+
+    builder.line("return _FALLBACK")
+
+    return builder.build()
@@ -5,211 +5,35 @@ Deterministic, rule-based page-type classifier.
 Consumes PageFeatures + RuntimeSignals and outputs
 (PageType, confidence).
 
+The rules live in classifiers.page_type_rules and are
+compiled once, at import, into straight-line code.
+
 LLM fallback is intentionally NOT used here.
 """
 
 from typing import Tuple
 from crawlergraph.state import PageType, PageFeatures, RuntimeSignals
+from crawlergraph.classifiers.compiler import compile_page_type_rules
+from crawlergraph.classifiers.page_type_rules import FALLBACK, PAGE_TYPE_RULES
+from crawlergraph.classifiers.tracing import ClassificationTracer
+
+_compiled = compile_page_type_rules(PAGE_TYPE_RULES, FALLBACK)
 
 # Public API
 def classify_page_type(
     features: PageFeatures,
-    signals: RuntimeSignals
+    signals: RuntimeSignals,
+    tracer: ClassificationTracer | None = None,
 ) -> Tuple[PageType, float]:
     """
     Classify the current page into a PageType.
 
+    Pass a ClassificationTracer to record which rules were
+    evaluated and how long each took (see classifiers.tracing).
+
     Returns:
         (PageType, confidence)
     """
-
-    # 1. Terminal / error conditions (highest priority)
-    page_type, confidence = _classify_error_page(signals)
-    if page_type:
-        return page_type, confidence
-
-    # 2. Authentication-related pages
-    page_type, confidence = _classify_login_page(features, signals)
-    if page_type:
-        return page_type, confidence
-
-    page_type, confidence = _classify_auth_challenge(features, signals)
-    if page_type:
-        return page_type, confidence
-
-    # 3. Empty / no-content states
-    page_type, confidence = _classify_empty_page(features)
-    if page_type:
-        return page_type, confidence
-
-    # 4. Data-heavy application pages
-    page_type, confidence = _classify_listing_page(features)
-    if page_type:
-        return page_type, confidence
-
-    page_type, confidence = _classify_detail_page(features)
-    if page_type:
-        return page_type, confidence
-
-    # 5. Generic forms
-    page_type, confidence = _classify_form_page(features)
-    if page_type:
-        return page_type, confidence
-
-    # 6. Pagination (usually overlays listing)
-    page_type, confidence = _classify_pagination_page(features)
-    if page_type:
-        return page_type, confidence
-
-    # 7. Dashboard / landing pages
-    page_type, confidence = _classify_dashboard_page(features)
-    if page_type:
-        return page_type, confidence
-
-    # Fallback
-    return PageType.UNKNOWN, 0.3
-
-# Classifier Rules
-def _classify_error_page(
-    signals: RuntimeSignals
-) -> Tuple[PageType | None, float]:
-    """
-    HTTP or runtime-level error pages.
-    """
-    if signals.status_code >= 500:
-        return PageType.ERROR, 0.99
-
-    if 400 <= signals.status_code < 500:
-        return PageType.ERROR, 0.95
-
-    if signals.console_errors and signals.status_code == 200:
-        # SPA runtime crash
-        return PageType.ERROR, 0.8
-
-    return None, 0.0
-
-def _classify_login_page(
-    features: PageFeatures,
-    signals: RuntimeSignals
-) -> Tuple[PageType | None, float]:
-    """
-    Username + password inputs strongly imply login.
-    """
-    if (
-        features.has_password_input
-        and features.has_username_input
-        and features.submit_button_count > 0
-    ):
-        return PageType.LOGIN, 0.95
-
-    # URL hint fallback
-    if "login" in features.url_patterns or "signin" in features.url_patterns:
-        return PageType.LOGIN, 0.85
-
-    return None, 0.0
-
-def _classify_auth_challenge(
-    features: PageFeatures,
-    signals: RuntimeSignals
-) -> Tuple[PageType | None, float]:
-    """
-    MFA / OTP / SSO handoff pages.
-    """
-    auth_keywords = {"otp", "verify", "challenge", "two-factor"}
-
-    if any(k in features.url_patterns for k in auth_keywords):
-        return PageType.AUTH_CHALLENGE, 0.8
-
-    if (
-        features.has_form
-        and features.input_count <= 2
-        and not features.has_password_input
-        and signals.redirect_detected
-    ):
-        return PageType.AUTH_CHALLENGE, 0.75
-
-    return None, 0.0
-
-def _classify_empty_page(
-    features: PageFeatures
-) -> Tuple[PageType | None, float]:
-    if features.empty_state_detected:
-        return PageType.EMPTY, 0.9
-    return None, 0.0
-
-def _classify_listing_page(
-    features: PageFeatures
-) -> Tuple[PageType | None, float]:
-    """
-    Tables + pagination usually mean listings.
-    """
-    if features.table_count > 0 and features.pagination_controls:
-        return PageType.LISTING, 0.9
-
-    if features.table_count > 1:
-        return PageType.LISTING, 0.8
-
-    return None, 0.0
-
-def _classify_detail_page(
-    features: PageFeatures
-) -> Tuple[PageType | None, float]:
-    """
-    Single-record views.
-    """
-    if (
-        features.table_count == 1
-        and not features.pagination_controls
-        and not features.has_form
-    ):
-        return PageType.DETAIL, 0.75
-
-    return None, 0.0
-
-def _classify_form_page(
-    features: PageFeatures
-) -> Tuple[PageType | None, float]:
-    """
-    Generic data entry forms (non-auth).
-
-    Should represent pages where the primary purpose
-    is structured data entry — not just a search box.
-    """
-
-    if (
-        features.has_form
-        and features.input_count >= 3
-        and not features.has_password_input
-        and features.content_block_count <= 3  
-    ):
-        return PageType.FORM, 0.8
-
-    return None, 0.0
-
-def _classify_pagination_page(
-    features: PageFeatures
-) -> Tuple[PageType | None, float]:
-    """
-    Explicit pagination pages (rare but possible).
-    """
-    if features.pagination_controls and features.table_count == 0:
-        return PageType.PAGINATION, 0.7
-
-    return None, 0.0
-
-def _classify_dashboard_page(
-    features: PageFeatures
-) -> Tuple[PageType | None, float]:
-    """
-    Landing pages with multiple widgets/cards.
-    """
-    if (
-        features.content_block_count >= 2
-        and not features.has_form
-        and not features.pagination_controls
-        and features.table_count == 0
-        and not features.empty_state_detected
-    ):
-        return PageType.DASHBOARD, 0.6
-
-    return None, 0.0
+    if tracer is not None:
+        return tracer.classify(features, signals)
+    return _compiled(features, signals)
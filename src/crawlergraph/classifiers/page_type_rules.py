@@ -0,0 +1,169 @@
+"""
+Page Type Rules (v1)
+
+Declarative source of truth for the page-type classifier.
+Rules are tried in list order; the first rule whose
+conditions all hold decides the page type. See README for
+the semantics behind each page type.
+
+Compiled into classify_page_type by classifiers.compiler.
+
+NO LangGraph logic
+NO LLMs
+"""
+
+from typing import List, Tuple
+from pydantic import BaseModel, Field
+from crawlergraph.state import PageType
+from crawlergraph.utils.conditions import Condition
+
+
+class PageTypeRule(BaseModel):
+    name: str
+    page_type: PageType
+    confidence: float = Field(ge=0.0, le=1.0)
+    when: List[Condition]
+
+
+# Returned when no rule matches
+FALLBACK: Tuple[PageType, float] = (PageType.UNKNOWN, 0.3)
+
+_AUTH_CHALLENGE_HINTS = ["otp", "verify", "challenge", "two-factor"]
+
+PAGE_TYPE_RULES: List[PageTypeRule] = [
+    # 1. Terminal / error conditions (highest priority)
+    PageTypeRule(
+        name="server_error",
+        page_type=PageType.ERROR,
+        confidence=0.99,
+        when=[("signals.status_code", ">=", 500)],
+    ),
+    PageTypeRule(
+        name="client_error",
+        page_type=PageType.ERROR,
+        confidence=0.95,
+        when=[
+            ("signals.status_code", ">=", 400),
+            ("signals.status_code", "<", 500),
+        ],
+    ),
+    PageTypeRule(
+        # SPA runtime crash
+        name="runtime_crash",
+        page_type=PageType.ERROR,
+        confidence=0.8,
+        when=[
+            ("signals.console_error_count", ">", 0),
+            ("signals.status_code", "==", 200),
+        ],
+    ),
+
+    # 2. Authentication-related pages
+    PageTypeRule(
+        name="login_form",
+        page_type=PageType.LOGIN,
+        confidence=0.95,
+        when=[
+            ("features.has_password_input", "true"),
+            ("features.has_username_input", "true"),
+            ("features.submit_button_count", ">", 0),
+        ],
+    ),
+    PageTypeRule(
+        name="login_url",
+        page_type=PageType.LOGIN,
+        confidence=0.85,
+        when=[("features.url_patterns", "contains_any", ["login", "signin"])],
+    ),
+    PageTypeRule(
+        name="auth_challenge_url",
+        page_type=PageType.AUTH_CHALLENGE,
+        confidence=0.8,
+        when=[("features.url_patterns", "contains_any", _AUTH_CHALLENGE_HINTS)],
+    ),
+    PageTypeRule(
+        name="auth_challenge_redirect",
+        page_type=PageType.AUTH_CHALLENGE,
+        confidence=0.75,
+        when=[
+            ("features.has_form", "true"),
+            ("features.input_count", "<=", 2),
+            ("features.has_password_input", "false"),
+            ("signals.redirect_detected", "true"),
+        ],
+    ),
+
+    # 3. Empty / no-content states
+    PageTypeRule(
+        name="empty_state",
+        page_type=PageType.EMPTY,
+        confidence=0.9,
+        when=[("features.empty_state_detected", "true")],
+    ),
+
+    # 4. Data-heavy application pages
+    PageTypeRule(
+        name="paginated_table",
+        page_type=PageType.LISTING,
+        confidence=0.9,
+        when=[
+            ("features.table_count", ">", 0),
+            ("features.pagination_controls", "true"),
+        ],
+    ),
+    PageTypeRule(
+        name="multiple_tables",
+        page_type=PageType.LISTING,
+        confidence=0.8,
+        when=[("features.table_count", ">", 1)],
+    ),
+    PageTypeRule(
+        # Single-record views
+        name="single_table",
+        page_type=PageType.DETAIL,
+        confidence=0.75,
+        when=[
+            ("features.table_count", "==", 1),
+            ("features.pagination_controls", "false"),
+            ("features.has_form", "false"),
+        ],
+    ),
+
+    # 5. Generic forms: structured data entry, not just a search box
+    PageTypeRule(
+        name="data_entry_form",
+        page_type=PageType.FORM,
+        confidence=0.8,
+        when=[
+            ("features.has_form", "true"),
+            ("features.input_count", ">=", 3),
+            ("features.has_password_input", "false"),
+            ("features.content_block_count", "<=", 3),
+        ],
+    ),
+
+    # 6. Pagination without a listing table (rare but possible)
+    PageTypeRule(
+        name="pagination_only",
+        page_type=PageType.PAGINATION,
+        confidence=0.7,
+        when=[
+            ("features.pagination_controls", "true"),
+            ("features.table_count", "==", 0),
+        ],
+    ),
+
+    # 7. Landing pages with multiple widgets/cards
+    PageTypeRule(
+        name="widget_dashboard",
+        page_type=PageType.DASHBOARD,
+        confidence=0.6,
+        when=[
+            ("features.content_block_count", ">=", 2),
+            ("features.has_form", "false"),
+            ("features.pagination_controls", "false"),
+            ("features.table_count", "==", 0),
+            ("features.empty_state_detected", "false"),
+        ],
+    ),
+]
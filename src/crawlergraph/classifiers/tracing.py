@@ -0,0 +1,179 @@
+"""
+Page Type Classification Tracing
+
+Opt-in explain mode for classify_page_type. A tracer runs a
+separately compiled copy of the rule cascade that reports every
+rule it evaluates: which conditions held, whether the rule
+fired, and how long it took in nanoseconds.
+
+Per call, the tracer keeps the last ClassificationTrace (to
+explain a misclassification). Over a run, it aggregates per-rule
+hit counts and log2 latency histograms (to reorder rules by hit
+frequency and find slow predicates).
+
+The default, untraced classify_page_type never touches this
+module's code path.
+
+NO LangGraph logic
+NO LLMs
+"""
+
+import time
+from typing import Dict, List, Tuple
+from pydantic import BaseModel, Field
+from crawlergraph.state import PageFeatures, PageType, RuntimeSignals
+from crawlergraph.classifiers.compiler import compile_page_type_rules
+from crawlergraph.classifiers.page_type_rules import FALLBACK, PAGE_TYPE_RULES
+
+
+class RuleEvaluation(BaseModel):
+    rule: str
+    page_type: PageType
+    matched: bool
+    # Per-condition outcomes, in spec order
+    conditions: List[bool]
+    elapsed_ns: int
+
+    @property
+    def conditions_met(self) -> int:
+        return sum(self.conditions)
+
+
+class ClassificationTrace(BaseModel):
+    page_type: PageType
+    confidence: float
+    # Rules evaluated, in order; the last one fired unless
+    # the fallback was used
+    evaluations: List[RuleEvaluation] = Field(default_factory=list)
+
+    @property
+    def fired(self) -> str | None:
+        last = self.evaluations[-1] if self.evaluations else None
+        return last.rule if last is not None and last.matched else None
+
+    def near_misses(self, max_unmet: int = 1) -> List[RuleEvaluation]:
+        """
+        Rules that failed on at most `max_unmet` conditions.
+        """
+        return [
+            e for e in self.evaluations
+            if not e.matched and len(e.conditions) - e.conditions_met <= max_unmet
+        ]
+
+
+class RuleStats(BaseModel):
+    rule: str
+    evaluations: int = 0
+    hits: int = 0
+    total_ns: int = 0
+    # Upper bound in ns (power of two) -> evaluations in bucket
+    histogram: Dict[int, int] = Field(default_factory=dict)
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.evaluations if self.evaluations else 0.0
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.evaluations if self.evaluations else 0.0
+
+
+class ClassificationTracer:
+    """
+    Records traced classifications.
+
+    Usage:
+        tracer = ClassificationTracer()
+        classify_page_type(features, signals, tracer=tracer)
+        tracer.last          # ClassificationTrace of that call
+        tracer.stats()       # per-rule aggregates so far
+    """
+
+    def __init__(self, keep_last: bool = True) -> None:
+        self.keep_last = keep_last
+        self.calls = 0
+        self.last: ClassificationTrace | None = None
+
+        count = len(PAGE_TYPE_RULES)
+        self._evaluations = [0] * count
+        self._hits = [0] * count
+        self._total_ns = [0] * count
+        self._histograms: List[Dict[int, int]] = [{} for _ in range(count)]
+        self._current: List[Tuple[int, tuple, int]] = []
+
+    def classify(
+        self,
+        features: PageFeatures,
+        signals: RuntimeSignals,
+    ) -> Tuple[PageType, float]:
+        self._current = []
+        page_type, confidence = _traced(features, signals, self._record)
+        self.calls += 1
+
+        if self.keep_last:
+            self.last = ClassificationTrace(
+                page_type=page_type,
+                confidence=confidence,
+                evaluations=[
+                    RuleEvaluation(
+                        rule=PAGE_TYPE_RULES[index].name,
+                        page_type=PAGE_TYPE_RULES[index].page_type,
+                        matched=all(outcomes),
+                        conditions=[bool(o) for o in outcomes],
+                        elapsed_ns=elapsed,
+                    )
+                    for index, outcomes, elapsed in self._current
+                ],
+            )
+        return page_type, confidence
+
+    def stats(self) -> List[RuleStats]:
+        """
+        Per-rule aggregates, in spec order.
+        """
+        return [
+            RuleStats(
+                rule=rule.name,
+                evaluations=self._evaluations[i],
+                hits=self._hits[i],
+                total_ns=self._total_ns[i],
+                histogram=dict(sorted(self._histograms[i].items())),
+            )
+            for i, rule in enumerate(PAGE_TYPE_RULES)
+        ]
+
+    def rules_by_hits(self) -> List[str]:
+        """
+        Rule names, most frequently fired first.
+        """
+        order = sorted(range(len(PAGE_TYPE_RULES)), key=lambda i: -self._hits[i])
+        return [PAGE_TYPE_RULES[i].name for i in order]
+
+    def reset(self) -> None:
+        self.__init__(keep_last=self.keep_last)
+
+    # Internals
+    def _record(self, index: int, outcomes: tuple, started_ns: int) -> int:
+        elapsed = time.perf_counter_ns() - started_ns
+
+        self._evaluations[index] += 1
+        self._total_ns[index] += elapsed
+        if all(outcomes):
+            self._hits[index] += 1
+
+        bucket = 1 << elapsed.bit_length()
+        histogram = self._histograms[index]
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+
+        if self.keep_last:
+            self._current.append((index, outcomes, elapsed))
+
+        # Exclude the tracer's own overhead from the next rule
+        return time.perf_counter_ns()
+
+_traced = compile_page_type_rules(
+    PAGE_TYPE_RULES,
+    FALLBACK,
+    name="classify_page_type_traced",
+    traced=True,
+)
@@ -0,0 +1,99 @@
+"""
+Run Context
+
+Per-run helpers that live outside CrawlState: they are large,
+mutable, or not serializable, so they are handed to nodes
+through the LangGraph config instead of the state:
+
+    graph.invoke(state, config=run_config(RunContext()))
+
+Nodes read it with get_run_context(config) and fall back to
+plain per-page behaviour when there is none.
+"""
+
+from typing import Any, Dict, Mapping
+from crawlergraph.actions.frontier import Frontier
+from crawlergraph.classifiers.tracing import ClassificationTracer
+from crawlergraph.defects.aggregator import DefectAggregator
+from crawlergraph.defects.registry import DefectRuleRegistry
+from crawlergraph.features.cache import FeatureCache
+from crawlergraph.features.fingerprints import MessageInterner
+from crawlergraph.features.incremental import DomSnapshot
+from crawlergraph.io.result_store import ResultStore
+from crawlergraph.memory.near_duplicates import NearDuplicateIndex
+from crawlergraph.memory.performance import PerformanceAggregator
+from crawlergraph.memory.transitions import TransitionGraph
+from crawlergraph.memory.url_templates import TemplateMiner
+
+# Key under config["configurable"]
+RUN_CONTEXT_KEY = "run_context"
+
+
+class RunContext:
+    """
+    Args:
+        messages: Interned console/network messages
+        performance: Run-level performance percentiles
+        defects: Deduplicated, scored defects across pages
+        tracer: Optional classification tracer
+        defect_registry: Compiled defect rules for this run
+            (LoopState.from_input builds it from
+            CrawlConfig.defect_rules; DEFECT_RULES without
+            overrides when None)
+        store: Optional sink for page results and defects
+        near_duplicates: Structural near-duplicate clusters;
+            loop_guard skips the check when None
+        templates: Learned URL templates and their visits;
+            per-template budgets are skipped when None
+        transitions: Page-transition graph for cycle detection;
+            skipped when None
+        frontier: Queue of crawl candidates; decide_action
+            pushes each page's links and alternative actions and
+            falls back to it on a dead end
+        feature_cache: Features and page types of pages already
+            seen; extraction and classification run uncached
+            when None
+        dom_snapshot: Features and counts of the last observed
+            page; LoopState.from_input applies an observation's
+            mutations to it instead of re-extracting
+    """
+
+    def __init__(
+        self,
+        messages: MessageInterner | None = None,
+        performance: PerformanceAggregator | None = None,
+        defects: DefectAggregator | None = None,
+        tracer: ClassificationTracer | None = None,
+        defect_registry: DefectRuleRegistry | None = None,
+        store: ResultStore | None = None,
+        near_duplicates: NearDuplicateIndex | None = None,
+        templates: TemplateMiner | None = None,
+        transitions: TransitionGraph | None = None,
+        frontier: Frontier | None = None,
+        feature_cache: FeatureCache | None = None,
+        dom_snapshot: DomSnapshot | None = None,
+    ) -> None:
+        self.messages = messages if messages is not None else MessageInterner()
+        self.performance = performance or PerformanceAggregator()
+        self.defects = defects if defects is not None else DefectAggregator()
+        self.tracer = tracer
+        self.defect_registry = defect_registry
+        self.store = store
+        self.near_duplicates = near_duplicates
+        self.templates = templates
+        self.transitions = transitions
+        self.frontier = frontier
+        self.feature_cache = feature_cache
+        self.dom_snapshot = dom_snapshot
+
+# Public API
+def run_config(context: RunContext, **configurable: Any) -> Dict[str, Any]:
+    """
+    LangGraph config carrying `context`.
+    """
+    return {"configurable": {RUN_CONTEXT_KEY: context, **configurable}}
+
+def get_run_context(config: Mapping[str, Any] | None) -> RunContext | None:
+    if not config:
+        return None
+    return config.get("configurable", {}).get(RUN_CONTEXT_KEY)
@@ -0,0 +1,330 @@
+"""
+Run-Level Defect Aggregation
+
+detect_defects reports what is wrong with one page; the same
+ConsoleError on 400 pages is one problem, not 400. The
+DefectAggregator folds every page's defects into groups keyed by
+a fingerprint of (category, subtype, normalized evidence, URL
+template) and keeps, per group:
+
+    occurrences     defects folded in (revisits count again)
+    pages           distinct affected URLs (DistinctCounter)
+    first/last seen detection times
+    score           priority, kept current in an IndexedHeap
+
+Evidence is normalized so volatile values do not split groups:
+measurements (load times, counts) are dropped, messages are
+reduced to their fingerprints, identifiers such as status codes
+are kept.
+
+Scoring combines the README's four factors:
+
+    score = severity / 10 * confidence
+            * log2(1 + pages)                 impact
+            * (0.5 + 0.5 * reproducibility)
+
+where reproducibility is the share of the template's observed
+pages that show the defect. Observing a page only marks its
+template (and the templates of the groups it updated) stale;
+their groups are rescored on the next read, so a run of pages
+between reads costs one rescore per group, and top(n) is a
+partial heap walk rather than a sort of every group. Frequency is reported as
+occurrences but scored through distinct pages, so a crawler
+stuck on one page does not inflate a defect.
+
+Memory is fixed: at most `max_groups` groups (later fingerprints
+share one overflow group per subtype) and `max_templates`
+templates, each group holding one 2**precision-byte counter.
+
+NO navigation
+NO LangGraph logic
+NO LLMs
+"""
+
+import hashlib
+import json
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+from pydantic import BaseModel
+from crawlergraph.defects.models import Defect, DefectCategory
+from crawlergraph.features.fingerprints import fingerprint_message, normalize_message
+from crawlergraph.memory.performance import OVERFLOW_TEMPLATE
+from crawlergraph.utils.heaps import IndexedHeap
+from crawlergraph.utils.sketches import DistinctCounter
+from crawlergraph.utils.urls import url_template
+
+# Numeric evidence that identifies a defect rather than measuring it
+IDENTITY_EVIDENCE_KEYS = frozenset({"status_code"})
+
+
+class DefectGroup(BaseModel):
+    fingerprint: str
+    category: DefectCategory
+    subtype: str
+    template: str
+    description: str
+
+    # Highest seen
+    severity: int
+    confidence: float
+
+    occurrences: int
+    # Estimated distinct affected URLs
+    pages: int
+    # Pages of the template observed so far
+    template_pages: int
+    reproducibility: float
+    score: float
+
+    first_seen: datetime
+    last_seen: datetime
+    first_url: str
+    # Normalized evidence the group is keyed by
+    evidence: Dict[str, Any]
+
+
+class _Group:
+    """
+    Mutable per-fingerprint state.
+    """
+
+    __slots__ = (
+        "fingerprint",
+        "category",
+        "subtype",
+        "template",
+        "description",
+        "evidence",
+        "severity",
+        "confidence",
+        "occurrences",
+        "pages",
+        "first_seen",
+        "last_seen",
+        "first_url",
+    )
+
+    def __init__(
+        self,
+        fingerprint: str,
+        defect: Defect,
+        template: str,
+        evidence: Dict[str, Any],
+        url: str,
+        precision: int,
+    ) -> None:
+        self.fingerprint = fingerprint
+        self.category = defect.category
+        self.subtype = defect.subtype
+        self.template = template
+        self.description = defect.description
+        self.evidence = evidence
+        self.severity = defect.severity
+        self.confidence = defect.confidence
+        self.occurrences = 0
+        self.pages = DistinctCounter(precision)
+        self.first_seen = defect.detected_at
+        self.last_seen = defect.detected_at
+        self.first_url = url
+
+    def update(self, defect: Defect, url: str) -> None:
+        self.occurrences += 1
+        self.pages.add(url)
+        self.severity = max(self.severity, defect.severity)
+        self.confidence = max(self.confidence, defect.confidence)
+        self.last_seen = max(self.last_seen, defect.detected_at)
+        self.first_seen = min(self.first_seen, defect.detected_at)
+
+    def rescore(self, template_pages: int) -> float:
+        pages = self.pages.estimate()
+        return (
+            self.severity / 10
+            * self.confidence
+            * math.log2(1 + pages)
+            * (0.5 + 0.5 * _reproducibility(pages, template_pages))
+        )
+
+
+class DefectAggregator:
+    """
+    Deduplicates defects across a crawl and ranks them.
+
+    Args:
+        max_groups: Groups tracked individually
+        max_templates: URL templates tracked individually
+        precision: DistinctCounter precision of each group's
+            affected-page sketch
+    """
+
+    def __init__(
+        self,
+        max_groups: int = 10_000,
+        max_templates: int = 1024,
+        precision: int = 10,
+    ) -> None:
+        self.max_groups = max_groups
+        self.max_templates = max_templates
+        self.precision = precision
+
+        self._groups: Dict[str, _Group] = {}
+        # Template -> pages observed
+        self._template_pages: Dict[str, int] = {}
+        # Template -> fingerprints of its groups
+        self._template_groups: Dict[str, List[str]] = {}
+        # Fingerprint -> score as of the last read
+        self._index: IndexedHeap[str] = IndexedHeap()
+        # Templates whose groups need rescoring before the next read
+        self._stale: set = set()
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def observe(self, url: str, defects: List[Defect]) -> List[str]:
+        """
+        Record one observed page and its defects (possibly none,
+        which still counts toward reproducibility).
+
+        Returns the group fingerprint of each defect.
+        """
+        template = self._template(url)
+        self._template_pages[template] = self._template_pages.get(template, 0) + 1
+        # This template's page count changed: its groups' scores did too
+        self._stale.add(template)
+
+        fingerprints = []
+        for defect in defects:
+            evidence = normalize_evidence(defect.evidence)
+            fingerprint = defect_fingerprint(defect, evidence, template)
+
+            group = self._groups.get(fingerprint)
+            if group is None:
+                if len(self._groups) >= self.max_groups:
+                    evidence, template_key = {}, OVERFLOW_TEMPLATE
+                    fingerprint = defect_fingerprint(defect, evidence, template_key)
+                    group = self._groups.get(fingerprint)
+                else:
+                    template_key = template
+                if group is None:
+                    group = self._groups[fingerprint] = _Group(
+                        fingerprint, defect, template_key, evidence, url, self.precision,
+                    )
+                    self._template_groups.setdefault(template_key, []).append(fingerprint)
+
+            group.update(defect, url)
+            self._stale.add(group.template)
+            fingerprints.append(fingerprint)
+
+        return fingerprints
+
+    def groups(self) -> List[DefectGroup]:
+        """
+        All groups, highest score first.
+        """
+        return self.top(len(self._groups))
+
+    def top(self, n: int) -> List[DefectGroup]:
+        """
+        The n highest-priority groups; cheap enough to call after
+        every page.
+        """
+        self._refresh()
+        return [
+            self._summarize(self._groups[fingerprint], score)
+            for fingerprint, score in self._index.top(n)
+        ]
+
+    def template_score(self, url: str) -> float:
+        """
+        Highest group score on the URL's template (0.0 if none).
+        """
+        self._refresh()
+        fingerprints = self._template_groups.get(self._template(url), ())
+        return max((self._index.priority(fingerprint) for fingerprint in fingerprints), default=0.0)
+
+    def get(self, fingerprint: str) -> DefectGroup | None:
+        group = self._groups.get(fingerprint)
+        if group is None:
+            return None
+        self._refresh()
+        return self._summarize(group, self._index.priority(fingerprint))
+
+    # Internals
+    def _refresh(self) -> None:
+        for template in self._stale:
+            for fingerprint in self._template_groups.get(template, ()):
+                group = self._groups[fingerprint]
+                self._index.push(fingerprint, group.rescore(self._pages_of(group)))
+        self._stale.clear()
+
+    def _template(self, url: str) -> str:
+        template = url_template(url)
+        if template in self._template_pages or len(self._template_pages) < self.max_templates:
+            return template
+        return OVERFLOW_TEMPLATE
+
+    def _pages_of(self, group: _Group) -> int:
+        return self._template_pages.get(group.template, 0)
+
+    def _summarize(self, group: _Group, score: float) -> DefectGroup:
+        pages = group.pages.estimate()
+        template_pages = self._pages_of(group)
+        return DefectGroup(
+            fingerprint=group.fingerprint,
+            category=group.category,
+            subtype=group.subtype,
+            template=group.template,
+            description=group.description,
+            severity=group.severity,
+            confidence=group.confidence,
+            occurrences=group.occurrences,
+            pages=min(round(pages), group.occurrences),
+            template_pages=template_pages,
+            reproducibility=_reproducibility(pages, template_pages),
+            score=score,
+            first_seen=group.first_seen,
+            last_seen=group.last_seen,
+            first_url=group.first_url,
+            evidence=group.evidence,
+        )
+
+# Public API
+def normalize_evidence(evidence: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Evidence with volatile values removed, for grouping.
+    """
+    normalized: Dict[str, Any] = {}
+    fingerprints: set = set()
+
+    for key, value in evidence.items():
+        if key == "errors":
+            fingerprints.update(fingerprint_message(str(m)) for m in value)
+        elif key == "fingerprints":
+            fingerprints.update(value)
+        elif key in IDENTITY_EVIDENCE_KEYS or isinstance(value, bool):
+            normalized[key] = value
+        elif isinstance(value, (int, float)) or value is None:
+            # Measurement
+            continue
+        elif isinstance(value, str):
+            normalized[key] = normalize_message(value)
+        elif isinstance(value, dict):
+            normalized[key] = sorted(map(str, value))
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            normalized[key] = sorted({normalize_message(str(v)) for v in value})
+
+    if fingerprints:
+        normalized["fingerprints"] = sorted(fingerprints)
+    return normalized
+
+def defect_fingerprint(defect: Defect, evidence: Dict[str, Any], template: str) -> str:
+    """
+    16-hex-digit group key of a defect with normalized evidence.
+    """
+    key: Tuple = (defect.category.value, defect.subtype, evidence, template)
+    payload = json.dumps(key, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+# Helpers
+def _reproducibility(pages: float, template_pages: int) -> float:
+    return min(1.0, pages / template_pages) if template_pages else 1.0
@@ -0,0 +1,99 @@
+"""
+Batch Defect Detection
+
+Evaluates a DefectRuleRegistry over many pages at once, e.g. to
+re-scan an archive after a rule or threshold change. The fields
+the rules read are packed into float columns (missing values as
+NaN, which no comparison matches), each rule becomes a boolean
+mask over all pages, and Defect models are only built for the
+(page, rule) pairs that hit.
+
+Results are identical to calling registry.detect per page.
+Run-level outlier rules are not applied.
+
+Requires numpy (optional dependency).
+
+NO navigation
+NO LangGraph logic
+NO LLMs
+"""
+
+from typing import Dict, List, Sequence, Tuple
+from crawlergraph.state import PageFeatures, RuntimeSignals
+from crawlergraph.defects.models import Defect
+from crawlergraph.defects.registry import DefectRuleRegistry
+from crawlergraph.defects.rules import DEFAULT_REGISTRY
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Public API
+def build_defect_columns(
+    pages: Sequence[Tuple[PageFeatures, RuntimeSignals]],
+    registry: DefectRuleRegistry | None = None,
+) -> Dict[str, "np.ndarray"]:
+    """
+    Pack the fields read by the registry's rules into float64
+    columns keyed by condition field ("signals.status_code").
+    """
+    _require_numpy()
+    registry = registry or DEFAULT_REGISTRY
+
+    fields = sorted({c.field for rule in registry.rules for c in rule.when})
+    columns = {}
+    for field in fields:
+        source, attribute = field.split(".")
+        index = 0 if source == "features" else 1
+        columns[field] = np.fromiter(
+            (_number(getattr(page[index], attribute)) for page in pages),
+            dtype=np.float64,
+            count=len(pages),
+        )
+    return columns
+
+def defect_hit_masks(
+    columns: Dict[str, "np.ndarray"],
+    registry: DefectRuleRegistry | None = None,
+) -> "np.ndarray":
+    """
+    Boolean matrix of shape (len(registry.rules), pages):
+    entry [i, j] is set when rule i fires on page j.
+    """
+    _require_numpy()
+    registry = registry or DEFAULT_REGISTRY
+
+    n = len(next(iter(columns.values()))) if columns else 0
+    masks = np.ones((len(registry.rules), n), dtype=bool)
+    for i, rule in enumerate(registry.rules):
+        for condition in rule.when:
+            masks[i] &= condition.mask(columns[condition.field])
+    return masks
+
+def detect_defects_batch(
+    pages: Sequence[Tuple[PageFeatures, RuntimeSignals]],
+    registry: DefectRuleRegistry | None = None,
+) -> List[List[Defect]]:
+    """
+    Per-page defects for a sequence of (features, signals) pairs,
+    in the same order detect_defects would report them.
+    """
+    registry = registry or DEFAULT_REGISTRY
+    masks = defect_hit_masks(build_defect_columns(pages, registry), registry)
+
+    results: List[List[Defect]] = [[] for _ in pages]
+    # Rule-major so each page's defects keep rule order
+    for rule, mask in zip(registry.rules, masks):
+        for row in np.flatnonzero(mask).tolist():
+            features, signals = pages[row]
+            results[row].append(rule.build_defect(features, signals))
+    return results
+
+# Helpers
+def _number(value) -> float:
+    return float("nan") if value is None else float(value)
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required for batch defect detection")
@@ -0,0 +1,180 @@
+"""
+Defect Rule Registry
+
+Defect rules are declared as data (category, subtype, severity,
+confidence, conditions, threshold) and compiled once into a
+generated function that returns the indices of the rules that
+fired. Defect models are only built for those hits.
+
+A rule's conditions may use the placeholder THRESHOLD as a
+value; it is replaced by the rule's threshold, which runs can
+override through CrawlConfig.defect_rules without code changes.
+Rules can be disabled the same way.
+
+NO navigation
+NO LangGraph logic
+NO LLMs
+"""
+
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from pydantic import BaseModel, Field
+from crawlergraph.state import PageFeatures, RuntimeSignals
+from crawlergraph.defects.models import Defect, DefectCategory
+from crawlergraph.utils.conditions import Condition, FunctionBuilder
+
+# Condition value replaced by the rule's (possibly overridden) threshold
+THRESHOLD = "$threshold"
+
+EvidenceBuilder = Callable[[PageFeatures, RuntimeSignals], Dict]
+
+# Defects produced outside the registry that config may still toggle
+_EXTERNAL_SUBTYPES: set = set()
+
+# (id(rules), config JSON) -> (rules, registry)
+_REGISTRIES: Dict[Tuple[int, str], Tuple[Sequence, "DefectRuleRegistry"]] = {}
+_MAX_REGISTRIES = 32
+
+
+class DefectRule(BaseModel):
+    category: DefectCategory
+    # Unique rule id; also the Defect subtype
+    subtype: str
+    severity: int = Field(ge=1, le=10)
+    confidence: float = Field(ge=0.0, le=1.0)
+    description: str
+    when: List[Condition]
+    threshold: float | None = None
+    # Field paths copied into Defect.evidence, keyed by attribute
+    evidence_fields: List[str] = Field(default_factory=list)
+    # Custom evidence; replaces evidence_fields when set
+    evidence: EvidenceBuilder | None = None
+
+    def resolved(self, threshold: float | None = None) -> "DefectRule":
+        """
+        Copy with THRESHOLD placeholders replaced.
+
+        Raises ValueError if a condition uses THRESHOLD and neither
+        the rule nor the override supplies one.
+        """
+        value = threshold if threshold is not None else self.threshold
+        if value is None and any(c.value == THRESHOLD for c in self.when):
+            raise ValueError(f"Defect rule {self.subtype!r} uses THRESHOLD but has no threshold")
+        when = [
+            c.model_copy(update={"value": value}) if c.value == THRESHOLD else c
+            for c in self.when
+        ]
+        return self.model_copy(update={"threshold": value, "when": when})
+
+    def build_defect(self, features: PageFeatures, signals: RuntimeSignals) -> Defect:
+        if self.evidence is not None:
+            evidence = self.evidence(features, signals)
+        else:
+            inputs = {"features": features, "signals": signals}
+            evidence = {}
+            for path in self.evidence_fields:
+                source, attribute = path.split(".")
+                evidence[attribute] = getattr(inputs[source], attribute)
+
+        return Defect(
+            category=self.category,
+            subtype=self.subtype,
+            severity=self.severity,
+            confidence=self.confidence,
+            description=self.description,
+            evidence=evidence,
+        )
+
+
+class DefectRuleConfig(BaseModel):
+    """
+    Per-run rule overrides (CrawlConfig.defect_rules).
+    """
+    # Subtypes to skip
+    disabled: List[str] = Field(default_factory=list)
+    # Subtype -> threshold
+    thresholds: Dict[str, float] = Field(default_factory=dict)
+
+
+class DefectRuleRegistry:
+    """
+    The enabled rules of a spec, with thresholds applied,
+    compiled into one hit-detection function.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[DefectRule],
+        config: DefectRuleConfig | None = None,
+    ) -> None:
+        config = config or DefectRuleConfig()
+
+        known = {rule.subtype for rule in rules}
+        unknown = (set(config.disabled) | set(config.thresholds)) - known - _EXTERNAL_SUBTYPES
+        if unknown:
+            raise ValueError(f"Unknown defect rule(s) in config: {sorted(unknown)}")
+
+        self.disabled = frozenset(config.disabled)
+        self.thresholds = dict(config.thresholds)
+        self.rules: List[DefectRule] = [
+            rule.resolved(config.thresholds.get(rule.subtype))
+            for rule in rules
+            if rule.subtype not in self.disabled
+        ]
+        self._hits = _compile_hits(self.rules)
+
+    def is_enabled(self, subtype: str) -> bool:
+        return subtype not in self.disabled
+
+    def hits(self, features: PageFeatures, signals: RuntimeSignals) -> List[int]:
+        """
+        Indices into self.rules of the rules that fire.
+        """
+        return self._hits(features, signals)
+
+    def detect(self, features: PageFeatures, signals: RuntimeSignals) -> List[Defect]:
+        rules = self.rules
+        return [rules[i].build_defect(features, signals) for i in self._hits(features, signals)]
+
+# Public API
+def register_external_subtype(subtype: str) -> None:
+    """
+    Allow config to toggle a defect produced outside the
+    registry (e.g. run-level outlier rules).
+    """
+    _EXTERNAL_SUBTYPES.add(subtype)
+
+def build_defect_registry(
+    rules: Sequence[DefectRule],
+    config: DefectRuleConfig | None = None,
+) -> DefectRuleRegistry:
+    """
+    Registry for `rules`, reusing compiled registries for
+    identical configs of the same rule list.
+    """
+    config = config or DefectRuleConfig()
+    key = (id(rules), config.model_dump_json())
+
+    cached = _REGISTRIES.get(key)
+    if cached is not None and cached[0] is rules:
+        return cached[1]
+
+    registry = DefectRuleRegistry(rules, config)
+    if len(_REGISTRIES) >= _MAX_REGISTRIES:
+        _REGISTRIES.clear()
+    # Keep `rules` alive so its id is not reused
+    _REGISTRIES[key] = (rules, registry)
+    return registry
+
+# Helpers
+def _compile_hits(rules: Sequence[DefectRule]) -> Callable[[Any, Any], List[int]]:
+    builder = FunctionBuilder("detect_defect_hits", ("features", "signals"))
+    builder.line("hits = []")
+
+    for index, rule in enumerate(rules):
+        builder.load(rule.when, rule.subtype)
+        tests = builder.tests(rule.when)
+        builder.line(f"if {' and '.join(tests) or 'True'}:  # {rule.subtype}")
+        builder.line(f"hits.append({index})", indent=2)
+
+    builder.line("return hits")
+    return builder.build()
@@ -3,125 +3,203 @@ Defect Detection Rules (v1)
 
 Maps PageFeatures + RuntimeSignals → Defects.
 
+Per-page rules are declared in DEFECT_RULES and evaluated by a
+compiled DefectRuleRegistry (see defects.registry); runs can
+disable rules or override thresholds via CrawlConfig.defect_rules.
+Run-level outlier rules need the PerformanceAggregator and are
+applied here directly.
+
 NO navigation
 NO LangGraph logic
 NO LLMs
 """
 
-from typing import List
+from typing import Dict, List
 from crawlergraph.state import PageFeatures, RuntimeSignals
 from crawlergraph.defects.models import Defect, DefectCategory
-
-
+from crawlergraph.defects.registry import (
+    THRESHOLD,
+    DefectRule,
+    DefectRuleRegistry,
+    build_defect_registry,
+    register_external_subtype,
+)
+from crawlergraph.memory.performance import PerformanceAggregator
+
+# Run-level outlier subtypes, by metric
+_OUTLIER_SUBTYPES = {
+    "page_load_time_ms": (
+        "SlowPageLoadForTemplate",
+        "Page load time is an outlier for its URL template",
+    ),
+    "long_tasks_ms": (
+        "LongTasksForTemplate",
+        "Long main-thread tasks are an outlier for its URL template",
+    ),
+}
+for _subtype, _ in _OUTLIER_SUBTYPES.values():
+    register_external_subtype(_subtype)
+
+
+def _console_error_evidence(features: PageFeatures, signals: RuntimeSignals) -> Dict:
+    """
+    Reference interned messages by fingerprint rather than
+    copying their text into every defect.
+    """
+    if signals.console_error_fingerprints:
+        return {
+            "fingerprints": dict(signals.console_error_fingerprints),
+            "count": signals.console_error_count,
+        }
+    return {"errors": signals.console_errors, "count": signals.console_error_count}
+
+
+DEFECT_RULES: List[DefectRule] = [
+    # Functional defects
+    DefectRule(
+        category=DefectCategory.FUNCTIONAL,
+        subtype="ServerError",
+        severity=9,
+        confidence=0.95,
+        description="Server returned 5xx error",
+        when=[("signals.status_code", ">=", 500)],
+        evidence_fields=["signals.status_code"],
+    ),
+    DefectRule(
+        category=DefectCategory.FUNCTIONAL,
+        subtype="ClientError",
+        severity=7,
+        confidence=0.9,
+        description="Client-side HTTP error",
+        when=[
+            ("signals.status_code", ">=", 400),
+            ("signals.status_code", "<", 500),
+        ],
+        evidence_fields=["signals.status_code"],
+    ),
+    DefectRule(
+        category=DefectCategory.FUNCTIONAL,
+        subtype="ConsoleError",
+        severity=6,
+        confidence=0.85,
+        description="JavaScript console errors detected",
+        when=[("signals.console_error_count", ">", THRESHOLD)],
+        threshold=0,
+        evidence=_console_error_evidence,
+    ),
+    DefectRule(
+        category=DefectCategory.FUNCTIONAL,
+        subtype="NetworkFailure",
+        severity=6,
+        confidence=0.8,
+        description="Failed network requests detected",
+        when=[("signals.failed_requests", ">", THRESHOLD)],
+        threshold=0,
+        evidence_fields=["signals.failed_requests"],
+    ),
+
+    # UI defects
+    DefectRule(
+        category=DefectCategory.UI,
+        subtype="LayoutOverlap",
+        severity=5,
+        confidence=0.75,
+        description="Overlapping UI elements detected",
+        when=[("signals.layout_overlaps", "true")],
+    ),
+
+    # Performance defects
+    DefectRule(
+        category=DefectCategory.PERFORMANCE,
+        subtype="SlowPageLoad",
+        severity=6,
+        confidence=0.8,
+        description="Page load time exceeded threshold",
+        when=[
+            ("signals.page_load_time_ms", "true"),
+            ("signals.page_load_time_ms", ">", THRESHOLD),
+        ],
+        threshold=3000,
+        evidence_fields=["signals.page_load_time_ms"],
+    ),
+    DefectRule(
+        category=DefectCategory.PERFORMANCE,
+        subtype="LongMainThreadTasks",
+        severity=5,
+        confidence=0.75,
+        description="Long main-thread tasks detected",
+        when=[
+            ("signals.long_tasks_ms", "true"),
+            ("signals.long_tasks_ms", ">", THRESHOLD),
+        ],
+        threshold=200,
+        evidence_fields=["signals.long_tasks_ms"],
+    ),
+]
+
+DEFAULT_REGISTRY = build_defect_registry(DEFECT_RULES)
+
+# Public API
 def detect_defects(
     features: PageFeatures,
-    signals: RuntimeSignals
+    signals: RuntimeSignals,
+    url: str | None = None,
+    performance: PerformanceAggregator | None = None,
+    registry: DefectRuleRegistry | None = None,
 ) -> List[Defect]:
-    defects: List[Defect] = []
+    """
+    Pass the page URL and the run's PerformanceAggregator to also
+    flag pages that are slow relative to their URL template.
 
-    defects.extend(_functional_defects(signals))
-    defects.extend(_ui_defects(signals))
-    defects.extend(_performance_defects(signals))
+    `registry` defaults to DEFECT_RULES with no overrides; build
+    one per run with build_defect_registry(DEFECT_RULES, config).
+    """
+    registry = registry or DEFAULT_REGISTRY
 
-    return defects
-
-# Functional defects
-def _functional_defects(signals: RuntimeSignals) -> List[Defect]:
-    defects = []
-
-    if signals.status_code >= 500:
-        defects.append(
-            Defect(
-                category=DefectCategory.FUNCTIONAL,
-                subtype="ServerError",
-                severity=9,
-                confidence=0.95,
-                description="Server returned 5xx error",
-                evidence={"status_code": signals.status_code},
-            )
-        )
-
-    if 400 <= signals.status_code < 500:
-        defects.append(
-            Defect(
-                category=DefectCategory.FUNCTIONAL,
-                subtype="ClientError",
-                severity=7,
-                confidence=0.9,
-                description="Client-side HTTP error",
-                evidence={"status_code": signals.status_code},
-            )
-        )
-
-    if signals.console_errors:
-        defects.append(
-            Defect(
-                category=DefectCategory.FUNCTIONAL,
-                subtype="ConsoleError",
-                severity=6,
-                confidence=0.85,
-                description="JavaScript console errors detected",
-                evidence={"errors": signals.console_errors},
-            )
-        )
-
-    if signals.failed_requests > 0:
-        defects.append(
-            Defect(
-                category=DefectCategory.FUNCTIONAL,
-                subtype="NetworkFailure",
-                severity=6,
-                confidence=0.8,
-                description="Failed network requests detected",
-                evidence={"failed_requests": signals.failed_requests},
-            )
-        )
+    defects = registry.detect(features, signals)
+    if performance is not None and url is not None:
+        defects.extend(_performance_outlier_defects(signals, url, performance, registry))
 
     return defects
 
-# UI defects
-def _ui_defects(signals: RuntimeSignals) -> List[Defect]:
-    defects = []
-
-    if signals.layout_overlaps:
-        defects.append(
-            Defect(
-                category=DefectCategory.UI,
-                subtype="LayoutOverlap",
-                severity=5,
-                confidence=0.75,
-                description="Overlapping UI elements detected",
-                evidence={},
-            )
-        )
-
-    return defects
+# Run-level rules
+def _performance_outlier_defects(
+    signals: RuntimeSignals,
+    url: str,
+    performance: PerformanceAggregator,
+    registry: DefectRuleRegistry,
+) -> List[Defect]:
+    """
+    Pages much slower than other pages of the same URL template.
 
-# Performance defects
-def _performance_defects(signals: RuntimeSignals) -> List[Defect]:
+    A threshold override for the subtype replaces the
+    aggregator's outlier factor.
+    """
     defects = []
+    factors = {
+        metric: registry.thresholds[subtype]
+        for metric, (subtype, _) in _OUTLIER_SUBTYPES.items()
+        if subtype in registry.thresholds
+    }
 
-    if signals.page_load_time_ms and signals.page_load_time_ms > 3000:
-        defects.append(
-            Defect(
-                category=DefectCategory.PERFORMANCE,
-                subtype="SlowPageLoad",
-                severity=6,
-                confidence=0.8,
-                description="Page load time exceeded threshold",
-                evidence={"page_load_time_ms": signals.page_load_time_ms},
-            )
-        )
+    for outlier in performance.outliers(url, signals, factors):
+        subtype, description = _OUTLIER_SUBTYPES[outlier.metric]
+        if not registry.is_enabled(subtype):
+            continue
 
-    if signals.long_tasks_ms and signals.long_tasks_ms > 200:
         defects.append(
             Defect(
                 category=DefectCategory.PERFORMANCE,
-                subtype="LongMainThreadTasks",
+                subtype=subtype,
                 severity=5,
-                confidence=0.75,
-                description="Long main-thread tasks detected",
-                evidence={"long_tasks_ms": signals.long_tasks_ms},
+                confidence=0.7,
+                description=description,
+                evidence={
+                    outlier.metric: outlier.value,
+                    "template": outlier.template,
+                    "template_p95": round(outlier.baseline_p95, 1),
+                    "template_samples": outlier.samples,
+                },
             )
         )
 
@@ -0,0 +1,139 @@
+"""
+Batch DOM Feature Extraction
+
+Spreads extract_dom_features over a process pool for offline
+jobs such as re-analyzing archived crawls. Extraction is
+CPU-bound pure Python, so threads would stay on one core.
+
+Results are returned in input order. Small batches run
+serially, where pool start-up and pickling would cost more
+than they save.
+
+Observations are read lazily, one chunk at a time, and at most
+`max_in_flight` chunks are submitted and not yet collected, so a
+generator over an archive is never held in memory whole (only
+the results are).
+
+NO LangGraph logic
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Deque, Iterable, Iterator, List, Sized, Tuple
+from crawlergraph.state import PageFeatures
+from crawlergraph.io.input_schema import ObservationPayload
+from crawlergraph.features.dom_features import (
+    STREAMING_THRESHOLD_CHARS,
+    extract_dom_features,
+)
+from crawlergraph.features.keywords import KeywordEngine
+
+# Below this many observations the pool is not worth starting
+SERIAL_THRESHOLD = 16
+
+# Chunks handed to each worker over a batch of known size
+_CHUNKS_PER_WORKER = 4
+# Observations per chunk when the batch size is unknown
+_DEFAULT_CHUNKSIZE = 8
+# Chunks in flight per worker by default
+_IN_FLIGHT_PER_WORKER = 2
+
+# Public API
+def extract_dom_features_many(
+    observations: Iterable[ObservationPayload],
+    parser: str | None = None,
+    streaming_threshold: int | None = STREAMING_THRESHOLD_CHARS,
+    max_workers: int | None = None,
+    chunksize: int | None = None,
+    serial_threshold: int = SERIAL_THRESHOLD,
+    executor: Executor | None = None,
+    keywords: KeywordEngine | None = None,
+    max_in_flight: int | None = None,
+) -> List[PageFeatures]:
+    """
+    Extract PageFeatures for many observations.
+
+    Args:
+        observations: Browser observations (only url and dom are
+            read); any iterable, consumed lazily
+        parser: Parser backend, as for extract_dom_features
+        streaming_threshold: As for extract_dom_features
+        max_workers: Pool size; defaults to the CPU count
+        chunksize: Observations per task; defaults to spreading
+            a sized batch over a few chunks per worker
+        serial_threshold: Batches smaller than this run in-process
+        executor: Existing pool to reuse across calls
+        keywords: As for extract_dom_features
+        max_in_flight: Chunks submitted but not yet collected;
+            defaults to two per worker
+
+    Returns:
+        PageFeatures, in the same order as `observations`
+    """
+    pages = ((o.dom, o.url) for o in observations)
+    workers = max_workers or os.cpu_count() or 1
+
+    # Enough of the input to tell a small batch from a large one
+    head = list(islice(pages, serial_threshold))
+    if executor is None and (len(head) < serial_threshold or workers == 1):
+        return _extract_chunk(list(chain(head, pages)), parser, streaming_threshold, keywords)
+
+    if chunksize is None:
+        if isinstance(observations, Sized):
+            chunksize = max(1, -(-len(observations) // (workers * _CHUNKS_PER_WORKER)))
+        else:
+            chunksize = _DEFAULT_CHUNKSIZE
+    chunks = _chunked(chain(head, pages), chunksize)
+    window = max_in_flight or workers * _IN_FLIGHT_PER_WORKER
+    args = (parser, streaming_threshold, keywords)
+
+    if executor is not None:
+        return _run_windowed(executor, chunks, args, window)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _run_windowed(pool, chunks, args, window)
+
+# Worker
+def _extract_chunk(
+    pages: List[Tuple[str, str]],
+    parser: str | None,
+    streaming_threshold: int | None,
+    keywords: KeywordEngine | None,
+) -> List[PageFeatures]:
+    return [
+        extract_dom_features(
+            dom,
+            url,
+            parser=parser,
+            streaming_threshold=streaming_threshold,
+            keywords=keywords,
+        )
+        for dom, url in pages
+    ]
+
+# Helpers
+def _chunked(pages: Iterator[Tuple[str, str]], size: int) -> Iterator[List[Tuple[str, str]]]:
+    while chunk := list(islice(pages, size)):
+        yield chunk
+
+def _run_windowed(
+    executor: Executor,
+    chunks: Iterator[List[Tuple[str, str]]],
+    args: Tuple,
+    window: int,
+) -> List[PageFeatures]:
+    """
+    Submit chunks in order with at most `window` outstanding,
+    collecting the oldest before reading the next.
+    """
+    results: List[PageFeatures] = []
+    pending: Deque[Future] = deque()
+    for chunk in chunks:
+        if len(pending) >= window:
+            results.extend(pending.popleft().result())
+        pending.append(executor.submit(_extract_chunk, chunk, *args))
+    while pending:
+        results.extend(pending.popleft().result())
+    return results
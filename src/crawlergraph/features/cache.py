@@ -0,0 +1,357 @@
+"""
+Content-Addressed Feature Cache
+
+Caches DOM features and page classifications by the SHA-256
+page hash (see memory.loop_guards.compute_page_hash) plus the
+extractor version, keyword configuration and extraction mode
+(the resolved parser backend, or streaming), so revisiting an
+identical page skips both extract_dom_features and
+classify_page_type. Backends disagree on malformed markup (see
+features.parsers), so workers configured for different parsers
+never share entries. Features can be keyed on the skeleton hash
+instead (see features.skeleton), so pages that differ only in
+text share one entry.
+
+LoopState.from_input (via cached_extract_page) and the
+classify_page node use the cache on RunContext.feature_cache
+(see new_feature_cache).
+
+Two tiers:
+    memory  bounded LRU with optional TTL, per process
+    disk    optional SQLite file (WAL mode) shared by workers
+
+URL hints are not DOM-derived, so they are recomputed for the
+current URL on every hit.
+
+NO LangGraph logic
+"""
+
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+from pydantic import BaseModel
+from crawlergraph.state import PageFeatures, PageFingerprint, PageType, RuntimeSignals
+from crawlergraph.features.dom_features import (
+    EXTRACTOR_VERSION,
+    STREAMING_THRESHOLD_CHARS,
+    extract_dom_features,
+)
+from crawlergraph.features.incremental import DomSnapshot, extract_dom_snapshot
+from crawlergraph.features.keywords import DEFAULT_KEYWORDS, KeywordEngine
+from crawlergraph.features.parsers import resolve_parser_backend
+from crawlergraph.features.skeleton import SkeletonHasher, skeleton_algorithm
+from crawlergraph.classifiers.page_type import classify_page_type
+from crawlergraph.classifiers.page_type_rules import PAGE_TYPE_RULES
+from crawlergraph.io.input_schema import CrawlConfig
+from crawlergraph.memory.loop_guards import compute_page_hash, compute_skeleton_hash
+
+# Fields classify_page_type reads, as (input, attribute)
+_CLASSIFIER_FIELDS: Tuple[Tuple[str, str], ...] = tuple(sorted(
+    {condition.path for rule in PAGE_TYPE_RULES for condition in rule.when}
+))
+
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    disk_hits: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class FeatureCache:
+    """
+    Bounded LRU/TTL cache with an optional shared disk tier.
+
+    Args:
+        max_entries: In-memory capacity; least recently used
+            entries are evicted beyond it
+        ttl_seconds: Entry lifetime; None keeps entries until evicted
+        disk_path: SQLite file shared between worker processes
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl_seconds: float | None = None,
+        disk_path: str | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float | None, Any]]" = OrderedDict()
+        self._stats = CacheStats()
+
+        self._disk: sqlite3.Connection | None = None
+        if disk_path is not None:
+            self._disk = _open_disk_tier(disk_path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> CacheStats:
+        return self._stats.model_copy()
+
+    def get(self, key: Hashable, decode: Callable[[str], Any] | None = None) -> Any:
+        """
+        Return the cached value, or None on a miss.
+
+        `decode` turns a disk-tier JSON payload back into a value;
+        without it the disk tier is not consulted.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self._stats.expirations += 1
+            else:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return value
+
+        if self._disk is not None and decode is not None:
+            payload = self._disk_get(key)
+            if payload is not None:
+                value = decode(payload)
+                self._remember(key, value)
+                self._stats.hits += 1
+                self._stats.disk_hits += 1
+                return value
+
+        self._stats.misses += 1
+        return None
+
+    def put(self, key: Hashable, value: Any, payload: str | None = None) -> None:
+        """
+        Store a value; `payload` (JSON) is also written to disk.
+        """
+        self._remember(key, value)
+        if self._disk is not None and payload is not None:
+            self._disk_put(key, payload)
+
+    def clear(self) -> None:
+        """
+        Drop every entry, including the shared disk tier.
+        """
+        self._entries.clear()
+        if self._disk is not None:
+            with self._disk:
+                self._disk.execute("DELETE FROM feature_cache")
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    # Internals
+    def _remember(self, key: Hashable, value: Any) -> None:
+        expires_at = None if self.ttl_seconds is None else self._clock() + self.ttl_seconds
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def _disk_get(self, key: Hashable) -> str | None:
+        row = self._disk.execute(
+            "SELECT payload, created_at FROM feature_cache WHERE key = ?",
+            (_disk_key(key),),
+        ).fetchone()
+        if row is None:
+            return None
+        payload, created_at = row
+        if self.ttl_seconds is not None and created_at + self.ttl_seconds <= self._clock():
+            self._stats.expirations += 1
+            return None
+        return payload
+
+    def _disk_put(self, key: Hashable, payload: str) -> None:
+        with self._disk:
+            self._disk.execute(
+                "INSERT OR REPLACE INTO feature_cache (key, payload, created_at) "
+                "VALUES (?, ?, ?)",
+                (_disk_key(key), payload, self._clock()),
+            )
+
+# Public API
+def cached_extract_dom_features(
+    cache: FeatureCache,
+    dom: str,
+    url: str | None = None,
+    page_hash: str | None = None,
+    parser: str | None = None,
+    streaming_threshold: int | None = STREAMING_THRESHOLD_CHARS,
+    keywords: KeywordEngine | None = None,
+    skeleton_hash: str | None = None,
+    key_on: PageFingerprint = "content",
+) -> PageFeatures:
+    """
+    extract_dom_features with a content-addressed cache.
+
+    Pass `page_hash` (or `skeleton_hash`) when it is already
+    known to avoid hashing the DOM twice.
+
+    With key_on="skeleton", pages with the same markup skeleton
+    share cached features: text-derived flags (error banners,
+    empty state, pagination link text) are those of the first
+    page cached.
+    """
+    keywords = keywords or DEFAULT_KEYWORDS
+    if key_on == "skeleton":
+        namespace, fingerprint = "skeleton_features", skeleton_hash or compute_skeleton_hash(dom)
+    else:
+        namespace, fingerprint = "features", page_hash or compute_page_hash(dom)
+    key = (
+        namespace,
+        fingerprint,
+        EXTRACTOR_VERSION,
+        keywords.fingerprint,
+        _extraction_mode(dom, parser, streaming_threshold),
+    )
+
+    features = cache.get(key, decode=PageFeatures.model_validate_json)
+    if features is None:
+        features = extract_dom_features(
+            dom,
+            parser=parser,
+            streaming_threshold=streaming_threshold,
+            keywords=keywords,
+        )
+        cache.put(key, features, payload=features.model_dump_json())
+
+    return features.model_copy(update={"url_patterns": keywords.url_patterns(url)})
+
+def cached_extract_page(
+    cache: FeatureCache,
+    dom: str,
+    url: str | None = None,
+    page_hash: str | None = None,
+    parser: str | None = None,
+    streaming_threshold: int | None = STREAMING_THRESHOLD_CHARS,
+    keywords: KeywordEngine | None = None,
+) -> Tuple[DomSnapshot, str]:
+    """
+    DOM snapshot (features plus the counts incremental updates
+    need, see features.incremental) and skeleton hash of a page,
+    cached together under its content hash, so a hit skips the
+    traversal that produces both.
+
+    Returns:
+        (DomSnapshot, skeleton hash)
+    """
+    keywords = keywords or DEFAULT_KEYWORDS
+    key = (
+        "page",
+        page_hash or compute_page_hash(dom),
+        EXTRACTOR_VERSION,
+        keywords.fingerprint,
+        _extraction_mode(dom, parser, streaming_threshold),
+        skeleton_algorithm(),
+    )
+
+    entry = cache.get(key, decode=_decode_page)
+    if entry is None:
+        skeleton = SkeletonHasher()
+        snapshot = extract_dom_snapshot(
+            dom,
+            parser=parser,
+            streaming_threshold=streaming_threshold,
+            keywords=keywords,
+            skeleton=skeleton,
+        )
+        entry = (snapshot, skeleton.hexdigest())
+        payload = json.dumps({"snapshot": snapshot.model_dump(mode="json"), "skeleton_hash": entry[1]})
+        cache.put(key, entry, payload=payload)
+
+    snapshot, skeleton_hash = entry
+    return snapshot.model_copy(update={"url": url, "url_patterns": keywords.url_patterns(url)}), skeleton_hash
+
+def cached_classify_page_type(
+    cache: FeatureCache,
+    page_hash: str,
+    features: PageFeatures,
+    signals: RuntimeSignals,
+) -> Tuple[PageType, float]:
+    """
+    classify_page_type with a content-addressed cache, keyed by
+    `page_hash` (or any page fingerprint the features came from).
+
+    The key includes every feature and signal the classifier
+    reads, so a page that errors on one visit and not another,
+    or whose features came from another parser, is classified
+    separately.
+    """
+    inputs = {"features": features, "signals": signals}
+    key = (
+        "page_type",
+        page_hash,
+        EXTRACTOR_VERSION,
+        *(_key_value(getattr(inputs[source], name)) for source, name in _CLASSIFIER_FIELDS),
+    )
+
+    result = cache.get(key, decode=_decode_classification)
+    if result is None:
+        result = classify_page_type(features, signals)
+        cache.put(key, result, payload=json.dumps([result[0].value, result[1]]))
+
+    return result
+
+def new_feature_cache(config: CrawlConfig | None = None) -> FeatureCache | None:
+    """
+    Cache for the configured size, TTL and disk tier, or None
+    when disabled.
+    """
+    config = config or CrawlConfig()
+    if config.feature_cache_entries is None:
+        return None
+    return FeatureCache(
+        max_entries=config.feature_cache_entries,
+        ttl_seconds=config.feature_cache_ttl_seconds,
+        disk_path=config.feature_cache_path,
+    )
+
+# Helpers
+def _extraction_mode(dom: str, parser: str | None, streaming_threshold: int | None) -> str:
+    # Mirrors extract_dom_features' dispatch
+    if streaming_threshold is not None and len(dom) >= streaming_threshold:
+        return "streaming"
+    return resolve_parser_backend(parser)
+
+def _key_value(value: Any) -> Hashable:
+    return tuple(value) if isinstance(value, list) else value
+
+def _open_disk_tier(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS feature_cache ("
+        " key TEXT PRIMARY KEY,"
+        " payload TEXT NOT NULL,"
+        " created_at REAL NOT NULL)"
+    )
+    conn.commit()
+    return conn
+
+def _disk_key(key: Hashable) -> str:
+    return json.dumps(key, separators=(",", ":"))
+
+def _decode_page(payload: str) -> Tuple[DomSnapshot, str]:
+    entry = json.loads(payload)
+    return DomSnapshot.model_validate(entry["snapshot"]), entry["skeleton_hash"]
+
+def _decode_classification(payload: str) -> Tuple[PageType, float]:
+    page_type, confidence = json.loads(payload)
+    return PageType(page_type), confidence
@@ -0,0 +1,231 @@
+"""
+Single-Pass DOM Feature Visitor
+
+Computes every PageFeatures field from a stream of
+start-tag / text / end-tag events, so a document only
+has to be traversed once.
+
+Text is read once per string node. Keyword checks that
+depend on element containment (error banners, pagination
+link text) are resolved online against the currently open
+elements instead of calling get_text() per element.
+
+NO parsing
+NO LangGraph logic
+NO LLMs
+"""
+
+from typing import List, Mapping
+from crawlergraph.state import PageFeatures
+from crawlergraph.features.skeleton import SkeletonHasher
+from crawlergraph.features.keywords import DEFAULT_KEYWORDS, KeywordEngine
+
+_TEXT_BLOCK_TAGS = frozenset({"div", "span", "p"})
+_CONTENT_BLOCK_TAGS = frozenset({"section", "article", "main", "aside", "div"})
+
+_USERNAME_INPUT_TYPES = frozenset({"text", "email"})
+
+
+class DomFeatureVisitor:
+    """
+    Accumulates PageFeatures from document-order events.
+
+    Callers must emit properly nested start/end events and only
+    pass main-content strings (no comments, script or style text)
+    to text(). Attribute values may be str, a list of class
+    tokens, or None for valueless attributes.
+
+    Keyword groups come from `keywords` (see features.keywords);
+    the default engine holds the built-in English lists. A
+    `skeleton` hasher (see features.skeleton) is fed every
+    start/end event as well.
+    """
+
+    __slots__ = (
+        "keywords",
+        "skeleton",
+        "element_count",
+        "form_count",
+        "username_input_count",
+        "password_input_count",
+        "input_count",
+        "submit_button_count",
+        "table_count",
+        "content_block_count",
+        "pagination_controls",
+        "error_banners",
+        "empty_state_detected",
+        "_text_len",
+        "_has_text",
+        "_error_tail",
+        "_empty_tail",
+        "_block_starts",
+        "_anchor_texts",
+    )
+
+    def __init__(
+        self,
+        keywords: KeywordEngine | None = None,
+        skeleton: SkeletonHasher | None = None,
+    ) -> None:
+        self.keywords = keywords or DEFAULT_KEYWORDS
+        self.skeleton = skeleton
+
+        # Raw counts, so callers can apply add/remove deltas
+        self.element_count = 0
+        self.form_count = 0
+        self.username_input_count = 0
+        self.password_input_count = 0
+        self.input_count = 0
+        self.submit_button_count = 0
+        self.table_count = 0
+        self.content_block_count = 0
+        self.pagination_controls = False
+        self.error_banners = False
+        self.empty_state_detected = False
+
+        # Length of the lowered, unseparated document text seen so far
+        self._text_len = 0
+        self._has_text = False
+        self._error_tail = ""
+        self._empty_tail = ""
+
+        # Text offsets at which each open div/span/p started
+        self._block_starts: List[int] = []
+        # Text of each open <a>; None once it can no longer match
+        self._anchor_texts: List[str | None] = []
+
+    @property
+    def wants_text(self) -> bool:
+        """
+        False once every text-derived boolean is settled.
+        """
+        return not (
+            self.error_banners
+            and self.empty_state_detected
+            and self.pagination_controls
+        )
+
+    # Events
+    def start(self, tag: str, attrs: Mapping) -> None:
+        self.element_count += 1
+        if self.skeleton is not None:
+            self.skeleton.start(tag, attrs)
+
+        if tag in _CONTENT_BLOCK_TAGS:
+            self.content_block_count += 1
+
+        if tag in _TEXT_BLOCK_TAGS:
+            self._block_starts.append(self._text_len)
+            if not self.error_banners:
+                cls = attrs.get("class") or ""
+                if not isinstance(cls, str):
+                    cls = " ".join(cls)
+                if self.keywords.error.search(cls.lower()):
+                    self.error_banners = True
+            return
+
+        if tag == "a":
+            self._anchor_texts.append(None if self.pagination_controls else "")
+        elif tag == "input":
+            self._visit_input(attrs)
+        elif tag == "button":
+            self.submit_button_count += 1
+        elif tag == "table":
+            self.table_count += 1
+        elif tag == "form":
+            self.form_count += 1
+        elif tag == "nav" and not self.pagination_controls:
+            label = (attrs.get("aria-label") or "").lower()
+            if self.keywords.pagination_label.search(label):
+                self.pagination_controls = True
+
+    def end(self, tag: str) -> None:
+        if self.skeleton is not None:
+            self.skeleton.end(tag)
+
+        if tag in _TEXT_BLOCK_TAGS:
+            self._block_starts.pop()
+        elif tag == "a":
+            text = self._anchor_texts.pop()
+            if text is not None and text.lower().strip() in self.keywords.pagination_link:
+                self.pagination_controls = True
+
+    def text(self, data: str) -> None:
+        lowered = data.lower()
+        keywords = self.keywords
+
+        if not self.error_banners:
+            window = self._error_tail + lowered
+            if self._block_starts:
+                # A keyword counts if it lies inside any open block,
+                # i.e. starts at or after the outermost block's start.
+                base = self._text_len - len(self._error_tail)
+                pos = max(self._block_starts[0] - base, 0)
+                if keywords.error.search(window, pos):
+                    self.error_banners = True
+            self._error_tail = _tail(window, keywords.error.max_length)
+
+        if not self.empty_state_detected:
+            if self._has_text:
+                window = self._empty_tail + " " + lowered
+            else:
+                window = lowered
+            if keywords.empty_state.search(window):
+                self.empty_state_detected = True
+            self._empty_tail = _tail(window, keywords.empty_state.max_length)
+
+        if self._anchor_texts and not self.pagination_controls:
+            for i, text in enumerate(self._anchor_texts):
+                if text is None:
+                    continue
+                text += data
+                if len(text.strip()) > keywords.pagination_link_max:
+                    text = None
+                self._anchor_texts[i] = text
+
+        self._text_len += len(lowered)
+        self._has_text = True
+
+    # Output
+    def to_features(self, url: str | None = None) -> PageFeatures:
+        return PageFeatures(
+            has_form=self.form_count > 0,
+            has_username_input=self.username_input_count > 0,
+            has_password_input=self.password_input_count > 0,
+            input_count=self.input_count,
+            submit_button_count=self.submit_button_count,
+            table_count=self.table_count,
+            pagination_controls=self.pagination_controls,
+            error_banners=self.error_banners,
+            empty_state_detected=self.empty_state_detected,
+            content_block_count=self.content_block_count,
+            url_patterns=self.keywords.url_patterns(url),
+        )
+
+    # Helpers
+    def _visit_input(self, attrs: Mapping) -> None:
+        self.input_count += 1
+
+        input_type = attrs.get("type")
+        if input_type == "password":
+            self.password_input_count += 1
+        elif input_type == "submit":
+            self.submit_button_count += 1
+        elif input_type in _USERNAME_INPUT_TYPES:
+            hints = " ".join([
+                attrs.get("name") or "",
+                attrs.get("id") or "",
+                attrs.get("placeholder") or "",
+                attrs.get("aria-label") or "",
+            ]).lower()
+            if self.keywords.username.search(hints):
+                self.username_input_count += 1
+
+def _tail(window: str, max_length: int) -> str:
+    """
+    The end of `window` that a keyword continuing into the
+    next string could start in.
+    """
+    keep = max_length - 1
+    return window[-keep:] if keep > 0 else ""
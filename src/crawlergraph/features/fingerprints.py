@@ -0,0 +1,122 @@
+"""
+Runtime Message Fingerprinting
+
+Console and network error messages repeat across every page of
+a crawl, differing only in volatile parts (URLs, ids, counters,
+line/column positions). Normalizing those away gives a stable
+template whose hash identifies "the same error".
+
+A MessageInterner is the per-run table of templates. Pages and
+defects then hold fingerprint -> occurrence count maps instead
+of copies of the raw strings.
+
+NO browser orchestration
+NO LangGraph logic
+"""
+
+import hashlib
+import re
+from typing import Dict, Iterator
+from pydantic import BaseModel
+
+_URL = re.compile(r"\b[a-z][a-z0-9+.-]*://[^\s'\"()<>]+", re.IGNORECASE)
+_UUID = re.compile(
+    r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b",
+    re.IGNORECASE,
+)
+_HEX = re.compile(r"\b0x[0-9a-f]+\b|\b(?=[0-9a-f]*\d)[0-9a-f]{8,}\b", re.IGNORECASE)
+# app.js:12 / app.js:12:34 (not host:8080)
+_SOURCE_POSITION = re.compile(r"(\.(?:[cm]?js|[jt]sx?|html?|css|vue))(?::\d+){1,2}\b", re.IGNORECASE)
+# <anonymous>:12:34 / line 12, col 34 (not 12:30)
+_POSITION = re.compile(r"(?<![\d:]):\d+:\d+\b|\bline \d+(?:,? col(?:umn)? \d+)?", re.IGNORECASE)
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_WHITESPACE = re.compile(r"\s+")
+
+# Raw messages remembered per interner before the lookup table resets
+_MAX_KNOWN_MESSAGES = 4096
+
+
+class MessageEntry(BaseModel):
+    fingerprint: str
+    # Normalized message
+    template: str
+    # First raw message seen with this fingerprint
+    sample: str
+    count: int = 0
+
+# Public API
+def normalize_message(text: str) -> str:
+    """
+    Replace volatile parts of a message with placeholders.
+    """
+    text = _URL.sub("<url>", text)
+    text = _UUID.sub("<id>", text)
+    text = _HEX.sub("<hex>", text)
+    text = _SOURCE_POSITION.sub(r"\1:<pos>", text)
+    text = _POSITION.sub(":<pos>", text)
+    text = _NUMBER.sub("<n>", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+def fingerprint_message(text: str) -> str:
+    """
+    16-hex-digit hash of the normalized message.
+    """
+    return _hash(normalize_message(text))
+
+
+class MessageInterner:
+    """
+    Per-run table of message templates.
+
+    Args:
+        max_sample_chars: Length cap for stored raw samples
+    """
+
+    def __init__(self, max_sample_chars: int = 1024) -> None:
+        self.max_sample_chars = max_sample_chars
+        self._entries: Dict[str, MessageEntry] = {}
+        # Raw text -> fingerprint, to skip re-normalizing repeats
+        self._known: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self._entries
+
+    def __iter__(self) -> Iterator[MessageEntry]:
+        return iter(self._entries.values())
+
+    def intern(self, text: str) -> str:
+        """
+        Record one occurrence of a message; returns its fingerprint.
+        """
+        fingerprint = self._known.get(text)
+        if fingerprint is None:
+            template = normalize_message(text)
+            fingerprint = _hash(template)
+            if len(self._known) >= _MAX_KNOWN_MESSAGES:
+                self._known.clear()
+            self._known[text] = fingerprint
+            if fingerprint not in self._entries:
+                self._entries[fingerprint] = MessageEntry(
+                    fingerprint=fingerprint,
+                    template=template,
+                    sample=text[:self.max_sample_chars],
+                )
+
+        self._entries[fingerprint].count += 1
+        return fingerprint
+
+    def get(self, fingerprint: str) -> MessageEntry | None:
+        return self._entries.get(fingerprint)
+
+    def table(self) -> Dict[str, MessageEntry]:
+        """
+        Snapshot of the table, for run outputs.
+        """
+        return {fp: entry.model_copy() for fp, entry in self._entries.items()}
+
+# Helpers
+def _hash(template: str) -> str:
+    return hashlib.blake2b(template.encode("utf-8"), digest_size=8).hexdigest()
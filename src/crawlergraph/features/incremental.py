@@ -0,0 +1,459 @@
+"""
+Incremental DOM Feature Updates
+
+Keeps PageFeatures current on single-page apps by applying
+MutationObserver-style records (see io.input_schema.DomMutation)
+instead of re-parsing the full DOM after every interaction.
+
+Count features are exact: each added/removed subtree is run
+through the same DomFeatureVisitor and its counts are added or
+subtracted. Text-derived flags (error banners, empty state,
+pagination) are set when a fragment proves them on its own.
+When a mutation could change a flag in a way only its
+surrounding DOM can tell, the update falls back to a full
+re-extract. The same happens once a batch touches more than
+`churn_threshold` of the page's elements.
+
+Keywords are matched across text node boundaries, and records
+do not say what text a node sat between. The snapshot therefore
+keeps, per keyword group, the keyword factors (substrings of a
+keyword) that occur in the page text, and how many independent
+matches hold up each set flag. Text is seen as the matchers see
+it: unseparated for error keywords and link text, strings
+joined by spaces for empty-state phrases, and a text node may
+merge with its neighbours.
+
+    added    an unset flag falls back only if the node's text
+             (or, for empty state, the space around an element)
+             could complete a keyword with factors present on
+             the page; a set flag falls back only once every
+             match holding it up could have been split
+    removed  an unset flag falls back only if the texts on
+             either side could now join into a keyword; a set
+             flag falls back only once every match holding it up
+             could have been inside or across the removed node
+
+Start-tag-only records (attribute changes) leave the text alone.
+
+NO browser logic
+NO LangGraph logic
+"""
+
+from typing import FrozenSet, List, Mapping, Set, Tuple
+from bs4 import BeautifulSoup
+from pydantic import BaseModel
+from crawlergraph.state import PageFeatures
+from crawlergraph.io.input_schema import DomMutation
+from crawlergraph.features.dom_features import STREAMING_THRESHOLD_CHARS
+from crawlergraph.features.dom_visitor import _TEXT_BLOCK_TAGS, DomFeatureVisitor, _tail
+from crawlergraph.features.keywords import DEFAULT_KEYWORDS, KeywordEngine
+from crawlergraph.features.parsers import parse_into, walk_soup
+from crawlergraph.features.skeleton import SkeletonHasher
+from crawlergraph.features.streaming import StreamingFeatureExtractor
+
+DEFAULT_CHURN_THRESHOLD = 0.25
+
+_COUNT_FIELDS = (
+    "element_count",
+    "form_count",
+    "username_input_count",
+    "password_input_count",
+    "input_count",
+    "submit_button_count",
+    "table_count",
+    "content_block_count",
+)
+# Attribute matches behind a flag; exact, like the counts
+_FIXED_SUPPORT_FIELDS = ("error_classes", "pagination_navs")
+_TEXT_FIELDS = (
+    "error_factors",
+    "empty_factors",
+    "link_factors",
+    "error_support",
+    "empty_support",
+    "pagination_support",
+) + _FIXED_SUPPORT_FIELDS
+
+
+class DomSnapshot(BaseModel):
+    """
+    PageFeatures plus the raw counts needed to apply deltas.
+    """
+    url: str | None = None
+    url_patterns: List[str] = []
+
+    element_count: int = 0
+    form_count: int = 0
+    username_input_count: int = 0
+    password_input_count: int = 0
+    input_count: int = 0
+    submit_button_count: int = 0
+    table_count: int = 0
+    content_block_count: int = 0
+
+    pagination_controls: bool = False
+    error_banners: bool = False
+    empty_state_detected: bool = False
+
+    # Keyword factors in the page text, per keyword group
+    error_factors: FrozenSet[str] = frozenset()
+    empty_factors: FrozenSet[str] = frozenset()
+    link_factors: FrozenSet[str] = frozenset()
+    # Independent matches behind each flag: text matches that a
+    # mutation may split, and attribute matches that it can't
+    error_support: int = 0
+    error_classes: int = 0
+    empty_support: int = 0
+    pagination_support: int = 0
+    pagination_navs: int = 0
+
+    # False when the last update fell back to a full extract
+    incremental: bool = False
+
+    @property
+    def features(self) -> PageFeatures:
+        return PageFeatures(
+            has_form=self.form_count > 0,
+            has_username_input=self.username_input_count > 0,
+            has_password_input=self.password_input_count > 0,
+            input_count=self.input_count,
+            submit_button_count=self.submit_button_count,
+            table_count=self.table_count,
+            pagination_controls=self.pagination_controls,
+            error_banners=self.error_banners,
+            empty_state_detected=self.empty_state_detected,
+            content_block_count=self.content_block_count,
+            url_patterns=list(self.url_patterns),
+        )
+
+# Public API
+def extract_dom_snapshot(
+    dom: str,
+    url: str | None = None,
+    parser: str | None = None,
+    streaming_threshold: int | None = STREAMING_THRESHOLD_CHARS,
+    keywords: KeywordEngine | None = None,
+    skeleton: SkeletonHasher | None = None,
+) -> DomSnapshot:
+    """
+    Full extraction that also keeps the counts used for deltas;
+    a `skeleton` hasher is fed during the same traversal.
+    """
+    if streaming_threshold is not None and len(dom) >= streaming_threshold:
+        visitor = _SnapshotVisitor(keywords, skeleton)
+        extractor = StreamingFeatureExtractor(url, keywords, visitor=visitor)
+        extractor.feed(dom)
+        extractor.finish()
+    else:
+        visitor = _SnapshotVisitor(keywords, skeleton)
+        parse_into(dom, visitor, backend=parser)
+
+    return _snapshot_from_visitor(visitor, url)
+
+def update_dom_snapshot(
+    snapshot: DomSnapshot,
+    mutations: List[DomMutation],
+    dom: str,
+    url: str | None = None,
+    churn_threshold: float = DEFAULT_CHURN_THRESHOLD,
+    parser: str | None = None,
+    keywords: KeywordEngine | None = None,
+    streaming_threshold: int | None = STREAMING_THRESHOLD_CHARS,
+) -> DomSnapshot:
+    """
+    Apply mutation records to a previous snapshot.
+
+    Args:
+        snapshot: Result of extract_dom_snapshot / update_dom_snapshot
+        mutations: Records since that snapshot, in order
+        dom: Current full DOM, used if a full re-extract is needed
+        url: Current URL (defaults to the snapshot's)
+        churn_threshold: CrawlConfig.mutation_churn_threshold
+        parser: Parser backend for a full re-extract
+        keywords: Keyword engine; must match the snapshot's
+        streaming_threshold: Streaming threshold for a full
+            re-extract
+
+    Returns:
+        Updated DomSnapshot
+    """
+    keywords = keywords or DEFAULT_KEYWORDS
+    url = url if url is not None else snapshot.url
+    updated = snapshot.model_copy(update={
+        "url": url,
+        "url_patterns": keywords.url_patterns(url),
+        "incremental": True,
+    })
+
+    budget = churn_threshold * max(snapshot.element_count, 1)
+    touched = 0
+
+    for mutation in mutations:
+        fragment, strings = _analyze_fragment(mutation, keywords)
+
+        touched += max(fragment.element_count, 1)
+        if touched > budget or not _apply(updated, mutation, fragment, strings):
+            return extract_dom_snapshot(
+                dom,
+                url,
+                parser=parser,
+                streaming_threshold=streaming_threshold,
+                keywords=keywords,
+            )
+
+    return updated
+
+# Helpers
+class _SnapshotVisitor(DomFeatureVisitor):
+    """
+    DomFeatureVisitor that also records the keyword factors in
+    the text and the matches behind each text-derived flag.
+    Text is read to the end, even once every flag is set.
+    """
+
+    __slots__ = (
+        "error_factors",
+        "empty_factors",
+        "link_factors",
+        "error_support",
+        "error_classes",
+        "empty_support",
+        "pagination_support",
+        "pagination_navs",
+        "_joined",
+        "_spaced",
+        "_spaced_len",
+        "_error_end",
+        "_empty_end",
+        "_links",
+    )
+
+    def __init__(
+        self,
+        keywords: KeywordEngine | None = None,
+        skeleton: SkeletonHasher | None = None,
+    ) -> None:
+        super().__init__(keywords, skeleton)
+        self.error_factors: Set[str] = set()
+        self.empty_factors: Set[str] = set()
+        self.link_factors: Set[str] = set()
+        self.error_support = 0
+        self.error_classes = 0
+        self.empty_support = 0
+        self.pagination_support = 0
+        self.pagination_navs = 0
+
+        # Ends of the unseparated and the spaced text, and the
+        # spaced text's length
+        self._joined = ""
+        self._spaced = ""
+        self._spaced_len = 0
+        # Offsets just past the last counted match
+        self._error_end = 0
+        self._empty_end = 0
+        # Text of each open <a>; None once it can no longer match
+        self._links: List[str | None] = []
+
+    @property
+    def wants_text(self) -> bool:
+        return True
+
+    def start(self, tag: str, attrs: Mapping) -> None:
+        super().start(tag, attrs)
+        keywords = self.keywords
+
+        if tag in _TEXT_BLOCK_TAGS:
+            cls = attrs.get("class") or ""
+            if not isinstance(cls, str):
+                cls = " ".join(cls)
+            if keywords.error.search(cls.lower()):
+                self.error_classes += 1
+        elif tag == "a":
+            self._links.append("")
+        elif tag == "nav":
+            if keywords.pagination_label.search((attrs.get("aria-label") or "").lower()):
+                self.pagination_navs += 1
+
+    def end(self, tag: str) -> None:
+        super().end(tag)
+        if tag == "a":
+            text = self._links.pop()
+            if text is not None and text.lower().strip() in self.keywords.pagination_link:
+                self.pagination_support += 1
+
+    def text(self, data: str) -> None:
+        lowered = data.lower()
+        keywords = self.keywords
+
+        window = self._joined + lowered
+        base = self._text_len - len(self._joined)
+        if self._block_starts:
+            pos = max(self._block_starts[0], self._error_end) - base
+            for match in keywords.error.finditer(window, max(pos, 0)):
+                self.error_support += 1
+                self._error_end = base + match.end()
+        self.error_factors.update(keywords.error.factors_in(window, self.error_factors))
+        self.link_factors.update(
+            keywords.pagination_link_text.factors_in(window, self.link_factors)
+        )
+        self._joined = _tail(
+            window, max(keywords.error.max_length, keywords.pagination_link_text.max_length),
+        )
+
+        window = self._spaced + " " + lowered if self._has_text else lowered
+        base = self._spaced_len - len(self._spaced)
+        for match in keywords.empty_state.finditer(window, max(self._empty_end - base, 0)):
+            self.empty_support += 1
+            self._empty_end = base + match.end()
+        self.empty_factors.update(keywords.empty_state.factors_in(window, self.empty_factors))
+        self._spaced = _tail(window, keywords.empty_state.max_length)
+        self._spaced_len = base + len(window)
+
+        for i, text in enumerate(self._links):
+            if text is None:
+                continue
+            text += data
+            if len(text.strip()) > keywords.pagination_link_max:
+                text = None
+            self._links[i] = text
+
+        super().text(data)
+
+
+def _snapshot_from_visitor(visitor: _SnapshotVisitor, url: str | None) -> DomSnapshot:
+    return DomSnapshot(
+        url=url,
+        url_patterns=visitor.keywords.url_patterns(url),
+        pagination_controls=visitor.pagination_controls,
+        error_banners=visitor.error_banners,
+        empty_state_detected=visitor.empty_state_detected,
+        **{name: getattr(visitor, name) for name in _COUNT_FIELDS + _TEXT_FIELDS},
+    )
+
+def _analyze_fragment(
+    mutation: DomMutation,
+    keywords: KeywordEngine,
+) -> Tuple[_SnapshotVisitor, List[str]]:
+    """
+    Run the mutated node through a fresh visitor.
+
+    Returns the visitor and the node's lowered text strings.
+    """
+    visitor = _SnapshotVisitor(keywords)
+
+    if mutation.tag == "#text":
+        visitor.text(mutation.text)
+        return visitor, [mutation.text.lower()] if mutation.text else []
+
+    if mutation.html is None:
+        visitor.start(mutation.tag, mutation.attrs)
+        visitor.end(mutation.tag)
+        return visitor, []
+
+    soup = BeautifulSoup(mutation.html, "html.parser")
+    walk_soup(soup, visitor)
+    return visitor, [string.lower() for string in soup.strings if string]
+
+def _apply(
+    snapshot: DomSnapshot,
+    mutation: DomMutation,
+    fragment: _SnapshotVisitor,
+    strings: List[str],
+) -> bool:
+    """
+    Apply one fragment's delta in place.
+
+    Returns False when the result can't be known without the
+    surrounding DOM.
+    """
+    added = mutation.kind == "added"
+    sign = 1 if added else -1
+    for name in _COUNT_FIELDS + _FIXED_SUPPORT_FIELDS:
+        value = getattr(snapshot, name) + sign * getattr(fragment, name)
+        if value < 0:
+            # Records don't match the snapshot they're applied to
+            return False
+        setattr(snapshot, name, value)
+
+    keywords = fragment.keywords
+    error, empty, link = keywords.error, keywords.empty_state, keywords.pagination_link_text
+    # Unseparated text, for error keywords and link text
+    text = "".join(strings)
+    if mutation.tag == "#text":
+        # Merged into neighbouring text nodes or not
+        gaps = [left + text + right for left in ("", " ") for right in ("", " ")]
+    elif mutation.html is not None:
+        # An element always separates the strings around it
+        gaps = [" " + " ".join(strings) + " "] if strings else [" "]
+    else:
+        # Start tag only: the text is unchanged
+        gaps = []
+
+    if added:
+        error_new = bool(text) and (
+            error.search(text) or error.crosses(text, snapshot.error_factors)
+        )
+        link_new = bool(text.strip()) and link.completes(text.strip(), snapshot.link_factors)
+        empty_new = any(
+            empty.search(gap) or empty.crosses(gap, snapshot.empty_factors) for gap in gaps
+        )
+        # The node may sit inside one match and split it
+        error_lost = link_lost = int(bool(text))
+        empty_lost = int(bool(gaps))
+        if text:
+            snapshot.error_factors = error.grow(snapshot.error_factors, text)
+            snapshot.link_factors = link.grow(snapshot.link_factors, text)
+    else:
+        # The text on either side of the node now touches
+        gaps = ["", " "] if gaps else []
+        error_new = bool(text) and error.crosses("", snapshot.error_factors)
+        link_new = bool(text) and link.completes("", snapshot.link_factors)
+        empty_new = any(empty.crosses(gap, snapshot.empty_factors) for gap in gaps)
+        # Matches inside the node, plus one across each of its ends
+        error_lost = error.occurrences(text) + 2 * bool(text)
+        link_lost = fragment.pagination_support + bool(text)
+        empty_lost = empty.occurrences(" ".join(strings)) + (2 if strings else len(gaps) // 2)
+        if text:
+            snapshot.error_factors = error.grow(snapshot.error_factors, "")
+            snapshot.link_factors = link.grow(snapshot.link_factors, "")
+
+    for gap in gaps:
+        snapshot.empty_factors = empty.grow(snapshot.empty_factors, gap)
+
+    return (
+        _settle(
+            snapshot, "error_banners", "error_support", "error_classes",
+            fragment.error_support if added else 0, error_lost, error_new,
+        )
+        and _settle(
+            snapshot, "pagination_controls", "pagination_support", "pagination_navs",
+            fragment.pagination_support if added else 0, link_lost, link_new,
+        )
+        and _settle(
+            snapshot, "empty_state_detected", "empty_support", None,
+            fragment.empty_support if added else 0, empty_lost, empty_new,
+        )
+    )
+
+def _settle(
+    snapshot: DomSnapshot,
+    flag: str,
+    support: str,
+    fixed: str | None,
+    gained: int,
+    lost: int,
+    new: bool,
+) -> bool:
+    """
+    Update one flag from its supporting matches: `lost` of them
+    may be gone and `gained` were added. `new` is whether a match
+    may have formed that no fragment shows.
+
+    Returns False when the flag can't be known.
+    """
+    count = max(getattr(snapshot, support) - lost, 0) + gained
+    setattr(snapshot, support, count)
+    if count or (fixed is not None and getattr(snapshot, fixed)):
+        setattr(snapshot, flag, True)
+        return True
+    return not (getattr(snapshot, flag) or new)
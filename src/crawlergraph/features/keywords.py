@@ -0,0 +1,315 @@
+"""
+Keyword Engine
+
+Compiles the keyword lists used by DOM feature extraction into
+one regex alternation per keyword group, so each piece of text
+is scanned once per group instead of once per keyword.
+
+Keyword sets are configurable per deployment (CrawlConfig.keywords)
+to add localized phrases. Matching is case-insensitive: keywords
+are lowered at build time and callers pass lowered text.
+
+NO parsing
+NO LangGraph logic
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import AbstractSet, Dict, FrozenSet, Iterable, Iterator, List, Match, Pattern, Set, Tuple
+from pydantic import BaseModel, Field
+
+
+class KeywordSets(BaseModel):
+    """
+    Deployment-configurable keyword lists.
+    """
+    # Inside div/span/p text or class names
+    error: List[str] = Field(default_factory=lambda: [
+        "error", "failed", "invalid", "unauthorized", "forbidden",
+    ])
+    # Anywhere in the page text
+    empty_state: List[str] = Field(default_factory=lambda: [
+        "no results", "nothing found", "empty", "no data", "no records",
+    ])
+    # In a <nav> aria-label
+    pagination_label: List[str] = Field(default_factory=lambda: [
+        "next", "previous", "page", "pagination",
+    ])
+    # Exact (stripped) text of a link
+    pagination_link: List[str] = Field(default_factory=lambda: [
+        "next", "prev", "previous",
+    ])
+    # In the name/id/placeholder/aria-label of text/email inputs
+    username: List[str] = Field(default_factory=lambda: [
+        "user", "email", "login", "username",
+    ])
+    # URL hint name -> substrings; hints are reported in this order
+    url_hints: Dict[str, List[str]] = Field(default_factory=lambda: {
+        "login": ["login"],
+        "auth": ["auth"],
+        "signin": ["signin"],
+        "signup": ["signup"],
+        "pagination": ["page=", "offset="],
+        "error": ["error", "403", "404", "500"],
+    })
+
+
+class KeywordMatcher:
+    """
+    One compiled alternation over a keyword group.
+
+    Besides plain search, the matcher answers questions about
+    text it only sees part of, for incremental updates: which
+    keyword factors (nonempty substrings of a keyword) a text
+    contains, and whether putting text next to text with known
+    factors could complete a keyword.
+    """
+
+    __slots__ = ("words", "pattern", "max_length", "_starts", "_factors")
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        words = sorted({k.lower() for k in keywords if k}, key=len, reverse=True)
+        self.words = tuple(words)
+        self.pattern: Pattern | None = (
+            re.compile("|".join(re.escape(w) for w in words)) if words else None
+        )
+        self.max_length = len(words[0]) if words else 0
+        # Zero-width scans: every position a keyword starts at, and
+        # the longest keyword factor starting at each position
+        self._starts: Pattern | None = (
+            re.compile("(?=" + self.pattern.pattern + ")") if words else None
+        )
+        self._factors: Pattern | None = (
+            re.compile("(?=(" + _factor_alternation(words) + "))") if words else None
+        )
+
+    def search(self, text: str, pos: int = 0) -> bool:
+        """
+        True if any keyword occurs in `text` starting at or after `pos`.
+        """
+        return self.pattern is not None and self.pattern.search(text, pos) is not None
+
+    def finditer(self, text: str, pos: int = 0) -> Iterator[Match]:
+        """
+        Non-overlapping keyword matches in `text` from `pos` on.
+        """
+        return self.pattern.finditer(text, pos) if self.pattern is not None else iter(())
+
+    def occurrences(self, text: str) -> int:
+        """
+        Positions in `text` at which a keyword starts; an upper
+        bound on any set of non-overlapping matches.
+        """
+        return sum(1 for _ in self._starts.finditer(text)) if self._starts is not None else 0
+
+    def factors_in(self, text: str, known: AbstractSet[str] = frozenset()) -> Set[str]:
+        """
+        Every keyword factor that occurs in `text`, less those
+        already in `known` (a set of earlier results).
+        """
+        if self._factors is None:
+            return set()
+        return {
+            longest[:end]
+            for longest in set(self._factors.findall(text)).difference(known)
+            for end in range(1, len(longest) + 1)
+        }
+
+    def crosses(self, text: str, factors: AbstractSet[str]) -> bool:
+        """
+        True if a keyword could occur partly in `text` and partly in
+        neighbouring text whose factors are `factors`. Empty `text`
+        asks whether joining two such texts could form a keyword.
+        """
+        for word, start, low, high, end in self._bridges(text, factors):
+            if start == 0 and end == len(word) and (text or (start < low and end > high)):
+                return True
+        return False
+
+    def completes(self, text: str, factors: AbstractSet[str]) -> bool:
+        """
+        True if `text`, with neighbouring text whose factors are
+        `factors` on either side, could make up a whole keyword.
+        """
+        for word in self.words:
+            start = word.find(text)
+            while start >= 0:
+                end = start + len(text)
+                if (not start or word[:start] in factors) and (
+                    end == len(word) or word[end:] in factors
+                ):
+                    return True
+                start = word.find(text, start + 1)
+        return False
+
+    def grow(self, factors: AbstractSet[str], text: str) -> FrozenSet[str]:
+        """
+        `factors` after `text` is put between text they were taken
+        from (empty `text` joins that text).
+        """
+        found = self.factors_in(text)
+        for word, start, _, _, end in self._bridges(text, factors):
+            found.update(
+                word[i:j] for i in range(start, end) for j in range(i + 1, end + 1)
+            )
+        return frozenset(factors) | found
+
+    # Internals
+    def _bridges(
+        self, text: str, factors: AbstractSet[str],
+    ) -> Iterator[Tuple[str, int, int, int, int]]:
+        """
+        Alignments of `text` with a keyword that reach past one of
+        its ends into neighbouring factors.
+
+        Yields (word, start, low, high, end): `text` covers
+        word[low:high] and the factors extend that to word[start:end].
+        """
+        n = len(text)
+        for word in self.words:
+            m = len(word)
+            # Offsets of text[0] in word that leave an end of text inside it
+            offsets = set(range(0, m + 1 if not n else m)) | set(range(1 - n, m - n + 1))
+            for offset in offsets:
+                low, high = max(offset, 0), min(offset + n, m)
+                if word[low:high] != text[low - offset:high - offset]:
+                    continue
+                start = low
+                if offset >= 0:
+                    while start and word[start - 1:low] in factors:
+                        start -= 1
+                end = high
+                if offset + n <= m:
+                    while end < m and word[high:end + 1] in factors:
+                        end += 1
+                if start < low or end > high:
+                    yield word, start, low, high, end
+
+
+class CategoryMatcher:
+    """
+    Reports every category whose keywords occur in a text,
+    in a single scan.
+
+    Scans with a zero-width lookahead so overlapping matches are
+    seen; at each position the longest keyword wins, and the
+    categories of any keyword that is a prefix of it are implied.
+    """
+
+    __slots__ = ("order", "_pattern", "_implied")
+
+    def __init__(self, categories: Dict[str, Iterable[str]]) -> None:
+        self.order = list(categories)
+
+        owners: Dict[str, set] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                if keyword:
+                    owners.setdefault(keyword.lower(), set()).add(category)
+
+        self._implied: Dict[str, FrozenSet[str]] = {
+            word: frozenset(
+                category
+                for other, cats in owners.items()
+                if word.startswith(other)
+                for category in cats
+            )
+            for word in owners
+        }
+
+        words = sorted(owners, key=len, reverse=True)
+        self._pattern = (
+            re.compile("(?=(" + "|".join(re.escape(w) for w in words) + "))")
+            if words else None
+        )
+
+    def categories(self, text: str) -> List[str]:
+        """
+        Matched categories, in declaration order.
+        """
+        if self._pattern is None:
+            return []
+
+        found = set()
+        for match in self._pattern.finditer(text):
+            found |= self._implied[match.group(1)]
+            if len(found) == len(self.order):
+                break
+
+        return [c for c in self.order if c in found]
+
+
+class KeywordEngine:
+    """
+    All keyword groups compiled from one KeywordSets.
+    """
+
+    def __init__(self, sets: KeywordSets) -> None:
+        self.sets = sets
+        # Identifies the keyword configuration in cache keys
+        self.fingerprint = hashlib.sha256(
+            sets.model_dump_json().encode("utf-8")
+        ).hexdigest()[:16]
+
+        self.error = KeywordMatcher(sets.error)
+        self.empty_state = KeywordMatcher(sets.empty_state)
+        self.pagination_label = KeywordMatcher(sets.pagination_label)
+        self.username = KeywordMatcher(sets.username)
+        self.pagination_link: FrozenSet[str] = frozenset(
+            t.lower() for t in sets.pagination_link
+        )
+        self.pagination_link_max = max((len(t) for t in self.pagination_link), default=0)
+        # The same words, for reasoning about partial link text
+        self.pagination_link_text = KeywordMatcher(sets.pagination_link)
+        self.url_hints = CategoryMatcher(sets.url_hints)
+
+    def __reduce__(self):
+        # Rebuild from the config when sent to worker processes
+        return (build_keyword_engine, (self.sets,))
+
+    def url_patterns(self, url: str | None) -> List[str]:
+        """
+        Extract semantic hints from URL.
+        Used as weak signals only.
+        """
+        if not url:
+            return []
+        return self.url_hints.categories(url.lower())
+
+
+# Public API
+def build_keyword_engine(sets: KeywordSets | None = None) -> KeywordEngine:
+    """
+    Compile keyword sets, reusing engines for identical configs.
+    """
+    if sets is None:
+        return DEFAULT_KEYWORDS
+    return _build_cached(sets.model_dump_json())
+
+# Helpers
+@lru_cache(maxsize=32)
+def _build_cached(config_json: str) -> KeywordEngine:
+    return KeywordEngine(KeywordSets.model_validate_json(config_json))
+
+def _factor_alternation(words: Iterable[str]) -> str:
+    """
+    Regex matching the longest keyword factor at a position: a
+    trie over every suffix of every keyword, each node optional.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        for i in range(len(word)):
+            node = trie
+            for char in word[i:]:
+                node = node.setdefault(char, {})
+    return _alternation(trie)
+
+def _alternation(node: Dict[str, dict]) -> str:
+    branches = [
+        re.escape(char) + ("(?:" + _alternation(child) + ")?" if child else "")
+        for char, child in sorted(node.items())
+    ]
+    return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+DEFAULT_KEYWORDS = KeywordEngine(KeywordSets())
@@ -0,0 +1,218 @@
+"""
+HTML Parser Backends
+
+Drives a DomFeatureVisitor from a raw HTML string using one
+of several parsers:
+
+    html.parser  BeautifulSoup + stdlib parser (always available)
+    lxml         libxml2 via lxml.etree
+    selectolax   lexbor via selectolax
+
+Every backend emits the same start/text/end event stream, so
+features are computed by the same visitor regardless of parser.
+Only main-content text is emitted: comments and the text of
+script/style/template/rt/rp elements are skipped, matching
+BeautifulSoup's get_text().
+
+The backends agree on well-formed markup, but they are NOT
+feature-identical on malformed markup: lxml and selectolax
+follow the HTML5 tree builder (implicit closes, table
+foster-parenting, title/textarea content as raw text) where
+html.parser keeps the tags as written. A password input inside
+a <textarea> is a form field to html.parser and text to the
+others. Keep one backend per run when comparing features or
+fingerprints across pages.
+
+Unavailable optional backends fall back to html.parser.
+
+NO feature logic
+NO LangGraph logic
+"""
+
+from typing import Callable, Dict, List, Literal
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+from crawlergraph.features.dom_visitor import DomFeatureVisitor
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - optional dependency
+    etree = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional dependency
+    LexborHTMLParser = None
+
+ParserBackend = Literal["html.parser", "lxml", "selectolax"]
+
+DEFAULT_PARSER_BACKEND: ParserBackend = "html.parser"
+
+# Strings BeautifulSoup considers "main content" for get_text()
+_MAIN_STRING_TYPES = frozenset({NavigableString, CData})
+
+# Elements whose text BeautifulSoup stores as non-content strings
+_STRING_CONTAINER_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+# Public API
+def available_parser_backends() -> List[str]:
+    """
+    Backends whose parser library is importable.
+    """
+    return [name for name, ok in _AVAILABILITY.items() if ok()]
+
+def resolve_parser_backend(name: str | None) -> str:
+    """
+    Map a configured backend name to one that can run here.
+
+    Raises:
+        ValueError: if the name is not a known backend
+    """
+    if name is None:
+        return DEFAULT_PARSER_BACKEND
+    if name not in _WALKERS:
+        raise ValueError(
+            f"Unknown parser backend {name!r}; "
+            f"expected one of {sorted(_WALKERS)}"
+        )
+    if not _AVAILABILITY[name]():
+        return DEFAULT_PARSER_BACKEND
+    return name
+
+def parse_into(
+    dom: str,
+    visitor: DomFeatureVisitor,
+    backend: str | None = None,
+) -> None:
+    """
+    Parse `dom` with the requested backend and feed the visitor.
+    """
+    _WALKERS[resolve_parser_backend(backend)](dom, visitor)
+
+# Walkers
+def walk_soup(soup: BeautifulSoup, visitor: DomFeatureVisitor) -> None:
+    """
+    Feed a parsed soup to the visitor in document order.
+
+    Uses an explicit stack so deeply nested pages cannot hit
+    the recursion limit.
+    """
+    start, end, text = visitor.start, visitor.end, visitor.text
+
+    stack = [(None, iter(soup.contents))]
+    while stack:
+        name, children = stack[-1]
+        for node in children:
+            if isinstance(node, Tag):
+                start(node.name, node.attrs)
+                stack.append((node.name, iter(node.contents)))
+                break
+            if type(node) in _MAIN_STRING_TYPES and visitor.wants_text:
+                text(node)
+        else:
+            stack.pop()
+            if name is not None:
+                end(name)
+
+def _walk_html_parser(dom: str, visitor: DomFeatureVisitor) -> None:
+    walk_soup(BeautifulSoup(dom, "html.parser"), visitor)
+
+def _walk_lxml(dom: str, visitor: DomFeatureVisitor) -> None:
+    if not dom.strip():
+        # libxml2 rejects empty documents
+        return
+
+    parser = etree.HTMLParser(encoding="utf-8", no_network=True)
+    root = etree.fromstring(dom.encode("utf-8"), parser)
+    if root is None:
+        return
+
+    start, end, text = visitor.start, visitor.end, visitor.text
+    skip = 0
+
+    for event, el in etree.iterwalk(root, events=("start", "end")):
+        tag = el.tag
+        is_element = isinstance(tag, str)
+
+        if event == "start":
+            if is_element:
+                start(tag, el.attrib)
+                if tag in _STRING_CONTAINER_TAGS:
+                    skip += 1
+                if el.text and not skip and visitor.wants_text:
+                    text(el.text)
+            continue
+
+        if is_element:
+            if tag in _STRING_CONTAINER_TAGS:
+                skip -= 1
+            end(tag)
+        # Tail text belongs to the parent and follows this node
+        if el.tail and not skip and visitor.wants_text:
+            text(el.tail)
+
+def _walk_selectolax(dom: str, visitor: DomFeatureVisitor) -> None:
+    _walk_lexbor_nodes(LexborHTMLParser(dom).root, visitor, skip=0)
+
+def _walk_lexbor_nodes(node, visitor: DomFeatureVisitor, skip: int) -> None:
+    start, end, text = visitor.start, visitor.end, visitor.text
+    stack = []
+
+    while True:
+        if node is None:
+            if not stack:
+                return
+            node = stack.pop()
+            tag = node.tag
+            if tag in _STRING_CONTAINER_TAGS:
+                skip -= 1
+            end(tag)
+            node = node.next
+            continue
+
+        tag = node.tag
+        if tag == "-text":
+            if not skip and visitor.wants_text:
+                text(node.text_content)
+        elif node.is_element_node:
+            start(tag, node.attributes)
+            if tag in _STRING_CONTAINER_TAGS:
+                skip += 1
+
+            if tag == "template":
+                # lexbor keeps template contents in a separate
+                # fragment that is not reachable through .child
+                _walk_template_content(node, visitor, skip)
+            elif node.child is not None:
+                stack.append(node)
+                node = node.child
+                continue
+
+            if tag in _STRING_CONTAINER_TAGS:
+                skip -= 1
+            end(tag)
+
+        node = node.next
+
+def _walk_template_content(node, visitor: DomFeatureVisitor, skip: int) -> None:
+    html = node.html
+    # Attribute values are serialized with '>' escaped, so the
+    # first '>' always closes the opening tag.
+    inner = html[html.index(">") + 1:-len("</template>")]
+    if not inner:
+        return
+
+    body = LexborHTMLParser(inner).body
+    if body is not None:
+        _walk_lexbor_nodes(body.child, visitor, skip)
+
+_WALKERS: Dict[str, Callable[[str, DomFeatureVisitor], None]] = {
+    "html.parser": _walk_html_parser,
+    "lxml": _walk_lxml,
+    "selectolax": _walk_selectolax,
+}
+
+_AVAILABILITY: Dict[str, Callable[[], bool]] = {
+    "html.parser": lambda: True,
+    "lxml": lambda: etree is not None,
+    "selectolax": lambda: LexborHTMLParser is not None,
+}
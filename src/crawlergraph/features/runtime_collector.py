@@ -0,0 +1,202 @@
+"""
+Streaming Runtime Signal Collection
+
+Incremental alternative to extract_runtime_features for pages
+that emit telemetry continuously (e.g. an error-logging
+reconnect loop). Events are consumed as they arrive; only the
+most recent messages of each kind are kept in fixed-size ring
+buffers, alongside exact counters, so memory per page stays
+bounded no matter how noisy the page is.
+
+snapshot() produces a RuntimeSignals at any time.
+
+With a MessageInterner, messages are fingerprinted instead of
+buffered: the page keeps fingerprint -> count maps, capped at
+`buffer_size` distinct fingerprints per kind.
+
+Event shapes accepted by ingest():
+    {"type": "console", "level": "error" | "warning", "text": ...}
+    {"type": "network_error", "text": ...}
+    {"type": "request_failed", "count": 1}
+    {"type": "long_task", "duration_ms": ...}
+    {"type": "navigation", "status_code": ..., "redirected": ...,
+     "page_load_time_ms": ...}
+    {"type": "layout", "overlaps": ...}
+
+NO browser orchestration
+NO LangGraph logic
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict
+from crawlergraph.state import RuntimeSignals
+from crawlergraph.features.fingerprints import MessageInterner
+
+# Messages kept per kind
+DEFAULT_BUFFER_SIZE = 50
+
+# Longer messages are cut to this many characters
+DEFAULT_MAX_MESSAGE_CHARS = 1024
+
+
+class RuntimeSignalCollector:
+    """
+    Bounded-memory accumulator of one page's runtime telemetry.
+
+    Args:
+        buffer_size: Most recent messages kept per kind
+        max_message_chars: Per-message length cap
+        interner: Per-run message table; switches the page to
+            fingerprint counts
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        max_message_chars: int = DEFAULT_MAX_MESSAGE_CHARS,
+        interner: MessageInterner | None = None,
+    ) -> None:
+        if buffer_size < 0:
+            raise ValueError("buffer_size must be non-negative")
+
+        self.buffer_size = buffer_size
+        self.max_message_chars = max_message_chars
+        self.interner = interner
+
+        self.status_code = 200
+        self.redirect_detected = False
+        self.layout_overlaps = False
+        self.page_load_time_ms: int | None = None
+        self.long_tasks_ms: int | None = None
+
+        self.console_errors: Deque[str] = deque(maxlen=buffer_size)
+        self.console_warnings: Deque[str] = deque(maxlen=buffer_size)
+        self.network_errors: Deque[str] = deque(maxlen=buffer_size)
+
+        self.console_error_fingerprints: Dict[str, int] = {}
+        self.console_warning_fingerprints: Dict[str, int] = {}
+        self.network_error_fingerprints: Dict[str, int] = {}
+
+        self.console_error_count = 0
+        self.console_warning_count = 0
+        self.network_error_count = 0
+        self.failed_requests = 0
+
+    # Events
+    def on_console(self, level: str, text: Any) -> None:
+        """
+        Console message; levels other than error/warning are ignored.
+        """
+        if level == "error":
+            self.console_error_count += 1
+            self._keep(text, self.console_errors, self.console_error_fingerprints)
+        elif level in ("warning", "warn"):
+            self.console_warning_count += 1
+            self._keep(text, self.console_warnings, self.console_warning_fingerprints)
+
+    def on_network_error(self, text: Any) -> None:
+        self.network_error_count += 1
+        self._keep(text, self.network_errors, self.network_error_fingerprints)
+
+    def on_request_failed(self, count: int = 1) -> None:
+        self.failed_requests += int(count)
+
+    def on_long_task(self, duration_ms: float) -> None:
+        """
+        Main-thread long task; durations are summed.
+        """
+        self.long_tasks_ms = (self.long_tasks_ms or 0) + int(duration_ms)
+
+    def on_navigation(
+        self,
+        status_code: int | None = None,
+        redirected: bool = False,
+        page_load_time_ms: float | None = None,
+    ) -> None:
+        """
+        Navigation / load timing; later values replace earlier ones.
+        """
+        if status_code is not None:
+            self.status_code = int(status_code)
+            if 300 <= self.status_code < 400:
+                self.redirect_detected = True
+        if redirected:
+            self.redirect_detected = True
+        if page_load_time_ms is not None:
+            self.page_load_time_ms = int(page_load_time_ms)
+
+    def on_layout(self, overlaps: bool) -> None:
+        if overlaps:
+            self.layout_overlaps = True
+
+    def ingest(self, event: Dict[str, Any]) -> None:
+        """
+        Dispatch a raw telemetry event (see module docstring).
+
+        Raises:
+            ValueError: for an unknown event type
+        """
+        kind = event.get("type")
+        if kind == "console":
+            self.on_console(event.get("level", ""), event.get("text", ""))
+        elif kind == "network_error":
+            self.on_network_error(event.get("text", ""))
+        elif kind == "request_failed":
+            self.on_request_failed(event.get("count", 1))
+        elif kind == "long_task":
+            self.on_long_task(event.get("duration_ms", 0))
+        elif kind == "navigation":
+            self.on_navigation(
+                status_code=event.get("status_code"),
+                redirected=bool(event.get("redirected", False)),
+                page_load_time_ms=event.get("page_load_time_ms"),
+            )
+        elif kind == "layout":
+            self.on_layout(bool(event.get("overlaps", False)))
+        else:
+            raise ValueError(f"Unknown telemetry event type {kind!r}")
+
+    # Output
+    def snapshot(self) -> RuntimeSignals:
+        """
+        RuntimeSignals for everything seen so far.
+
+        Message lists hold the most recent buffered messages,
+        oldest first; counts cover every event.
+        """
+        return RuntimeSignals(
+            status_code=self.status_code,
+            redirect_detected=self.redirect_detected,
+            console_errors=list(self.console_errors),
+            console_warnings=list(self.console_warnings),
+            console_error_fingerprints=dict(self.console_error_fingerprints),
+            console_warning_fingerprints=dict(self.console_warning_fingerprints),
+            console_error_count=self.console_error_count,
+            console_warning_count=self.console_warning_count,
+            network_errors=list(self.network_errors),
+            network_error_fingerprints=dict(self.network_error_fingerprints),
+            network_error_count=self.network_error_count,
+            failed_requests=self.failed_requests,
+            layout_overlaps=self.layout_overlaps,
+            long_tasks_ms=self.long_tasks_ms,
+            page_load_time_ms=self.page_load_time_ms,
+        )
+
+    # Helpers
+    def _keep(self, text: Any, buffer: Deque[str], fingerprints: Dict[str, int]) -> None:
+        message = self._message(text)
+        if self.interner is None:
+            buffer.append(message)
+            return
+
+        fingerprint = self.interner.intern(message)
+        if fingerprint in fingerprints:
+            fingerprints[fingerprint] += 1
+        elif len(fingerprints) < self.buffer_size:
+            fingerprints[fingerprint] = 1
+
+    def _message(self, text: Any) -> str:
+        message = str(text)
+        if len(message) > self.max_message_chars:
+            return message[:self.max_message_chars]
+        return message
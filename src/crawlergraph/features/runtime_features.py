@@ -14,27 +14,47 @@ NO LangGraph logic
 
 from typing import Dict, Any, List
 from crawlergraph.state import RuntimeSignals
+from crawlergraph.features.fingerprints import MessageInterner
 
 # Public API
-def extract_runtime_features(raw_signals: Dict[str, Any]) -> RuntimeSignals:
+def extract_runtime_features(
+    raw_signals: Dict[str, Any],
+    interner: MessageInterner | None = None,
+) -> RuntimeSignals:
     """
     Entry point for runtime feature extraction.
 
     Args:
         raw_signals: Arbitrary telemetry from browser layer
+        interner: Per-run message table; when given, console and
+            network messages are stored as fingerprint counts
+            instead of raw strings
 
     Returns:
         RuntimeSignals
     """
 
+    console_errors = _extract_console_errors(raw_signals)
+    console_warnings = _extract_console_warnings(raw_signals)
+    network_errors = _extract_network_errors(raw_signals)
+
+    messages: Dict[str, Any] = {
+        "console_errors": console_errors,
+        "console_warnings": console_warnings,
+        "network_errors": network_errors,
+    }
+    if interner is not None:
+        messages = {
+            "console_error_fingerprints": _intern_all(interner, console_errors),
+            "console_warning_fingerprints": _intern_all(interner, console_warnings),
+            "network_error_fingerprints": _intern_all(interner, network_errors),
+        }
+
     return RuntimeSignals(
         status_code=_extract_status_code(raw_signals),
         redirect_detected=_detect_redirect(raw_signals),
 
-        console_errors=_extract_console_errors(raw_signals),
-        console_warnings=_extract_console_warnings(raw_signals),
-
-        network_errors=_extract_network_errors(raw_signals),
+        **messages,
         failed_requests=_count_failed_requests(raw_signals),
 
         layout_overlaps=_detect_layout_overlaps(raw_signals),
@@ -99,3 +119,11 @@ def _extract_page_load_time(raw: Dict[str, Any]) -> int | None:
     if timing is None:
         return None
     return int(timing)
+
+# Helpers
+def _intern_all(interner: MessageInterner, messages: List[str]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for message in messages:
+        fingerprint = interner.intern(message)
+        counts[fingerprint] = counts.get(fingerprint, 0) + 1
+    return counts
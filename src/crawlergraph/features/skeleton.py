@@ -0,0 +1,81 @@
+"""
+DOM Skeleton Hash
+
+A second page fingerprint next to the SHA-256 page hash: it
+covers only the markup skeleton, i.e. the start/end tag sequence
+with each start tag's sorted attribute names. Text and attribute
+values are left out, so a page that only changes its timestamp,
+CSRF token or article text keeps its skeleton hash.
+
+SkeletonHasher is fed the same start/end events as
+DomFeatureVisitor (pass one to extract_dom_features), so the
+hash comes out of the traversal feature extraction already does
+instead of another pass over the DOM string. Tokens are hashed
+in batches with xxh3-64 (optional dependency), or blake2b-64
+when xxhash is not installed. The two hashes differ, so compare
+skeleton hashes only within one installation. The parser
+backend matters too: lxml and selectolax insert implied
+elements that html.parser does not. For a DOM on its own, see
+memory.loop_guards.compute_skeleton_hash.
+
+NO LangGraph logic
+"""
+
+import hashlib
+from typing import Iterable, List
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional dependency
+    xxhash = None
+
+# Tokens buffered per hash update
+_BATCH = 512
+
+
+class SkeletonHasher:
+    """
+    Incremental skeleton hash of one document.
+
+    Usage:
+        hasher = SkeletonHasher()
+        features = extract_dom_features(dom, skeleton=hasher)
+        skeleton_hash = hasher.hexdigest()
+    """
+
+    __slots__ = ("_hash", "_tokens")
+
+    def __init__(self) -> None:
+        self._hash = xxhash.xxh3_64() if xxhash is not None else hashlib.blake2b(digest_size=8)
+        self._tokens: List[str] = []
+
+    def start(self, tag: str, attribute_names: Iterable[str]) -> None:
+        names = ",".join(sorted(attribute_names))
+        self._tokens.append(f"<{tag} {names}>" if names else f"<{tag}>")
+        if len(self._tokens) >= _BATCH:
+            self._flush()
+
+    def end(self, tag: str) -> None:
+        self._tokens.append(f"</{tag}>")
+        if len(self._tokens) >= _BATCH:
+            self._flush()
+
+    def hexdigest(self) -> str:
+        """
+        16-hex-digit hash of the events so far.
+        """
+        self._flush()
+        return self._hash.hexdigest()
+
+    # Internals
+    def _flush(self) -> None:
+        if self._tokens:
+            self._hash.update("".join(self._tokens).encode("utf-8"))
+            self._tokens = []
+
+# Public API
+def skeleton_algorithm() -> str:
+    """
+    Name of the hash SkeletonHasher uses in this installation.
+    """
+    return "xxh3_64" if xxhash is not None else "blake2b_64"
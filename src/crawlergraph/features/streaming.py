@@ -0,0 +1,193 @@
+"""
+Streaming DOM Feature Extraction
+
+Bounded-memory alternative to building a full soup tree for
+very large pages. HTML is fed in chunks to the stdlib
+incremental tokenizer and turned directly into visitor events;
+only the stack of currently open tag names is kept, never the
+tree itself.
+
+Tag nesting follows BeautifulSoup's html.parser tree builder
+(void elements close immediately, an end tag pops back to the
+most recent open tag of that name, stray end tags are ignored),
+so features match extract_dom_features on the same input.
+
+Element counts need the whole document, so tokenizing always
+runs to the end. Once every text-derived boolean is settled,
+text is no longer buffered or scanned.
+
+NO tree construction
+NO LangGraph logic
+"""
+
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List
+from crawlergraph.state import PageFeatures
+from crawlergraph.features.dom_visitor import DomFeatureVisitor
+from crawlergraph.features.skeleton import SkeletonHasher
+from crawlergraph.features.keywords import KeywordEngine
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Same as BeautifulSoup's HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS
+_VOID_ELEMENTS = frozenset({
+    "area", "base", "basefont", "bgsound", "br", "col", "command",
+    "embed", "frame", "hr", "image", "img", "input", "isindex",
+    "keygen", "link", "menuitem", "meta", "nextid", "param",
+    "source", "spacer", "track", "wbr",
+})
+
+# Elements whose text BeautifulSoup stores as non-content strings
+_STRING_CONTAINER_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+
+class StreamingFeatureExtractor(HTMLParser):
+    """
+    Incremental PageFeatures extractor.
+
+    Events go to a fresh DomFeatureVisitor unless `visitor` is
+    given.
+
+    Usage:
+        extractor = StreamingFeatureExtractor(url)
+        for chunk in chunks:
+            extractor.feed(chunk)
+        features = extractor.finish()
+    """
+
+    def __init__(
+        self,
+        url: str | None = None,
+        keywords: KeywordEngine | None = None,
+        skeleton: SkeletonHasher | None = None,
+        visitor: DomFeatureVisitor | None = None,
+    ) -> None:
+        super().__init__(convert_charrefs=True)
+        self.url = url
+        # A caller-supplied visitor brings its own keywords and skeleton
+        self.visitor = visitor or DomFeatureVisitor(keywords, skeleton)
+
+        self._open: List[str] = []
+        self._open_counts: Dict[str, int] = {}
+        self._container_depth = 0
+        self._pending_text: List[str] = []
+        # Void tag -> closed occurrences whose </tag> may still follow
+        self._closed_void: Dict[str, int] = {}
+
+    def finish(self) -> PageFeatures:
+        """
+        Flush the tokenizer, close any open elements and
+        return the features.
+        """
+        self.close()
+        self._flush_text()
+        while self._open:
+            self._pop()
+        return self.visitor.to_features(self.url)
+
+    # Tokenizer callbacks
+    def handle_starttag(self, tag, attrs) -> None:
+        self._start(tag, attrs)
+        if tag in _VOID_ELEMENTS:
+            self._pop_to(tag)
+            self._closed_void[tag] = self._closed_void.get(tag, 0) + 1
+
+    def handle_startendtag(self, tag, attrs) -> None:
+        self._start(tag, attrs)
+        self._pop_to(tag)
+
+    def handle_endtag(self, tag) -> None:
+        if self._closed_void.get(tag):
+            # </input> after <input>: already closed
+            self._closed_void[tag] -= 1
+            return
+        self._pop_to(tag)
+
+    def handle_data(self, data) -> None:
+        if self.visitor.wants_text:
+            self._pending_text.append(data)
+
+    def unknown_decl(self, data) -> None:
+        self._flush_text()
+        if data.upper().startswith("CDATA[") and self.visitor.wants_text:
+            # CData is main content even inside string containers
+            self.visitor.text(data[len("CDATA["):])
+
+    def handle_comment(self, data) -> None:
+        self._flush_text()
+
+    def handle_decl(self, decl) -> None:
+        self._flush_text()
+
+    def handle_pi(self, data) -> None:
+        self._flush_text()
+
+    # Tree bookkeeping
+    def _start(self, tag: str, attrs) -> None:
+        self._flush_text()
+
+        attr_dict = {}
+        for key, value in attrs:
+            attr_dict[key] = "" if value is None else value
+
+        self._open.append(tag)
+        self._open_counts[tag] = self._open_counts.get(tag, 0) + 1
+        if tag in _STRING_CONTAINER_TAGS:
+            self._container_depth += 1
+
+        self.visitor.start(tag, attr_dict)
+
+    def _pop_to(self, tag: str) -> None:
+        self._flush_text()
+        if not self._open_counts.get(tag):
+            return
+        while self._pop() != tag:
+            pass
+
+    def _pop(self) -> str:
+        tag = self._open.pop()
+        self._open_counts[tag] -= 1
+        if tag in _STRING_CONTAINER_TAGS:
+            self._container_depth -= 1
+        self.visitor.end(tag)
+        return tag
+
+    def _flush_text(self) -> None:
+        if not self._pending_text:
+            return
+        data = "".join(self._pending_text)
+        self._pending_text = []
+        if not self._container_depth and self.visitor.wants_text:
+            self.visitor.text(data)
+
+# Public API
+def extract_dom_features_streaming(
+    dom: str | Iterable[str],
+    url: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    keywords: KeywordEngine | None = None,
+    skeleton: SkeletonHasher | None = None,
+) -> PageFeatures:
+    """
+    Extract PageFeatures without materializing a DOM tree.
+
+    Args:
+        dom: Full HTML string, or an iterable of HTML chunks
+        url: Optional current URL (used for pattern hints)
+        chunk_size: Slice size used when `dom` is a string
+        keywords: Keyword engine; defaults to the built-in lists
+        skeleton: Optional SkeletonHasher fed while tokenizing
+
+    Returns:
+        PageFeatures
+    """
+    extractor = StreamingFeatureExtractor(url, keywords, skeleton)
+
+    if isinstance(dom, str):
+        for i in range(0, len(dom), chunk_size):
+            extractor.feed(dom[i:i + chunk_size])
+    else:
+        for chunk in dom:
+            extractor.feed(chunk)
+
+    return extractor.finish()
@@ -1,28 +1,41 @@
 """
 LangGraph Assembly (v1)
+
+The graph runs on LoopState (see loop_state); convert pydantic
+inputs and outputs at the boundary. Nodes return partial
+updates, merged by the state's reducers.
 """
 
 from langgraph.graph import StateGraph, END
 
-from crawlergraph.state import CrawlState
-from crawlergraph.nodes.classify_page import classify_page_node
+from crawlergraph.loop_state import LoopState
+from crawlergraph.nodes.classify_page import classify_page
 from crawlergraph.nodes.analyze_defects import analyze_defects
 from crawlergraph.nodes.decide_action import decide_action_node
-from crawlergraph.memory.update_memory import update_memory
+from crawlergraph.nodes.update_memory import update_memory_node
 from crawlergraph.nodes.loop_guard import loop_guard_node
 from crawlergraph.nodes.evaluate_stop import evaluate_stop_node
 
 
-def build_graph():
-    builder = StateGraph(CrawlState)
-
-    # Add nodes
-    builder.add_node("classify", classify_page_node)
-    builder.add_node("analyze_defects", analyze_defects)
-    builder.add_node("decide_action", decide_action_node)
-    builder.add_node("update_memory", update_memory)
-    builder.add_node("loop_guard", loop_guard_node)
-    builder.add_node("evaluate_stop", evaluate_stop_node)
+def build_graph(state_schema: type = LoopState):
+    """
+    Args:
+        state_schema: Graph state class; CrawlState is accepted
+            for comparison (see benchmarks/bench_crawl_state.py)
+    """
+    builder = StateGraph(state_schema)
+
+    # Add nodes; explicit input schemas so node annotations
+    # do not override the graph's state class
+    nodes = {
+        "classify": classify_page,
+        "analyze_defects": analyze_defects,
+        "decide_action": decide_action_node,
+        "update_memory": update_memory_node,
+        "loop_guard": loop_guard_node,
+    }
+    for name, node in nodes.items():
+        builder.add_node(name, node, input_schema=state_schema)
 
     # Define execution flow
     builder.set_entry_point("classify")
@@ -31,11 +44,10 @@ def build_graph():
     builder.add_edge("analyze_defects", "decide_action")
     builder.add_edge("decide_action", "update_memory")
     builder.add_edge("update_memory", "loop_guard")
-    builder.add_edge("loop_guard", "evaluate_stop")
 
     # Conditional routing
     builder.add_conditional_edges(
-        "evaluate_stop",
+        "loop_guard",
         evaluate_stop_node,
         {
             "stop": END,
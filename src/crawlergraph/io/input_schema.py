@@ -1,5 +1,10 @@
-from typing import Dict, Optional
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
+from crawlergraph.defects.registry import DefectRuleConfig
+from crawlergraph.features.dom_features import STREAMING_THRESHOLD_CHARS
+from crawlergraph.features.keywords import KeywordSets
+from crawlergraph.features.parsers import ParserBackend
+from crawlergraph.state import PageFingerprint
 
 
 class CrawlConfig(BaseModel):
@@ -7,6 +12,97 @@ class CrawlConfig(BaseModel):
     max_depth: int = 5
     confidence_threshold: float = 0.7
 
+    # HTML parser used for DOM feature extraction
+    parser_backend: ParserBackend = "html.parser"
+    # Pages this large are streamed instead of parsed into a tree
+    streaming_threshold_chars: Optional[int] = STREAMING_THRESHOLD_CHARS
+    # Features and page types of pages already seen, by content
+    # hash (see features.cache); None disables the cache
+    feature_cache_entries: Optional[int] = Field(default=4096, ge=1)
+    # Lifetime of cached entries in seconds; None keeps them
+    # until evicted
+    feature_cache_ttl_seconds: Optional[float] = Field(default=None, ge=0)
+    # SQLite file for a disk tier shared between workers
+    feature_cache_path: Optional[str] = None
+    # Fraction of the DOM a mutation batch may touch before
+    # incremental feature updates give way to a full re-extract
+    mutation_churn_threshold: float = 0.25
+    # Keyword lists for text/URL hints; extend to add localized
+    # phrases (compile with features.keywords.build_keyword_engine)
+    keywords: KeywordSets = Field(default_factory=KeywordSets)
+    # Disabled defect rules and threshold overrides, by subtype
+    # (compile with defects.registry.build_defect_registry)
+    defect_rules: DefectRuleConfig = Field(default_factory=DefectRuleConfig)
+
+    # "compact" keeps visited URLs in a Bloom filter and visit
+    # counts in a count-min sketch (see memory.visit_index)
+    visit_index: Literal["exact", "compact"] = "exact"
+    # False-positive bound of visited-URL checks
+    visit_index_error_rate: float = 0.001
+    visit_index_initial_capacity: int = 100_000
+    # Visit counts overcount by <= epsilon x total visits
+    # with probability 1 - delta
+    visit_count_epsilon: float = 1e-5
+    visit_count_delta: float = 0.01
+
+    # Pages whose structural SimHash similarity reaches this
+    # count as near-duplicates (see memory.near_duplicates);
+    # None (default) disables near-duplicate detection. Opt in
+    # for sites with traps: pages sharing a layout but not
+    # their content (product, article pages) are near-duplicates
+    # too, so a low near_duplicate_max_pages can end a normal
+    # crawl
+    near_duplicate_threshold: Optional[float] = Field(default=None, gt=0, le=1)
+    # Near-duplicates of one page tolerated before the loop
+    # guard stops with LOOP_DETECTED
+    near_duplicate_max_pages: int = 20
+
+    # Visits per learned URL template before the loop guard
+    # stops with TEMPLATE_BUDGET_REACHED; None disables the cap
+    max_visits_per_template: Optional[int] = 100
+    # Distinct literal path segments under one prefix before the
+    # template miner generalizes them (see memory.url_templates)
+    template_max_fanout: int = 16
+
+    # Times one (page, action) transition may close a cycle in
+    # the page-transition graph before the loop guard stops with
+    # LOOP_DETECTED (see memory.transitions); None records only
+    max_cycle_repeats: Optional[int] = 2
+
+    # Page fingerprint loop detection keys on: "content" (SHA-256
+    # of the DOM) or "skeleton" (tag/attribute-name skeleton, so
+    # pages differing only in text count as repeats)
+    loop_fingerprint: PageFingerprint = "content"
+
+    # Queue of links and alternative actions that a dead end takes
+    # the best of instead of stopping (see actions.frontier):
+    # "bfs"/"dfs" order by depth, "novelty" by visits to the URL's
+    # template; None disables the frontier
+    frontier_scorer: Optional[Literal["bfs", "dfs", "novelty"]] = "bfs"
+    # Seconds between frontier picks on one host
+    frontier_min_delay: float = Field(default=0.0, ge=0)
+    # Candidates kept in memory; beyond that they go to a SQLite
+    # file at frontier_spill_path, if set
+    frontier_max_in_memory: int = Field(default=100_000, ge=1)
+    frontier_spill_path: Optional[str] = None
+
+
+class DomMutation(BaseModel):
+    """
+    MutationObserver-style record from the browser layer.
+
+    Added/removed nodes carry their outerHTML (or text, for
+    "#text" nodes). Attribute and character-data changes are
+    sent as a "removed" record for the old node followed by an
+    "added" record for the new one; `html` may then be omitted
+    to describe only the node's own start tag.
+    """
+    kind: Literal["added", "removed"]
+    tag: str
+    attrs: Dict[str, str] = Field(default_factory=dict)
+    html: Optional[str] = None
+    text: str = ""
+
 
 class ObservationPayload(BaseModel):
     """
@@ -16,6 +112,15 @@ class ObservationPayload(BaseModel):
     dom: str
     signals: Dict
 
+    # Absolute URLs of the page's links, queued in the run's
+    # frontier (see CrawlConfig.frontier_scorer)
+    links: List[str] = Field(default_factory=list)
+
+    # Changes since the previous observation of the same page;
+    # applied to the run's last DomSnapshot instead of
+    # re-extracting (see LoopState.from_input)
+    mutations: Optional[List[DomMutation]] = None
+
 
 class LangGraphInput(BaseModel):
     run_id: str
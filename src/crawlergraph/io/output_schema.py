@@ -1,11 +1,13 @@
-from typing import List, Optional
-from pydantic import BaseModel
-from crawler_graph.state import (
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from crawlergraph.state import (
     PageType,
-    Defect,
     ActionDecision,
     StopReason
 )
+from crawlergraph.defects.aggregator import DefectGroup
+from crawlergraph.defects.models import Defect
+from crawlergraph.features.fingerprints import MessageEntry
 
 
 class PageSummary(BaseModel):
@@ -24,3 +26,11 @@ class LangGraphOutput(BaseModel):
     defects: List[Defect]
 
     stop_reason: Optional[StopReason]
+
+    # Interned runtime messages referenced by fingerprint
+    # from defect evidence (see MessageInterner.table)
+    messages: Dict[str, MessageEntry] = Field(default_factory=dict)
+
+    # Run-level defect groups, highest priority first
+    # (see DefectAggregator.groups)
+    defect_groups: List[DefectGroup] = Field(default_factory=list)
@@ -0,0 +1,430 @@
+"""
+Append-Only Result Store
+
+Sink for per-page classification results and defects, so a run
+does not keep millions of pydantic objects in memory or dump
+them as JSON at the end. Records are buffered and written in
+batches to a local columnar store; reads push filters down to
+the storage engine:
+
+    store.query_defects(category=DefectCategory.SECURITY,
+                        page_type=PageType.LOGIN)
+
+Backends:
+    ParquetResultStore  experimental: one zstd-compressed
+                        Parquet file per flushed batch, read
+                        as a dataset with pyarrow filters
+                        (requires pyarrow, optional dependency)
+    SQLiteResultStore   WAL-mode SQLite with indexed filter
+                        columns and zlib-compressed evidence
+
+open_result_store() uses SQLite unless the path ends in
+.parquet, so the backend does not change with what happens to
+be installed. Parquet part files are named by write time and a
+random suffix: several writers may share a dataset directory.
+
+The Parquet backend is experimental. pyarrow is not a declared
+dependency, so its tests skip unless pyarrow is installed, and
+nothing in CrawlConfig selects it. Callers opt in by passing a
+.parquet path or constructing it and handing it to RunContext.
+
+NO LangGraph logic
+"""
+
+import json
+import sqlite3
+import time
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+from pydantic import BaseModel, Field
+from crawlergraph.defects.models import Defect, DefectCategory
+from crawlergraph.state import CrawlState, PageType
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = ds = pq = None
+
+# Pushed-down filter: (column, op, value), op "in" or ">="
+Filter = Tuple[str, str, Any]
+
+
+class PageRecord(BaseModel):
+    run_id: str
+    url: str
+    page_type: PageType
+    confidence: float
+    depth: int = 0
+    status_code: int | None = None
+    page_load_time_ms: int | None = None
+    defect_count: int = 0
+    observed_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @classmethod
+    def from_state(cls, state: CrawlState, defect_count: int | None = None) -> "PageRecord":
+        return cls(
+            run_id=state.run_id,
+            url=state.current_url,
+            page_type=state.page_type,
+            confidence=state.page_confidence,
+            depth=state.depth,
+            status_code=state.signals.status_code,
+            page_load_time_ms=state.signals.page_load_time_ms,
+            defect_count=len(state.detected_defects) if defect_count is None else defect_count,
+        )
+
+
+class DefectRecord(Defect):
+    """
+    A stored Defect with the page it was found on.
+    """
+    run_id: str
+    url: str
+    page_type: PageType
+
+
+# Column order of each table
+PAGE_COLUMNS: Tuple[str, ...] = tuple(PageRecord.model_fields)
+DEFECT_COLUMNS: Tuple[str, ...] = (
+    "run_id", "url", "page_type",
+    "category", "subtype", "severity", "confidence",
+    "description", "evidence", "detected_at",
+)
+
+
+class ResultStore(ABC):
+    """
+    Batching and query interface shared by the backends.
+
+    Args:
+        batch_size: Buffered records (pages + defects) that
+            trigger a write
+    """
+
+    def __init__(self, batch_size: int = 5000) -> None:
+        self.batch_size = batch_size
+        # Buffered rows, in PAGE_COLUMNS / DEFECT_COLUMNS order
+        self._pages: List[tuple] = []
+        self._defects: List[tuple] = []
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def append(self, page: PageRecord, defects: Sequence[Defect] = ()) -> None:
+        """
+        Buffer one page result and the defects found on it
+        (which also set the page's defect_count).
+        """
+        self._pages.append(_page_row(page, len(defects) or page.defect_count))
+        for defect in defects:
+            self._defects.append(_defect_row(page, defect))
+        if len(self._pages) + len(self._defects) >= self.batch_size:
+            self.flush()
+
+    def append_state(self, state: CrawlState) -> None:
+        """
+        Buffer the current page of `state` and its defects.
+        """
+        self.append(PageRecord.from_state(state), state.detected_defects)
+
+    def flush(self) -> None:
+        if self._pages:
+            self._write_pages(self._pages)
+            self._pages = []
+        if self._defects:
+            self._write_defects(self._defects)
+            self._defects = []
+
+    def close(self) -> None:
+        self.flush()
+
+    def query_pages(
+        self,
+        run_id: str | Sequence[str] | None = None,
+        page_type: PageType | Sequence[PageType] | None = None,
+        min_defects: int | None = None,
+    ) -> Iterator[PageRecord]:
+        """
+        Stored pages matching every given filter.
+        """
+        self.flush()
+        filters = _filters(run_id=run_id, page_type=page_type)
+        if min_defects is not None:
+            filters.append(("defect_count", ">=", min_defects))
+        for row in self._read("pages", PAGE_COLUMNS, filters):
+            yield PageRecord(**row)
+
+    def query_defects(
+        self,
+        run_id: str | Sequence[str] | None = None,
+        category: DefectCategory | Sequence[DefectCategory] | None = None,
+        subtype: str | Sequence[str] | None = None,
+        page_type: PageType | Sequence[PageType] | None = None,
+        min_severity: int | None = None,
+    ) -> Iterator[DefectRecord]:
+        """
+        Stored defects matching every given filter.
+        """
+        self.flush()
+        filters = _filters(run_id=run_id, category=category, subtype=subtype, page_type=page_type)
+        if min_severity is not None:
+            filters.append(("severity", ">=", min_severity))
+        for row in self._read("defects", DEFECT_COLUMNS, filters):
+            row["evidence"] = self._decode_evidence(row["evidence"])
+            yield DefectRecord(**row)
+
+    # Backend hooks
+    @abstractmethod
+    def _write_pages(self, rows: List[tuple]) -> None:
+        ...
+
+    @abstractmethod
+    def _write_defects(self, rows: List[tuple]) -> None:
+        ...
+
+    @abstractmethod
+    def _read(self, table: str, columns: Sequence[str], filters: List[Filter]) -> Iterator[Dict]:
+        ...
+
+    def _decode_evidence(self, value: Any) -> Dict:
+        return json.loads(value)
+
+
+class SQLiteResultStore(ResultStore):
+    """
+    Args:
+        path: Database file (created if missing)
+        batch_size: See ResultStore
+    """
+
+    def __init__(self, path: str | Path, batch_size: int = 5000) -> None:
+        super().__init__(batch_size)
+        self.path = Path(path)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(_SQLITE_SCHEMA)
+
+    def close(self) -> None:
+        super().close()
+        self._conn.close()
+
+    def _write_pages(self, rows: List[tuple]) -> None:
+        self._insert("pages", PAGE_COLUMNS, rows)
+
+    def _write_defects(self, rows: List[tuple]) -> None:
+        evidence = DEFECT_COLUMNS.index("evidence")
+        rows = [
+            row[:evidence] + (zlib.compress(row[evidence].encode("utf-8")),) + row[evidence + 1:]
+            for row in rows
+        ]
+        self._insert("defects", DEFECT_COLUMNS, rows)
+
+    def _insert(self, table: str, columns: Sequence[str], rows: List[tuple]) -> None:
+        placeholders = ", ".join("?" * len(columns))
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows,
+            )
+
+    def _read(self, table: str, columns: Sequence[str], filters: List[Filter]) -> Iterator[Dict]:
+        clauses, params = [], []
+        for column, op, value in filters:
+            if op == "in":
+                clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+                params.extend(value)
+            else:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+
+        sql = f"SELECT {', '.join(columns)} FROM {table}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        for values in self._conn.execute(sql, params):
+            yield dict(zip(columns, values))
+
+    def _decode_evidence(self, value: Any) -> Dict:
+        return json.loads(zlib.decompress(value))
+
+
+class ParquetResultStore(ResultStore):
+    """
+    Experimental Parquet backend (see module docstring).
+
+    Args:
+        directory: Dataset root; pages/ and defects/ hold one
+            Parquet file per flushed batch
+        batch_size: See ResultStore
+        compression: Parquet codec
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        batch_size: int = 50_000,
+        compression: str = "zstd",
+    ) -> None:
+        if pa is None:
+            raise ImportError("pyarrow is required for the Parquet result store")
+
+        super().__init__(batch_size)
+        self.directory = Path(directory)
+        self.compression = compression
+        for table in _ARROW_SCHEMAS:
+            (self.directory / table).mkdir(parents=True, exist_ok=True)
+
+    def _write_pages(self, rows: List[tuple]) -> None:
+        self._write("pages", PAGE_COLUMNS, rows)
+
+    def _write_defects(self, rows: List[tuple]) -> None:
+        self._write("defects", DEFECT_COLUMNS, rows)
+
+    def _write(self, table: str, columns: Sequence[str], rows: List[tuple]) -> None:
+        schema = _ARROW_SCHEMAS[table]
+        arrays = [
+            pa.array(list(values), type=schema.field(name).type)
+            for name, values in zip(columns, zip(*rows))
+        ]
+        # Append-only: never rewrite existing parts
+        part = self.directory / table / _part_name()
+        pq.write_table(
+            pa.Table.from_arrays(arrays, schema=schema), part, compression=self.compression,
+        )
+
+    def _read(self, table: str, columns: Sequence[str], filters: List[Filter]) -> Iterator[Dict]:
+        dataset = ds.dataset(
+            self.directory / table, format="parquet", schema=_ARROW_SCHEMAS[table],
+        )
+
+        expression = None
+        for column, op, value in filters:
+            term = ds.field(column).isin(list(value)) if op == "in" else ds.field(column) >= value
+            expression = term if expression is None else expression & term
+
+        for batch in dataset.to_batches(columns=list(columns), filter=expression):
+            yield from batch.to_pylist()
+
+# Public API
+def open_result_store(path: str | Path, batch_size: int | None = None) -> ResultStore:
+    """
+    Parquet dataset directory if `path` ends in .parquet
+    (requires pyarrow), else a SQLite database.
+    """
+    path = Path(path)
+    kwargs = {"batch_size": batch_size} if batch_size is not None else {}
+    if path.suffix == ".parquet":
+        return ParquetResultStore(path, **kwargs)
+    return SQLiteResultStore(path, **kwargs)
+
+# Helpers
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    run_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    page_type TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    depth INTEGER NOT NULL,
+    status_code INTEGER,
+    page_load_time_ms INTEGER,
+    defect_count INTEGER NOT NULL,
+    observed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS defects (
+    run_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    page_type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    subtype TEXT NOT NULL,
+    severity INTEGER NOT NULL,
+    confidence REAL NOT NULL,
+    description TEXT NOT NULL,
+    evidence BLOB NOT NULL,
+    detected_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_by_type ON pages (page_type, run_id);
+CREATE INDEX IF NOT EXISTS defects_by_category ON defects (category, page_type, run_id);
+CREATE INDEX IF NOT EXISTS defects_by_subtype ON defects (subtype);
+"""
+
+if pa is not None:
+    _ARROW_SCHEMAS = {
+        "pages": pa.schema([
+            ("run_id", pa.string()),
+            ("url", pa.string()),
+            ("page_type", pa.string()),
+            ("confidence", pa.float64()),
+            ("depth", pa.int32()),
+            ("status_code", pa.int32()),
+            ("page_load_time_ms", pa.int64()),
+            ("defect_count", pa.int32()),
+            ("observed_at", pa.string()),
+        ]),
+        "defects": pa.schema([
+            ("run_id", pa.string()),
+            ("url", pa.string()),
+            ("page_type", pa.string()),
+            ("category", pa.string()),
+            ("subtype", pa.string()),
+            ("severity", pa.int8()),
+            ("confidence", pa.float64()),
+            ("description", pa.string()),
+            ("evidence", pa.string()),
+            ("detected_at", pa.string()),
+        ]),
+    }
+else:  # pragma: no cover - optional dependency
+    _ARROW_SCHEMAS = {"pages": None, "defects": None}
+
+def _filters(**values: Any) -> List[Filter]:
+    filters = []
+    for column, value in values.items():
+        if value is None:
+            continue
+        if isinstance(value, str) or not isinstance(value, Sequence):
+            value = [value]
+        filters.append((column, "in", [_scalar(v) for v in value]))
+    return filters
+
+def _part_name() -> str:
+    # Sorts in write order; the suffix keeps concurrent writers apart
+    return f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:12]}.parquet"
+
+def _scalar(value: Any) -> Any:
+    return value.value if isinstance(value, (PageType, DefectCategory)) else value
+
+def _page_row(page: PageRecord, defect_count: int) -> tuple:
+    return (
+        page.run_id,
+        page.url,
+        page.page_type.value,
+        page.confidence,
+        page.depth,
+        page.status_code,
+        page.page_load_time_ms,
+        defect_count,
+        page.observed_at.isoformat(),
+    )
+
+def _defect_row(page: PageRecord, defect: Defect) -> tuple:
+    return (
+        page.run_id,
+        page.url,
+        page.page_type.value,
+        defect.category.value,
+        defect.subtype,
+        defect.severity,
+        defect.confidence,
+        defect.description,
+        json.dumps(defect.evidence, separators=(",", ":"), default=str),
+        defect.detected_at.isoformat(),
+    )
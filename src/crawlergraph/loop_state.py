@@ -0,0 +1,264 @@
+"""
+Loop State
+
+LangGraph rebuilds the state object from its channels before
+every node call. With the pydantic CrawlState that means
+re-validating every field, including the visited set and action
+history, six times per crawl step, so step cost grows with the
+length of the crawl.
+
+LoopState is the graph's internal state: a slotted dataclass
+with the same fields, built without validation. Pydantic models
+are only used at the boundaries:
+
+    LangGraphInput  -> LoopState.from_input()
+    CrawlState     <-> LoopState.from_crawl_state() / to_crawl_state()
+    LoopState       -> LangGraphOutput via to_output()
+
+Values written by nodes are trusted; validate at the boundary.
+
+Node contract: nodes do not mutate the state they are given;
+they return a dict of only the fields they change. Collection
+fields are reducer channels, so a node returns just the delta:
+
+    action_history    records to append
+    visited_pages     URLs to add
+    url_visit_counts  per-URL increments
+    loop_counters     per-hash increments
+
+The reducers (see reducers) merge the delta into a copy of the
+stored collection, so streamed and checkpointed values of
+earlier steps are never changed afterwards, and nodes never
+rebuild a collection themselves. reducers.apply_updates()
+applies a node's result the same way outside the graph.
+
+NO LangGraph logic
+"""
+
+from dataclasses import dataclass, field, fields
+from typing import Annotated, Any, Dict, List, Optional, Set
+from crawlergraph.actions.frontier import new_frontier
+from crawlergraph.context import RunContext
+from crawlergraph.defects.models import Defect
+from crawlergraph.defects.registry import build_defect_registry
+from crawlergraph.defects.rules import DEFECT_RULES
+from crawlergraph.features.cache import cached_extract_page, new_feature_cache
+from crawlergraph.features.incremental import extract_dom_snapshot, update_dom_snapshot
+from crawlergraph.features.keywords import build_keyword_engine
+from crawlergraph.features.runtime_features import extract_runtime_features
+from crawlergraph.features.skeleton import SkeletonHasher
+from crawlergraph.io.input_schema import LangGraphInput
+from crawlergraph.io.output_schema import LangGraphOutput, PageSummary
+from crawlergraph.memory.loop_guards import compute_page_hash, compute_skeleton_hash
+from crawlergraph.memory.near_duplicates import compute_simhash, new_near_duplicate_index
+from crawlergraph.memory.transitions import new_transition_graph
+from crawlergraph.memory.url_templates import new_template_miner
+from crawlergraph.memory.visit_index import new_visit_index
+from crawlergraph.reducers import add_counts, add_members, append_records
+from crawlergraph.utils.urls import canonicalize_url
+from crawlergraph.state import (
+    ActionDecision,
+    ActionRecord,
+    CrawlState,
+    PageFeatures,
+    PageFingerprint,
+    PageType,
+    RuntimeSignals,
+    StopReason,
+)
+
+
+@dataclass(slots=True)
+class LoopState:
+    """
+    Field-for-field mirror of CrawlState.
+    """
+
+    # Identity & versioning
+    run_id: str
+    current_url: str
+    graph_version: str = "v1"
+
+    # Navigation context
+    previous_url: Optional[str] = None
+    depth: int = 0
+    # Links on the page (ObservationPayload.links)
+    outgoing_links: List[str] = field(default_factory=list)
+
+    # Page fingerprinting
+    page_hash: Optional[str] = None
+    # Tag/attribute-name skeleton hash (see features.skeleton)
+    skeleton_hash: Optional[str] = None
+    # Structural SimHash (see memory.near_duplicates)
+    page_simhash: Optional[int] = None
+    normalized_url: Optional[str] = None
+    # Fingerprint loop detection keys on
+    loop_fingerprint: PageFingerprint = "content"
+
+    # Page understanding
+    page_type: PageType = PageType.UNKNOWN
+    page_confidence: float = 0.0
+    page_features: PageFeatures = field(default_factory=PageFeatures)
+
+    # Runtime signals
+    signals: RuntimeSignals = field(default_factory=RuntimeSignals)
+
+    # Crawl memory
+    visited_pages: Annotated[Set[str], add_members] = field(default_factory=set)
+    url_visit_counts: Annotated[Dict[str, int], add_counts] = field(default_factory=dict)
+    action_history: Annotated[List[ActionRecord], append_records] = field(default_factory=list)
+
+    # Loop detection
+    loop_counters: Annotated[Dict[str, int], add_counts] = field(default_factory=dict)
+
+    # Defects
+    detected_defects: List[Defect] = field(default_factory=list)
+
+    # Decision output
+    next_action: Optional[ActionDecision] = None
+    stop_reason: Optional[StopReason] = None
+
+    # Safety limits
+    max_pages: int = 100
+    max_depth: int = 5
+
+    @classmethod
+    def from_crawl_state(cls, state: CrawlState) -> "LoopState":
+        return cls(**{name: getattr(state, name) for name in FIELDS})
+
+    @classmethod
+    def from_input(cls, payload: LangGraphInput, context: RunContext | None = None) -> "LoopState":
+        """
+        Initial state for one observation: DOM and runtime
+        features are extracted, the page fingerprinted, and crawl
+        memory created, with the run's configuration. A context
+        without a feature cache, defect registry, near-duplicate
+        index, template miner, transition graph or frontier gets
+        them, configured for the run; with a feature cache, a page
+        seen before is not extracted again. The observation is
+        counted once toward its URL template, and its URL marked
+        taken in the frontier, here (the graph may pass over it
+        more than once).
+
+        An observation with `mutations` is applied to the
+        context's DomSnapshot of the previous observation (see
+        features.incremental). The skeleton hash is then only
+        computed when loop detection keys on it.
+        """
+        config = payload.config
+        observation = payload.observation
+        if context is not None and context.feature_cache is None:
+            context.feature_cache = new_feature_cache(config)
+        cache = context.feature_cache if context is not None else None
+        previous = context.dom_snapshot if context is not None else None
+
+        page_hash = compute_page_hash(observation.dom)
+        extraction = dict(
+            url=observation.url,
+            parser=config.parser_backend,
+            streaming_threshold=config.streaming_threshold_chars,
+            keywords=build_keyword_engine(config.keywords),
+        )
+        if observation.mutations is not None and previous is not None:
+            snapshot = update_dom_snapshot(
+                previous,
+                observation.mutations,
+                observation.dom,
+                churn_threshold=config.mutation_churn_threshold,
+                **extraction,
+            )
+            skeleton_hash = (
+                compute_skeleton_hash(observation.dom)
+                if config.loop_fingerprint == "skeleton"
+                else None
+            )
+        elif cache is not None:
+            snapshot, skeleton_hash = cached_extract_page(
+                cache, observation.dom, page_hash=page_hash, **extraction
+            )
+        else:
+            skeleton = SkeletonHasher()
+            snapshot = extract_dom_snapshot(observation.dom, skeleton=skeleton, **extraction)
+            skeleton_hash = skeleton.hexdigest()
+        if context is not None:
+            context.dom_snapshot = snapshot
+        features = snapshot.features
+        signals = extract_runtime_features(
+            observation.signals,
+            interner=context.messages if context is not None else None,
+        )
+        visited, counts = new_visit_index(config)
+        if context is not None and context.defect_registry is None:
+            context.defect_registry = build_defect_registry(DEFECT_RULES, config.defect_rules)
+        if context is not None and context.near_duplicates is None:
+            context.near_duplicates = new_near_duplicate_index(config)
+        if context is not None and context.templates is None:
+            context.templates = new_template_miner(config)
+        normalized_url = canonicalize_url(observation.url)
+        if context is not None:
+            context.templates.observe(normalized_url)
+        if context is not None and context.transitions is None:
+            context.transitions = new_transition_graph(config)
+        if context is not None and context.frontier is None:
+            context.frontier = new_frontier(config, context.templates)
+        if context is not None and context.frontier is not None:
+            # Arrived here: never hand this URL out as a candidate
+            context.frontier.mark_taken(normalized_url)
+        return cls(
+            run_id=payload.run_id,
+            current_url=observation.url,
+            outgoing_links=list(observation.links),
+            normalized_url=normalized_url,
+            page_hash=page_hash,
+            skeleton_hash=skeleton_hash,
+            loop_fingerprint=config.loop_fingerprint,
+            page_simhash=(
+                compute_simhash(observation.dom)
+                if config.near_duplicate_threshold is not None
+                else None
+            ),
+            page_features=features,
+            signals=signals,
+            visited_pages=visited,
+            url_visit_counts=counts,
+            max_pages=config.max_pages,
+            max_depth=config.max_depth,
+        )
+
+    def to_crawl_state(self) -> CrawlState:
+        """
+        CrawlState with the same field values (not re-validated).
+
+        Raises:
+            ValueError: if crawl memory uses the compact backend,
+                which cannot be enumerated
+        """
+        if not isinstance(self.visited_pages, set) or not isinstance(self.url_visit_counts, dict):
+            raise ValueError("Compact visit index cannot be converted to CrawlState")
+        return CrawlState.model_construct(**self.as_dict())
+
+    def to_output(self, context: RunContext | None = None) -> LangGraphOutput:
+        return LangGraphOutput(
+            graph_version=self.graph_version,
+            run_id=self.run_id,
+            page=PageSummary(
+                url=self.current_url,
+                page_type=self.page_type,
+                confidence=self.page_confidence,
+            ),
+            next_action=self.next_action,
+            defects=self.detected_defects,
+            stop_reason=self.stop_reason,
+            messages=context.messages.table() if context is not None else {},
+            defect_groups=context.defects.groups() if context is not None else [],
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Shallow field mapping (values are shared, not copied).
+        """
+        return {name: getattr(self, name) for name in FIELDS}
+
+
+# Field names, in declaration order
+FIELDS = tuple(f.name for f in fields(LoopState))
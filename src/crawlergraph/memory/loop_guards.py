@@ -3,7 +3,9 @@ Loop Detection and Crawl Guard Logic
 """
 
 import hashlib
-from crawlergraph.state import CrawlState
+from crawlergraph.features.skeleton import SkeletonHasher
+from crawlergraph.features.streaming import StreamingFeatureExtractor
+from crawlergraph.state import CrawlState, PageFingerprint
 
 # Page Hash Utility
 def compute_page_hash(dom: str) -> str:
@@ -12,13 +14,35 @@ def compute_page_hash(dom: str) -> str:
     """
     return hashlib.sha256(dom.encode("utf-8")).hexdigest()
 
+def compute_skeleton_hash(dom: str) -> str:
+    """
+    Skeleton hash of a DOM on its own (see features.skeleton).
+    Matches the hash feature extraction yields with the default
+    html.parser backend; prefer that when extracting anyway.
+    """
+    hasher = SkeletonHasher()
+    extractor = StreamingFeatureExtractor(skeleton=hasher)
+    extractor.feed(dom)
+    extractor.finish()
+    return hasher.hexdigest()
+
+def compute_fingerprint(dom: str, kind: PageFingerprint = "content") -> str:
+    return compute_skeleton_hash(dom) if kind == "skeleton" else compute_page_hash(dom)
+
+def page_fingerprint(state: CrawlState) -> str | None:
+    """
+    The fingerprint of the current page that loop detection keys
+    on (state.loop_fingerprint).
+    """
+    return state.skeleton_hash if state.loop_fingerprint == "skeleton" else state.page_hash
+
 # Loop Detection Logic
 def check_loop_conditions(state: CrawlState, dom: str) -> bool:
     """
     Returns True if crawl should stop due to loop conditions.
     """
 
-    page_hash = compute_page_hash(dom)
+    fingerprint = compute_fingerprint(dom, state.loop_fingerprint)
 
     # Max page limit
     if len(state.visited_pages) >= state.max_pages:
@@ -31,12 +55,12 @@ def check_loop_conditions(state: CrawlState, dom: str) -> bool:
         return True
 
     # Duplicate content detection
-    if state.page_hash == page_hash:
+    if page_fingerprint(state) == fingerprint:
         state.stop_reason = "Duplicate page content detected"
         return True
 
     # Excessive visits to same URL
-    visits = state.url_visit_counts.get(state.current_url, 0)
+    visits = state.url_visit_counts.get(state.normalized_url or state.current_url, 0)
     if visits >= 3:
         state.stop_reason = "Too many visits to same URL"
         return True
@@ -0,0 +1,217 @@
+"""
+Near-Duplicate Page Detection
+
+compute_page_hash only matches byte-identical DOMs. Crawler traps
+(infinite calendars, session tokens in links, timestamps, CSRF
+fields) change a few bytes on every iteration, so each page looks
+new. Their structure does not change.
+
+A page's structural fingerprint is a 64-bit SimHash over
+shingles of its start tags:
+
+    token     tag name + sorted attribute names
+              ("input[name,type,value]"); text and attribute
+              values are ignored
+    shingle   SHINGLE_SIZE consecutive tokens
+    simhash   bit i is set when more shingle hashes have bit i
+              set than not (each distinct shingle counts once,
+              so repeated rows do not dominate)
+
+Pages with similar structure get fingerprints a small Hamming
+distance apart; similarity is 1 - distance / 64.
+
+NearDuplicateIndex groups fingerprints into clusters of
+near-duplicates. Lookup is sublinear: for a maximum distance k
+the fingerprint is split into k + 1 bands, and any fingerprint
+within k bits agrees with it exactly on at least one band, so
+only pages sharing a band are compared.
+
+NO LangGraph logic
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Optional, Set, Tuple
+from crawlergraph.io.input_schema import CrawlConfig
+
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 4
+
+_START_TAG = re.compile(r"<([a-zA-Z][\w:-]*)([^>]*)>")
+_ATTRIBUTE_NAME = re.compile(
+    r"""([^\s"'=<>/]+)(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]+))?"""
+)
+
+
+class NearDuplicateIndex:
+    """
+    Clusters of structurally near-identical pages.
+
+    Args:
+        threshold: Minimum similarity (0 < threshold <= 1) for two
+            fingerprints to be near-duplicates
+        max_cluster_pages: Pages one cluster may hold before the
+            loop guard treats it as a trap
+        max_clusters: Clusters indexed; once full, fingerprints
+            matching no cluster are not indexed
+    """
+
+    __slots__ = (
+        "threshold",
+        "max_distance",
+        "max_cluster_pages",
+        "max_clusters",
+        "_bands",
+        "_buckets",
+        "_fingerprints",
+        "_sizes",
+    )
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        max_cluster_pages: int = 20,
+        max_clusters: int = 100_000,
+    ) -> None:
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+
+        self.threshold = threshold
+        self.max_distance = max_distance_for(threshold)
+        self.max_cluster_pages = max_cluster_pages
+        self.max_clusters = max_clusters
+
+        # (shift, mask) per band; k + 1 bands for distance k
+        self._bands = _band_layout(self.max_distance + 1)
+        # Band -> band value -> cluster ids
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in self._bands]
+        # Cluster id -> representative fingerprint / pages
+        self._fingerprints: List[int] = []
+        self._sizes: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def query(self, fingerprint: int) -> Optional[int]:
+        """
+        Id of the closest cluster within the threshold, if any.
+        """
+        best, best_distance = None, self.max_distance + 1
+        seen: Set[int] = set()
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            for cluster in buckets.get((fingerprint >> shift) & mask, ()):
+                if cluster in seen:
+                    continue
+                seen.add(cluster)
+                distance = hamming_distance(fingerprint, self._fingerprints[cluster])
+                if distance < best_distance:
+                    best, best_distance = cluster, distance
+        return best
+
+    def observe(self, fingerprint: int) -> int:
+        """
+        Record one page; returns the pages in its cluster so far,
+        including this one.
+        """
+        cluster = self.query(fingerprint)
+        if cluster is None:
+            if len(self._fingerprints) >= self.max_clusters:
+                return 1
+            cluster = len(self._fingerprints)
+            self._fingerprints.append(fingerprint)
+            self._sizes.append(0)
+            for (shift, mask), buckets in zip(self._bands, self._buckets):
+                buckets.setdefault((fingerprint >> shift) & mask, []).append(cluster)
+
+        self._sizes[cluster] += 1
+        return self._sizes[cluster]
+
+    def cluster_size(self, fingerprint: int) -> int:
+        cluster = self.query(fingerprint)
+        return self._sizes[cluster] if cluster is not None else 0
+
+# Public API
+def compute_simhash(dom: str, shingle_size: int = SHINGLE_SIZE) -> int:
+    """
+    64-bit structural fingerprint of a DOM (0 when it has no tags).
+    """
+    hashes = {_shingle_hash(shingle) for shingle in structural_shingles(dom, shingle_size)}
+    if not hashes:
+        return 0
+
+    # Per-bit count of hashes with the bit set
+    ones = [0] * FINGERPRINT_BITS
+    for value in hashes:
+        while value:
+            low = value & -value
+            ones[low.bit_length() - 1] += 1
+            value ^= low
+
+    half = len(hashes) / 2
+    fingerprint = 0
+    for bit, count in enumerate(ones):
+        if count > half:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def structural_shingles(dom: str, shingle_size: int = SHINGLE_SIZE) -> List[str]:
+    """
+    Overlapping runs of `shingle_size` start-tag tokens; a page
+    with fewer tags yields one shingle of all of them.
+    """
+    tokens = structural_tokens(dom)
+    if len(tokens) <= shingle_size:
+        return ["\x1f".join(tokens)] if tokens else []
+    return [
+        "\x1f".join(tokens[i:i + shingle_size])
+        for i in range(len(tokens) - shingle_size + 1)
+    ]
+
+def structural_tokens(dom: str) -> List[str]:
+    """
+    One "tag[attribute,names]" token per start tag, in order.
+    """
+    tokens = []
+    for match in _START_TAG.finditer(dom):
+        names = sorted({name.lower() for name in _ATTRIBUTE_NAME.findall(match.group(2))})
+        tokens.append(f"{match.group(1).lower()}[{','.join(names)}]")
+    return tokens
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+def similarity(a: int, b: int) -> float:
+    return 1 - hamming_distance(a, b) / FINGERPRINT_BITS
+
+def max_distance_for(threshold: float) -> int:
+    """
+    Largest Hamming distance with similarity >= threshold.
+    """
+    return int((1 - threshold) * FINGERPRINT_BITS + 1e-9)
+
+def new_near_duplicate_index(config: CrawlConfig | None = None) -> NearDuplicateIndex | None:
+    """
+    Index for the configured threshold, or None when disabled.
+    """
+    config = config or CrawlConfig()
+    if config.near_duplicate_threshold is None:
+        return None
+    return NearDuplicateIndex(
+        threshold=config.near_duplicate_threshold,
+        max_cluster_pages=config.near_duplicate_max_pages,
+    )
+
+# Helpers
+def _shingle_hash(shingle: str) -> int:
+    digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+def _band_layout(bands: int) -> List[Tuple[int, int]]:
+    # Split FINGERPRINT_BITS into `bands` near-equal ranges
+    layout = []
+    start = 0
+    for i in range(bands):
+        width = (FINGERPRINT_BITS - start) // (bands - i)
+        layout.append((start, (1 << width) - 1))
+        start += width
+    return layout
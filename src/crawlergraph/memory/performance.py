@@ -0,0 +1,193 @@
+"""
+Run-Level Performance Telemetry
+
+Aggregates page load time and long-task time across a whole
+crawl in fixed-memory quantile sketches, grouped by page type
+and by URL template (see utils.urls.url_template).
+
+Besides run summaries (p50/p95/p99 per group), the aggregator
+answers "is this page slow for its template?": a value is an
+outlier when it exceeds `outlier_factor` x the template's p95,
+once the template has at least `min_samples` observations.
+Pages are compared against what was seen before them, so call
+outliers() before observe().
+
+Memory is fixed: at most `max_templates` templates are tracked;
+later templates share one overflow group, and their pages are
+judged against it.
+
+NO LangGraph logic
+"""
+
+from typing import Dict, List, Tuple
+from pydantic import BaseModel
+from crawlergraph.state import PageType, RuntimeSignals
+from crawlergraph.utils.sketches import QuantileSketch
+from crawlergraph.utils.urls import url_template
+
+# Metric name -> RuntimeSignals field
+METRICS: Dict[str, str] = {
+    "page_load_time_ms": "page_load_time_ms",
+    "long_tasks_ms": "long_tasks_ms",
+}
+
+# Template group shared once max_templates is reached
+OVERFLOW_TEMPLATE = "<other>"
+
+_QUANTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+
+
+class MetricSummary(BaseModel):
+    count: int
+    p50: float
+    p95: float
+    p99: float
+    mean: float
+
+
+class PerformanceSummary(BaseModel):
+    # metric -> page type -> summary
+    by_page_type: Dict[str, Dict[str, MetricSummary]]
+    # metric -> URL template -> summary
+    by_template: Dict[str, Dict[str, MetricSummary]]
+
+
+class PerformanceOutlier(BaseModel):
+    metric: str
+    template: str
+    value: float
+    baseline_p95: float
+    samples: int
+
+    @property
+    def ratio(self) -> float:
+        return self.value / self.baseline_p95 if self.baseline_p95 else float("inf")
+
+
+class PerformanceAggregator:
+    """
+    Streaming percentiles of per-page performance metrics.
+
+    Args:
+        relative_accuracy: Quantile error bound of each sketch
+        max_templates: URL templates tracked individually
+        min_samples: Template observations needed before
+            outliers are reported
+        outlier_factor: Multiple of the template p95 a value
+            must exceed to be an outlier
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        max_templates: int = 1024,
+        min_samples: int = 20,
+        outlier_factor: float = 1.5,
+    ) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.max_templates = max_templates
+        self.min_samples = min_samples
+        self.outlier_factor = outlier_factor
+
+        self._by_page_type: Dict[Tuple[str, str], QuantileSketch] = {}
+        self._by_template: Dict[Tuple[str, str], QuantileSketch] = {}
+        self._templates: set = set()
+
+    def observe(self, page_type: PageType, url: str, signals: RuntimeSignals) -> None:
+        """
+        Add one page's metrics.
+        """
+        template = self._group(url_template(url))
+
+        for metric, field in METRICS.items():
+            value = getattr(signals, field)
+            if value is None:
+                continue
+            self._sketch(self._by_page_type, (metric, page_type.value)).add(value)
+            self._sketch(self._by_template, (metric, template)).add(value)
+
+    def outliers(
+        self,
+        url: str,
+        signals: RuntimeSignals,
+        factors: Dict[str, float] | None = None,
+    ) -> List[PerformanceOutlier]:
+        """
+        Metrics of this page that are outliers for its template.
+
+        `factors` overrides outlier_factor per metric.
+        """
+        factors = factors or {}
+        template = url_template(url)
+        if template not in self._templates:
+            if len(self._templates) < self.max_templates:
+                return []
+            template = OVERFLOW_TEMPLATE
+
+        found = []
+        for metric, field in METRICS.items():
+            value = getattr(signals, field)
+            sketch = self._by_template.get((metric, template))
+            if value is None or sketch is None or sketch.count < self.min_samples:
+                continue
+
+            p95 = sketch.quantile(0.95)
+            if value > factors.get(metric, self.outlier_factor) * p95:
+                found.append(PerformanceOutlier(
+                    metric=metric,
+                    template=template,
+                    value=value,
+                    baseline_p95=p95,
+                    samples=sketch.count,
+                ))
+        return found
+
+    def percentiles(
+        self,
+        metric: str,
+        page_type: PageType | None = None,
+        template: str | None = None,
+    ) -> MetricSummary | None:
+        """
+        Summary for one page type or one URL template.
+        """
+        if page_type is not None:
+            sketch = self._by_page_type.get((metric, page_type.value))
+        else:
+            sketch = self._by_template.get((metric, template))
+        return _summarize(sketch) if sketch is not None else None
+
+    def summary(self) -> PerformanceSummary:
+        return PerformanceSummary(
+            by_page_type=_nest(self._by_page_type),
+            by_template=_nest(self._by_template),
+        )
+
+    # Internals
+    def _group(self, template: str) -> str:
+        if template in self._templates:
+            return template
+        if len(self._templates) >= self.max_templates:
+            return OVERFLOW_TEMPLATE
+        self._templates.add(template)
+        return template
+
+    def _sketch(self, sketches: Dict, key: Tuple[str, str]) -> QuantileSketch:
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = QuantileSketch(self.relative_accuracy)
+        return sketch
+
+# Helpers
+def _summarize(sketch: QuantileSketch) -> MetricSummary:
+    return MetricSummary(
+        count=sketch.count,
+        mean=sketch.mean,
+        **{name: sketch.quantile(q) for name, q in _QUANTILES.items()},
+    )
+
+def _nest(sketches: Dict[Tuple[str, str], QuantileSketch]) -> Dict[str, Dict[str, MetricSummary]]:
+    nested: Dict[str, Dict[str, MetricSummary]] = {}
+    for (metric, group), sketch in sorted(sketches.items()):
+        nested.setdefault(metric, {})[group] = _summarize(sketch)
+    return nested
@@ -0,0 +1,176 @@
+"""
+Page Transition Graph
+
+Visit counts and repeated page hashes catch a crawler stuck on
+one page, not one walking a cycle A -> B -> C -> A. The
+TransitionGraph records every move between page fingerprints as
+an edge labelled with the action taken (page hash, action ->
+next page hash) and detects cycles as they close.
+
+Cycle detection is incremental (Pearce-Kelly): the graph is kept
+acyclic with a topological order over its nodes. Adding an edge
+u -> v that already agrees with the order costs O(1); otherwise
+only nodes ordered between v and u are searched and reordered,
+so the cost depends on the affected region, not the graph size.
+An edge whose search reaches u closes a cycle: it is recorded as
+a cycle edge under (page, action) instead of being inserted.
+
+Cycle edges can be queried (closes_cycle) to deprioritize
+actions that lead back into an explored cycle; the loop guard
+stops once one has been taken more than `max_cycle_repeats`
+times.
+
+NO LangGraph logic
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+from crawlergraph.io.input_schema import CrawlConfig
+from crawlergraph.state import ActionDecision
+
+
+class TransitionGraph:
+    """
+    Args:
+        max_cycle_repeats: Times one (page, action) may close a
+            cycle before the loop guard stops (None: record only)
+    """
+
+    __slots__ = (
+        "max_cycle_repeats",
+        "_ids",
+        "_order",
+        "_out",
+        "_in",
+        "_edges",
+        "_back_edges",
+        "_cycle_edges",
+        "_pending",
+    )
+
+    def __init__(self, max_cycle_repeats: int | None = 2) -> None:
+        self.max_cycle_repeats = max_cycle_repeats
+
+        # Page fingerprint -> node id
+        self._ids: Dict[str, int] = {}
+        # Node id -> topological position
+        self._order: List[int] = []
+        self._out: List[List[int]] = []
+        self._in: List[List[int]] = []
+        # Inserted (acyclic) and cycle-closing edges, as u << 32 | v
+        self._edges: Set[int] = set()
+        self._back_edges: Set[int] = set()
+        # (node id, action) -> times it closed a cycle
+        self._cycle_edges: Dict[Tuple[int, str], int] = {}
+        # Last page and the action taken from it
+        self._pending: Optional[Tuple[str, str]] = None
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edges) + len(self._back_edges)
+
+    def add(self, source: str, action: str, target: str) -> int:
+        """
+        Record one transition; returns how many times (source,
+        action) has now closed a cycle (0 if this one did not).
+        """
+        u, v = self._node(source), self._node(target)
+        key = (u << 32) | v
+        if key in self._edges:
+            return 0
+        if u == v or key in self._back_edges or not self._insert(u, v):
+            self._back_edges.add(key)
+            count = self._cycle_edges.get((u, action), 0) + 1
+            self._cycle_edges[(u, action)] = count
+            return count
+        self._edges.add(key)
+        return 0
+
+    def advance(self, page: str, action: str | None) -> int:
+        """
+        Arrive at `page` by the previously taken action, then take
+        `action` (None: nothing further is taken from `page`).
+        Returns the cycle count of the arriving transition.
+        """
+        count = 0
+        if self._pending is not None:
+            count = self.add(*self._pending, page)
+        self._pending = (page, action) if action is not None else None
+        return count
+
+    @property
+    def pending_page(self) -> str | None:
+        """
+        Page the last taken action was taken from, if any.
+        """
+        return self._pending[0] if self._pending is not None else None
+
+    def closes_cycle(self, page: str, action: str) -> bool:
+        """
+        True if taking `action` on `page` has closed a cycle before.
+        """
+        u = self._ids.get(page)
+        return u is not None and (u, action) in self._cycle_edges
+
+    # Internals
+    def _node(self, page: str) -> int:
+        node = self._ids.get(page)
+        if node is None:
+            node = self._ids[page] = len(self._order)
+            # A new node has no edges; last is a valid position
+            self._order.append(node)
+            self._out.append([])
+            self._in.append([])
+        return node
+
+    def _insert(self, u: int, v: int) -> bool:
+        """
+        Insert u -> v keeping the order topological; False (and
+        nothing inserted) if v reaches u.
+        """
+        order = self._order
+        lower, upper = order[v], order[u]
+        if lower < upper:
+            forward = self._reachable(v, self._out, lambda w: order[w] <= upper)
+            if u in forward:
+                return False
+            backward = self._reachable(u, self._in, lambda w: order[w] >= lower)
+            self._reorder(backward, forward)
+
+        self._out[u].append(v)
+        self._in[v].append(u)
+        return True
+
+    def _reachable(self, start: int, adjacency: List[List[int]], within) -> Set[int]:
+        seen = {start}
+        stack = [start]
+        while stack:
+            for w in adjacency[stack.pop()]:
+                if w not in seen and within(w):
+                    seen.add(w)
+                    stack.append(w)
+        return seen
+
+    def _reorder(self, backward: Set[int], forward: Set[int]) -> None:
+        # Reuse the affected positions: everything reaching u
+        # first, then everything v reaches, each in its old order
+        order = self._order
+        nodes = sorted(backward, key=order.__getitem__) + sorted(forward, key=order.__getitem__)
+        positions = sorted(order[node] for node in nodes)
+        for node, position in zip(nodes, positions):
+            order[node] = position
+
+# Public API
+def action_key(decision: ActionDecision | None) -> str | None:
+    """
+    Transition label of a decision ("CLICK:#more"), or None.
+    """
+    if decision is None:
+        return None
+    return f"{decision.action.value}:{decision.target or ''}"
+
+def new_transition_graph(config: CrawlConfig | None = None) -> TransitionGraph:
+    config = config or CrawlConfig()
+    return TransitionGraph(max_cycle_repeats=config.max_cycle_repeats)
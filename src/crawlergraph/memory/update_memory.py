@@ -1,11 +1,39 @@
-from crawlergraph.state import CrawlState
-from crawlergraph.memory.loop_guards import compute_page_hash
+from typing import Any, Dict
+from crawlergraph.loop_state import LoopState
+from crawlergraph.reducers import apply_updates
+from crawlergraph.memory.loop_guards import compute_page_hash, compute_skeleton_hash
+from crawlergraph.memory.near_duplicates import compute_simhash
+from crawlergraph.memory.url_templates import TemplateMiner
+from crawlergraph.utils.urls import canonicalize_url
 
-def update_memory(state: CrawlState) -> CrawlState:
-    state.visited_pages.add(state.current_url)
+def memory_updates(state: LoopState, dom: str | None = None) -> Dict[str, Any]:
+    """
+    Partial update recording a visit to the current page, keyed
+    by its canonical URL; with `dom`, the page's fingerprints are
+    recorded as well.
+    """
+    url = canonicalize_url(state.current_url)
+    updates: Dict[str, Any] = {
+        "normalized_url": url,
+        "visited_pages": {url},
+        "url_visit_counts": {url: 1},
+    }
+    if dom is not None:
+        updates["page_hash"] = compute_page_hash(dom)
+        updates["skeleton_hash"] = compute_skeleton_hash(dom)
+        updates["page_simhash"] = compute_simhash(dom)
+    return updates
 
-    state.url_visit_counts[state.current_url] = (
-        state.url_visit_counts.get(state.current_url, 0) + 1
-    )
-
-    return state
+def update_memory(
+    state: LoopState,
+    dom: str | None = None,
+    templates: TemplateMiner | None = None,
+) -> LoopState:
+    """
+    Record a visit in place (outside the graph), and in
+    `templates` when given.
+    """
+    updates = memory_updates(state, dom)
+    if templates is not None:
+        templates.observe(updates["normalized_url"])
+    return apply_updates(state, updates)
@@ -0,0 +1,232 @@
+"""
+URL Template Mining
+
+url_template only recognizes identifier-shaped segments, so
+/orders/1 .. /orders/90000 share a template but /products/red-shoe
+and /products/blue-hat do not. TemplateMiner learns the rest from
+the crawl itself.
+
+Per host, canonical URL paths are stored in a trie of segments:
+
+    id-like segments       always the "{id}" child
+    other segments         literal children, until a node has
+                           more than `max_fanout` of them; they
+                           are then merged into one "{*}" child
+                           (subtrees and visit counts included)
+                           and later unknown segments go there
+
+The host root is the exception: its children are the site's
+sections (/orders, /users), which must not share a template or a
+visit budget. Only childless top-level pages (/about, /alice)
+are merged there; a top-level segment with subpaths always keeps
+its own child.
+
+A page's template is its path through the trie plus its sorted
+query parameter names:
+
+    a.com/orders/{id}
+    a.com/products/{*}?color
+
+Each trie node counts visits per query signature, so the loop
+guard can cap visits per template. Fan-out is bounded per node
+below the root, so the trie grows with the site's structure,
+not its page count.
+
+NO LangGraph logic
+"""
+
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from crawlergraph.io.input_schema import CrawlConfig
+from crawlergraph.utils.urls import is_id_segment
+
+ID_LABEL = "{id}"
+WILDCARD_LABEL = "{*}"
+
+
+class _Node:
+    __slots__ = ("children", "visits")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        # Query signature ("?a&b" or "") -> visits
+        self.visits: Dict[str, int] = {}
+
+
+class TemplateMiner:
+    """
+    Online URL template learner with per-template visit counts.
+
+    Args:
+        max_fanout: Literal segments kept under one path before
+            they are generalized to "{*}"
+        max_visits: Visits per template before the loop guard
+            stops (None: count only)
+    """
+
+    __slots__ = ("max_fanout", "max_visits", "_roots")
+
+    def __init__(self, max_fanout: int = 16, max_visits: int | None = 100) -> None:
+        if max_fanout < 1:
+            raise ValueError("max_fanout must be >= 1")
+
+        self.max_fanout = max_fanout
+        self.max_visits = max_visits
+        # Host -> path trie
+        self._roots: Dict[str, _Node] = {}
+
+    def observe(self, url: str) -> Tuple[str, int]:
+        """
+        Learn from one visit to a canonical URL; returns its
+        template and the template's visits so far, including
+        this one.
+        """
+        host, segments, signature = _split(url)
+        root = node = self._roots.setdefault(host, _Node())
+        labels: List[str] = []
+
+        for segment in segments:
+            label = self._label(node, segment, learn=node is root)
+            child = node.children.get(label)
+            if child is None:
+                child = node.children[label] = _Node()
+                if node is not root and self._generalize(node):
+                    label = WILDCARD_LABEL
+                    child = node.children[label]
+            node = child
+            labels.append(label)
+
+        node.visits[signature] = node.visits.get(signature, 0) + 1
+        if self._generalize_pages(root) and len(labels) == 1 and labels[0] not in root.children:
+            labels[0] = WILDCARD_LABEL
+            node = root.children[WILDCARD_LABEL]
+        return _format(host, labels, signature), node.visits[signature]
+
+    def template(self, url: str) -> str:
+        """
+        Current template of a canonical URL (nothing is learned).
+        """
+        host, segments, signature = _split(url)
+        node = self._roots.get(host)
+        labels = []
+        for i, segment in enumerate(segments):
+            if node is None:
+                label = _default_label(segment)
+            else:
+                label = self._label(node, segment, learn=_is_section(i, segments))
+            labels.append(label)
+            node = node.children.get(label) if node is not None else None
+        return _format(host, labels, signature)
+
+    def visits(self, url: str) -> int:
+        """
+        Visits recorded for the template of a canonical URL.
+        """
+        host, segments, signature = _split(url)
+        node = self._roots.get(host)
+        for i, segment in enumerate(segments):
+            if node is None:
+                return 0
+            node = node.children.get(self._label(node, segment, learn=_is_section(i, segments)))
+        return node.visits.get(signature, 0) if node is not None else 0
+
+    def templates(self) -> Dict[str, int]:
+        """
+        Every learned template with its visits.
+        """
+        found: Dict[str, int] = {}
+        for host, root in self._roots.items():
+            stack = [(root, [])]
+            while stack:
+                node, labels = stack.pop()
+                for signature, count in node.visits.items():
+                    found[_format(host, labels, signature)] = count
+                for label, child in node.children.items():
+                    stack.append((child, labels + [label]))
+        return found
+
+    # Internals
+    def _label(self, node: _Node, segment: str, learn: bool = False) -> str:
+        """
+        Child label of `segment`; with `learn` (at the host root)
+        an unknown segment gets its own literal child.
+        """
+        label = _default_label(segment)
+        if label == ID_LABEL or label in node.children:
+            return label
+        if WILDCARD_LABEL in node.children and not learn:
+            return WILDCARD_LABEL
+        return label
+
+    def _generalize(self, node: _Node) -> bool:
+        """
+        Fold literal children into "{*}" when there are too many
+        (or a wildcard already exists). True if anything changed.
+        """
+        literals = [label for label in node.children if label not in (ID_LABEL, WILDCARD_LABEL)]
+        if not literals:
+            return False
+        if WILDCARD_LABEL not in node.children and len(literals) <= self.max_fanout:
+            return False
+
+        wildcard = node.children.setdefault(WILDCARD_LABEL, _Node())
+        for label in literals:
+            self._merge(wildcard, node.children.pop(label))
+        return True
+
+    def _generalize_pages(self, root: _Node) -> bool:
+        """
+        Fold a host root's childless literal pages into "{*}"
+        when there are too many (or a wildcard already exists).
+        True if anything changed.
+        """
+        pages = [
+            label for label, child in root.children.items()
+            if label not in (ID_LABEL, WILDCARD_LABEL) and not child.children
+        ]
+        if not pages:
+            return False
+        if WILDCARD_LABEL not in root.children and len(pages) <= self.max_fanout:
+            return False
+
+        wildcard = root.children.setdefault(WILDCARD_LABEL, _Node())
+        for label in pages:
+            self._merge(wildcard, root.children.pop(label))
+        return True
+
+    def _merge(self, into: _Node, other: _Node) -> None:
+        for signature, count in other.visits.items():
+            into.visits[signature] = into.visits.get(signature, 0) + count
+        for label, child in other.children.items():
+            existing = into.children.get(label)
+            if existing is None:
+                into.children[label] = child
+            else:
+                self._merge(existing, child)
+        self._generalize(into)
+
+# Public API
+def new_template_miner(config: CrawlConfig | None = None) -> TemplateMiner:
+    config = config or CrawlConfig()
+    return TemplateMiner(
+        max_fanout=config.template_max_fanout,
+        max_visits=config.max_visits_per_template,
+    )
+
+# Helpers
+def _split(url: str) -> Tuple[str, List[str], str]:
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split("/") if segment]
+    keys = sorted({key for key, _ in parse_qsl(parts.query, keep_blank_values=True)})
+    signature = "?" + "&".join(keys) if keys else ""
+    return parts.netloc.lower(), segments, signature
+
+def _is_section(i: int, segments: List[str]) -> bool:
+    # A top-level segment with subpaths never maps to the root's "{*}"
+    return i == 0 and len(segments) > 1
+
+def _default_label(segment: str) -> str:
+    return ID_LABEL if is_id_segment(segment) else segment.lower()
+
+def _format(host: str, labels: List[str], signature: str) -> str:
+    return host + "/" + "/".join(labels) + signature
@@ -0,0 +1,49 @@
+"""
+Visit Index Backends
+
+Crawl memory keeps visited URLs (visited_pages) and per-URL
+visit counts (url_visit_counts). The exact backend is a set and
+a dict, ~150+ bytes per URL. The compact backend replaces them
+with a ScalableBloomFilter (~2 bytes per URL at 0.1% error) and
+a fixed-size CountMinSketch, for crawls of millions of URLs.
+
+Both expose the operations update_memory, the reducers and the
+loop guards use (add / in / len / |=, get / [key] / increment),
+so those behave the same up to the stated error:
+
+    visited check   false positive with probability <= the
+                    configured rate; never a false negative
+    len(visited)    may undercount by the same rate
+    visit count     never undercounts; overcounts by at most
+                    epsilon x total visits with probability
+                    1 - delta
+
+The compact structures cannot be enumerated, so they live on
+LoopState only; CrawlState keeps the exact backend.
+
+NO LangGraph logic
+"""
+
+from typing import Any, Tuple
+from crawlergraph.io.input_schema import CrawlConfig
+from crawlergraph.utils.sketches import CountMinSketch, ScalableBloomFilter
+
+# Public API
+def new_visit_index(config: CrawlConfig | None = None) -> Tuple[Any, Any]:
+    """
+    Empty (visited_pages, url_visit_counts) for the configured
+    backend.
+    """
+    config = config or CrawlConfig()
+    if config.visit_index == "exact":
+        return set(), {}
+
+    visited = ScalableBloomFilter(
+        initial_capacity=config.visit_index_initial_capacity,
+        error_rate=config.visit_index_error_rate,
+    )
+    counts = CountMinSketch(
+        epsilon=config.visit_count_epsilon,
+        delta=config.visit_count_delta,
+    )
+    return visited, counts
@@ -3,34 +3,59 @@ LangGraph Node: analyze_defects
 
 Responsible for:
 - Running defect detection rules
-- Updating CrawlState.detected_defects
+- Returning the current page's detected_defects
 
 Contains NO classification logic.
 Contains NO scoring logic.
 Contains NO orchestration logic.
 """
 
-from crawlergraph.state import CrawlState
+from typing import Any, Dict, Optional
+from langchain_core.runnables import RunnableConfig
+from crawlergraph.loop_state import LoopState
+from crawlergraph.context import get_run_context
 from crawlergraph.defects.rules import detect_defects
+from crawlergraph.io.result_store import PageRecord
 
 
-def analyze_defects(state: CrawlState) -> CrawlState:
+def analyze_defects(state: LoopState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
     """
     LangGraph node for defect detection.
 
     Reads:
         - state.page_features
         - state.signals
+        - RunContext.performance (optional, via config)
+        - RunContext.defect_registry (optional, via config)
+
+    Updates:
+        - detected_defects
 
     Writes:
-        - state.detected_defects
+        - RunContext.performance (records this page)
+        - RunContext.defects (folds in this page's defects)
+        - RunContext.store (appends the page result, if set)
     """
+    context = get_run_context(config)
+    performance = context.performance if context is not None else None
+    registry = context.defect_registry if context is not None else None
 
     defects = detect_defects(
         features=state.page_features,
         signals=state.signals,
+        url=state.current_url,
+        performance=performance,
+        registry=registry,
     )
 
-    state.detected_defects = defects
+    if performance is not None:
+        performance.observe(state.page_type, state.current_url, state.signals)
+    if context is not None:
+        context.defects.observe(state.current_url, defects)
+
+    # Only this page's defects stay on the state; the run's
+    # history goes to the store
+    if context is not None and context.store is not None:
+        context.store.append(PageRecord.from_state(state, len(defects)), defects)
 
-    return state
+    return {"detected_defects": defects}
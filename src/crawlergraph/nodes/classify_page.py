@@ -2,32 +2,46 @@
 LangGraph Node: classify_page
 
 Thin wrapper that applies page-type classification rules
-to the current CrawlState and updates the state in-place.
+to the current state and returns the classification.
 """
 
-from crawlergraph.state import CrawlState
+from typing import Any, Dict, Optional
+from langchain_core.runnables import RunnableConfig
+from crawlergraph.loop_state import LoopState
+from crawlergraph.context import get_run_context
 from crawlergraph.classifiers.page_type import classify_page_type
+from crawlergraph.features.cache import cached_classify_page_type
 
 
-def classify_page(state: CrawlState) -> CrawlState:
+def classify_page(state: LoopState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
     """
     LangGraph node for page-type classification.
 
     Inputs (from state):
         - state.page_features
         - state.signals
+        - RunContext.tracer (optional, via config)
+        - RunContext.feature_cache (optional, via config; not
+          used while tracing)
 
-    Outputs (written to state):
-        - state.page_type
-        - state.page_confidence
+    Updates:
+        - page_type
+        - page_confidence
     """
 
-    page_type, confidence = classify_page_type(
-        features=state.page_features,
-        signals=state.signals
-    )
-
-    state.page_type = page_type
-    state.page_confidence = confidence
-
-    return state
+    context = get_run_context(config)
+    tracer = context.tracer if context is not None else None
+    cache = context.feature_cache if context is not None else None
+
+    if cache is not None and tracer is None and state.page_hash is not None:
+        page_type, confidence = cached_classify_page_type(
+            cache, state.page_hash, state.page_features, state.signals,
+        )
+    else:
+        page_type, confidence = classify_page_type(
+            features=state.page_features,
+            signals=state.signals,
+            tracer=tracer,
+        )
+
+    return {"page_type": page_type, "page_confidence": confidence}
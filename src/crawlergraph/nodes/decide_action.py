@@ -2,11 +2,58 @@
 LangGraph Node: decide_action
 """
 
-from crawlergraph.state import CrawlState
-from crawlergraph.actions.policies import decide_action
+from typing import Any, Dict, Optional
+from urllib.parse import urljoin
+from langchain_core.runnables import RunnableConfig
+from crawlergraph.actions.frontier import Frontier
+from crawlergraph.actions.policies import alternative_actions, decide_action, frontier_decision
+from crawlergraph.context import get_run_context
+from crawlergraph.loop_state import LoopState
+from crawlergraph.memory.loop_guards import page_fingerprint
+from crawlergraph.state import ActionDecision, ActionRecord, ActionType, PageType
 
 
-def decide_action_node(state: CrawlState) -> CrawlState:
+def decide_action_node(state: LoopState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+    """
+    Updates:
+        - next_action
+        - action_history (appends the decision)
+        - RunContext.frontier (optional, via config): the page's
+          links and alternative actions are queued, and non-STOP
+          decisions marked taken so the frontier never replays
+          them. A dead end (no deterministic action) takes the
+          best queued candidate instead of stopping.
+    """
     decision = decide_action(state)
-    state.next_action = decision
-    return state
+
+    context = get_run_context(config)
+    if context is not None and context.frontier is not None:
+        decision = _consult_frontier(context.frontier, state, decision)
+
+    return {
+        "next_action": decision,
+        "action_history": [ActionRecord(action=decision.action, target=decision.target)],
+    }
+
+# Helpers
+def _consult_frontier(frontier: Frontier, state: LoopState, decision: ActionDecision) -> ActionDecision:
+    url = state.normalized_url or state.current_url
+    source = page_fingerprint(state)
+
+    for link in state.outgoing_links:
+        frontier.push(urljoin(state.current_url, link), depth=state.depth + 1)
+    for alternative in alternative_actions(state):
+        frontier.push(url, alternative, depth=state.depth, source=source)
+
+    if decision.action != ActionType.STOP:
+        frontier.mark_taken(url, decision, source=source)
+        return decision
+    if state.page_type == PageType.ERROR:
+        return decision
+
+    # Dead end. The graph passes over an observation more than
+    # once; later passes keep the candidate the first one took.
+    if state.next_action is not None and state.next_action.action != ActionType.STOP:
+        return state.next_action
+    entry = frontier.pop()
+    return frontier_decision(entry) if entry is not None else decision
@@ -3,10 +3,10 @@ LangGraph Node: evaluate_stop
 Determines whether crawl should terminate.
 """
 
-from crawlergraph.state import CrawlState
+from crawlergraph.loop_state import LoopState
 
 
-def evaluate_stop_node(state: CrawlState) -> str:
+def evaluate_stop_node(state: LoopState) -> str:
     """
     Returns next edge key:
         - "stop"
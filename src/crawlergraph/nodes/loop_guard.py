@@ -1,31 +1,96 @@
-from crawlergraph.state import CrawlState
-from crawlergraph.memory.loop_guards import check_loop_conditions
+"""
+LangGraph Node: loop_guard
 
+Sets stop_reason when the crawl must end: page or depth budget
+spent, duplicate or near-duplicate content, a URL template's
+visit budget spent, a cycle of page transitions repeated, or a
+STOP decision from decide_action.
+"""
 
-from crawlergraph.state import CrawlState
+from typing import Any, Dict, Optional
+from langchain_core.runnables import RunnableConfig
+from crawlergraph.actions.models import ActionType
+from crawlergraph.context import get_run_context
+from crawlergraph.loop_state import LoopState
+from crawlergraph.memory.loop_guards import page_fingerprint
+from crawlergraph.memory.transitions import action_key
+from crawlergraph.state import PageType, StopReason
 
 
-def loop_guard_node(state: CrawlState) -> CrawlState:
+def loop_guard_node(state: LoopState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
     """
     Stop if loop conditions triggered.
+
+    Updates:
+        - stop_reason (only when stopping)
+        - loop_counters (increments the current page fingerprint,
+          see state.loop_fingerprint)
+        - RunContext.near_duplicates (optional, via config)
+        - RunContext.transitions (optional, via config): advanced
+          once per arrival at a new page
+
+    Reads:
+        - RunContext.templates (optional, via config)
     """
+    updates: Dict[str, Any] = {}
+    stop_reason = None
+    fingerprint = page_fingerprint(state)
 
     # Max pages
     if len(state.visited_pages) >= state.max_pages:
-        state.stop_reason = "Max pages limit reached"
+        stop_reason = StopReason.MAX_PAGES_REACHED
 
     # Max depth
     if state.depth > state.max_depth:
-        state.stop_reason = "Max depth exceeded"
+        stop_reason = StopReason.MAX_DEPTH_REACHED
 
     # Duplicate content
-    if state.page_hash in state.loop_counters:
-        state.stop_reason = "Duplicate page content detected"
+    if fingerprint in state.loop_counters:
+        stop_reason = StopReason.LOOP_DETECTED
+
+    # Near-duplicate content: too many structurally similar pages
+    context = get_run_context(config)
+    index = context.near_duplicates if context is not None else None
+    if index is not None and state.page_simhash is not None:
+        if index.observe(state.page_simhash) > index.max_cluster_pages:
+            stop_reason = StopReason.LOOP_DETECTED
+
+    # Template budget: enough pages of this shape visited
+    templates = context.templates if context is not None else None
+    if (
+        stop_reason is None
+        and templates is not None
+        and templates.max_visits is not None
+        and state.normalized_url is not None
+        and templates.visits(state.normalized_url) > templates.max_visits
+    ):
+        stop_reason = StopReason.TEMPLATE_BUDGET_REACHED
+
+    # Cycle: arriving here repeats a loop of page transitions. The
+    # graph passes over an observation more than once; only a page
+    # other than the one the last action was taken from is an arrival
+    transitions = context.transitions if context is not None else None
+    if transitions is not None and fingerprint and fingerprint != transitions.pending_page:
+        repeats = transitions.advance(fingerprint, action_key(state.next_action))
+        if transitions.max_cycle_repeats is not None and repeats > transitions.max_cycle_repeats:
+            stop_reason = StopReason.LOOP_DETECTED
 
     # Update loop counter
-    if state.page_hash:
-        state.loop_counters[state.page_hash] = (
-            state.loop_counters.get(state.page_hash, 0) + 1
+    if fingerprint:
+        updates["loop_counters"] = {fingerprint: 1}
+
+    # Policy gave up on this page
+    if (
+        stop_reason is None
+        and state.next_action is not None
+        and state.next_action.action == ActionType.STOP
+    ):
+        stop_reason = (
+            StopReason.TERMINAL_ERROR
+            if state.page_type == PageType.ERROR
+            else StopReason.NO_VALID_ACTIONS
         )
 
-    return state
+    if stop_reason is not None:
+        updates["stop_reason"] = stop_reason
+    return updates
@@ -0,0 +1,23 @@
+"""
+LangGraph Node: update_memory
+
+Records the current page in crawl memory (see
+memory.update_memory.memory_updates). URL templates are counted
+once per observation by LoopState.from_input, not here: the
+graph passes over one observation more than once.
+"""
+
+from typing import Any, Dict, Optional
+from langchain_core.runnables import RunnableConfig
+from crawlergraph.loop_state import LoopState
+from crawlergraph.memory.update_memory import memory_updates
+
+
+def update_memory_node(state: LoopState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+    """
+    Updates:
+        - normalized_url (canonical current URL)
+        - visited_pages (adds the canonical URL)
+        - url_visit_counts (increments the canonical URL)
+    """
+    return memory_updates(state)
@@ -0,0 +1,62 @@
+"""
+State Reducers
+
+Merge functions for the collection fields of the crawl state
+(declared with Annotated on CrawlState and LoopState). Nodes
+return only the delta; the reducer returns a new container with
+the delta folded in and never changes its inputs, so the values
+LangGraph streams or checkpoints for earlier steps stay as they
+were. The copy is a C-level container copy; no node rebuilds a
+collection.
+
+An empty channel adopts an incoming compact backend (see
+memory.visit_index) instead of copying it into a set or dict.
+
+NO LangGraph logic
+"""
+
+from typing import Any, Callable, Dict, List, Set
+
+# Public API
+def append_records(current: List, new: List) -> List:
+    return current + new
+
+def add_members(current: Set, new: Set) -> Set:
+    if not current and not isinstance(new, (set, frozenset)):
+        return new
+    merged = current.copy()
+    merged |= new
+    return merged
+
+def add_counts(current: Dict[str, int], new: Dict[str, int]) -> Dict[str, int]:
+    if not current and not isinstance(new, dict):
+        return new
+
+    merged = current.copy()
+    increment = getattr(merged, "increment", None)
+    for key, count in new.items():
+        if increment is not None:
+            increment(key, count)
+        else:
+            merged[key] = merged.get(key, 0) + count
+    return merged
+
+# Field -> reducer, for state fields that are not replaced on update
+REDUCERS: Dict[str, Callable[[Any, Any], Any]] = {
+    "visited_pages": add_members,
+    "url_visit_counts": add_counts,
+    "action_history": append_records,
+    "loop_counters": add_counts,
+}
+
+def apply_updates(state: Any, updates: Dict[str, Any]) -> Any:
+    """
+    Apply a node's partial update to a LoopState or CrawlState,
+    with the graph's reducer semantics.
+    """
+    for name, value in updates.items():
+        reducer = REDUCERS.get(name)
+        if reducer is not None:
+            value = reducer(getattr(state, name), value)
+        setattr(state, name, value)
+    return state
@@ -1,7 +1,12 @@
 from enum import Enum
-from typing import List, Dict, Optional, Set
-from pydantic import BaseModel, Field
+from typing import Annotated, List, Dict, Literal, Optional, Set
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
+from crawlergraph.reducers import add_counts, add_members, append_records
+
+# Which page fingerprint loop detection keys on:
+# "content" (page_hash) or "skeleton" (skeleton_hash)
+PageFingerprint = Literal["content", "skeleton"]
 
 # Enums
 class PageType(str, Enum):
@@ -30,6 +35,7 @@ class StopReason(str, Enum):
     LOOP_DETECTED = "LOOP_DETECTED"
     NO_VALID_ACTIONS = "NO_VALID_ACTIONS"
     TERMINAL_ERROR = "TERMINAL_ERROR"
+    TEMPLATE_BUDGET_REACHED = "TEMPLATE_BUDGET_REACHED"
     SUCCESS = "SUCCESS"
 
 class ActionType(str, Enum):
@@ -38,6 +44,8 @@ class ActionType(str, Enum):
     SUBMIT = "SUBMIT"
     PAGINATE = "PAGINATE"
     WAIT = "WAIT"
+    # Go to `target` (a URL queued in the frontier)
+    NAVIGATE = "NAVIGATE"
     STOP = "STOP"
 
 # Feature Models
@@ -63,16 +71,43 @@ class RuntimeSignals(BaseModel):
     status_code: int = 200
     redirect_detected: bool = False
 
+    # Message lists may be truncated (see RuntimeSignalCollector)
+    # or left empty when messages are interned, in which case the
+    # *_fingerprints maps (fingerprint -> occurrences) hold them;
+    # the counts are always exact
     console_errors: List[str] = Field(default_factory=list)
     console_warnings: List[str] = Field(default_factory=list)
+    console_error_fingerprints: Dict[str, int] = Field(default_factory=dict)
+    console_warning_fingerprints: Dict[str, int] = Field(default_factory=dict)
+    console_error_count: int = 0
+    console_warning_count: int = 0
 
     network_errors: List[str] = Field(default_factory=list)
+    network_error_fingerprints: Dict[str, int] = Field(default_factory=dict)
+    network_error_count: int = 0
     failed_requests: int = 0
 
     layout_overlaps: bool = False
     long_tasks_ms: Optional[int] = None
     page_load_time_ms: Optional[int] = None
 
+    @model_validator(mode="after")
+    def _counts_cover_messages(self) -> "RuntimeSignals":
+        # Counts default to the number of listed or interned messages
+        self.console_error_count = max(
+            self.console_error_count,
+            len(self.console_errors) + sum(self.console_error_fingerprints.values()),
+        )
+        self.console_warning_count = max(
+            self.console_warning_count,
+            len(self.console_warnings) + sum(self.console_warning_fingerprints.values()),
+        )
+        self.network_error_count = max(
+            self.network_error_count,
+            len(self.network_errors) + sum(self.network_error_fingerprints.values()),
+        )
+        return self
+
 # Defects
 class Defect(BaseModel):
     category: DefectCategory
@@ -92,6 +127,9 @@ class ActionDecision(BaseModel):
     action: ActionType
     target: Optional[str] = None
     value: Optional[str] = None
+    # Page to act on when it is not the current one (actions
+    # taken from the frontier)
+    url: Optional[str] = None
 
     rationale: str
     confidence: float = Field(ge=0.0, le=1.0)
@@ -116,10 +154,18 @@ class CrawlState(BaseModel):
     current_url: str
     previous_url: Optional[str] = None
     depth: int = 0
+    # Links on the page (ObservationPayload.links)
+    outgoing_links: List[str] = Field(default_factory=list)
 
     # Page fingerprinting
     page_hash: Optional[str] = None
+    # Tag/attribute-name skeleton hash (see features.skeleton)
+    skeleton_hash: Optional[str] = None
+    # Structural SimHash (see memory.near_duplicates)
+    page_simhash: Optional[int] = None
     normalized_url: Optional[str] = None
+    # Fingerprint loop detection keys on
+    loop_fingerprint: PageFingerprint = "content"
 
     # Page understanding
     page_type: PageType = PageType.UNKNOWN
@@ -130,12 +176,13 @@ class CrawlState(BaseModel):
     signals: RuntimeSignals = Field(default_factory=RuntimeSignals)
 
     # Crawl memory
-    visited_pages: Set[str] = Field(default_factory=set)
-    url_visit_counts: Dict[str, int] = Field(default_factory=dict)
-    action_history: List[ActionRecord] = Field(default_factory=list)
+    # Annotated reducers merge node deltas (see reducers)
+    visited_pages: Annotated[Set[str], add_members] = Field(default_factory=set)
+    url_visit_counts: Annotated[Dict[str, int], add_counts] = Field(default_factory=dict)
+    action_history: Annotated[List[ActionRecord], append_records] = Field(default_factory=list)
 
     # Loop detection
-    loop_counters: Dict[str, int] = Field(default_factory=dict)
+    loop_counters: Annotated[Dict[str, int], add_counts] = Field(default_factory=dict)
 
     # Defects
     detected_defects: List[Defect] = Field(default_factory=list)
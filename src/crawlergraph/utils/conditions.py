@@ -0,0 +1,200 @@
+"""
+Declarative Rule Conditions
+
+A Condition tests one field of the rule inputs, e.g.
+("signals.status_code", ">=", 500). Rule specs list conditions
+that must all hold; compilers render them to Python expressions
+(see FunctionBuilder) so specs stay readable while evaluation
+stays fast. Conditions can also be evaluated over NumPy columns
+for batch evaluation.
+
+Fields are dotted paths "<input>.<attribute>", where <input>
+names an argument of the compiled function (features, signals).
+
+NO LangGraph logic
+"""
+
+import operator
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+from pydantic import BaseModel, model_validator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Binary comparison operators
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+# Operators that take no value
+_UNARY = frozenset({"true", "false"})
+
+# Any of `value` is a member of the field
+_CONTAINS_ANY = "contains_any"
+
+OPERATORS = frozenset(_COMPARISONS) | _UNARY | {_CONTAINS_ANY}
+
+
+class Condition(BaseModel):
+    """
+    One test of a rule input field.
+
+    Accepts a (field, op) or (field, op, value) tuple in place
+    of keyword arguments.
+    """
+    field: str
+    op: str
+    value: Any = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_tuple(cls, data: Any) -> Any:
+        if isinstance(data, (tuple, list)):
+            return dict(zip(("field", "op", "value"), data))
+        return data
+
+    @model_validator(mode="after")
+    def _check(self) -> "Condition":
+        if self.op not in OPERATORS:
+            raise ValueError(f"Unknown operator {self.op!r}; expected one of {sorted(OPERATORS)}")
+        if len(self.path) != 2:
+            raise ValueError(f"Field {self.field!r} must look like '<input>.<attribute>'")
+        if self.op == _CONTAINS_ANY:
+            self.value = frozenset(self.value)
+        return self
+
+    @property
+    def path(self) -> Tuple[str, ...]:
+        return tuple(self.field.split("."))
+
+    @property
+    def local_name(self) -> str:
+        """
+        Variable name compilers bind the field value to.
+        """
+        return "_".join(self.path)
+
+    def test(self, value: Any) -> bool:
+        """
+        Evaluate against an already-read field value.
+        """
+        if self.op == "true":
+            return bool(value)
+        if self.op == "false":
+            return not value
+        if self.op == _CONTAINS_ANY:
+            return not self.value.isdisjoint(value)
+        return _COMPARISONS[self.op](value, self.value)
+
+    def evaluate(self, inputs: Dict[str, Any]) -> bool:
+        """
+        Evaluate against named rule inputs, e.g. {"features": ...}.
+        """
+        source, attribute = self.path
+        return self.test(getattr(inputs[source], attribute))
+
+    def render(self, constant: Callable[[Any], str]) -> str:
+        """
+        Python expression for this condition over `local_name`.
+
+        `constant` registers a value in the compiled namespace
+        and returns the name to refer to it by.
+        """
+        name = self.local_name
+        if self.op == "true":
+            return name
+        if self.op == "false":
+            return f"not {name}"
+        if self.op == _CONTAINS_ANY:
+            return f"not {constant(self.value)}.isdisjoint({name})"
+        if isinstance(self.value, (bool, int, float, str)) or self.value is None:
+            return f"{name} {self.op} {self.value!r}"
+        return f"{name} {self.op} {constant(self.value)}"
+
+    def mask(self, values: "np.ndarray") -> "np.ndarray":
+        """
+        Evaluate over a column of field values.
+
+        Missing (None) values must be encoded as NaN in a float
+        column; they count as false.
+        """
+        if self.op in _UNARY:
+            truthy = values != 0 if values.dtype.kind != "b" else values
+            if values.dtype.kind == "f":
+                truthy = truthy & ~np.isnan(values)
+            return truthy if self.op == "true" else ~truthy
+        if self.op == _CONTAINS_ANY:
+            raise ValueError(f"{self.op!r} conditions cannot be evaluated over columns")
+        return _COMPARISONS[self.op](values, self.value)
+
+
+class FunctionBuilder:
+    """
+    Generates a straight-line Python function over rule inputs.
+
+    Field loads are emitted once, before the first condition
+    that needs them, so later rules reuse the local.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        inputs: Sequence[str],
+        extra_params: Sequence[str] = (),
+    ) -> None:
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.namespace: Dict[str, Any] = {}
+        self.lines = [f"def {name}({', '.join([*inputs, *extra_params])}):"]
+        self._loaded: set = set()
+
+    def constant(self, value: Any, name: str | None = None) -> str:
+        """
+        Bind `value` in the function's globals; returns its name.
+        """
+        key = name or f"_C{len(self.namespace)}"
+        self.namespace[key] = value
+        return key
+
+    def line(self, text: str, indent: int = 1) -> None:
+        self.lines.append("    " * indent + text)
+
+    def load(self, conditions: Iterable[Condition], rule: str) -> None:
+        """
+        Emit loads for fields not read yet.
+
+        Raises:
+            ValueError: if a condition reads an unknown input
+        """
+        for condition in conditions:
+            source, attribute = condition.path
+            if source not in self.inputs:
+                raise ValueError(
+                    f"Rule {rule!r} reads {condition.field!r}; "
+                    f"inputs are {list(self.inputs)}"
+                )
+            if condition.local_name not in self._loaded:
+                self._loaded.add(condition.local_name)
+                self.line(f"{condition.local_name} = {source}.{attribute}")
+
+    def tests(self, conditions: Iterable[Condition]) -> List[str]:
+        return [f"({c.render(self.constant)})" for c in conditions]
+
+    def build(self) -> Callable[..., Any]:
+        """
+        Compile; the source is kept as `__source__`.
+        """
+        source = "\n".join(self.lines) + "\n"
+        code = compile(source, f"<compiled {self.name}>", "exec")
+        exec(code, self.namespace)
+
+        function = self.namespace[self.name]
+        function.__source__ = source
+        return function
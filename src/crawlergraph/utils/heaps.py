@@ -0,0 +1,136 @@
+"""
+Indexed Priority Heap
+
+A binary max-heap that also maps each key to its slot, so a
+key's priority can be changed or removed in O(log n) instead of
+rebuilding the heap. top(n) walks only the part of the heap it
+returns (O(n log n) in n, not in the heap size), which keeps
+"current top N" queries cheap while priorities keep changing.
+
+NO LangGraph logic
+"""
+
+import heapq
+from typing import Dict, Generic, Hashable, List, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class IndexedHeap(Generic[K]):
+    """
+    Max-heap of unique keys. Equal priorities rank in insertion
+    order.
+    """
+
+    __slots__ = ("_entries", "_slots", "_seq")
+
+    def __init__(self) -> None:
+        # [priority, -seq, key]; a larger tuple ranks higher
+        self._entries: List[list] = []
+        self._slots: Dict[K, int] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._slots
+
+    def push(self, key: K, priority: float) -> None:
+        """
+        Insert `key`, or change its priority.
+        """
+        slot = self._slots.get(key)
+        if slot is None:
+            self._seq += 1
+            self._entries.append([priority, -self._seq, key])
+            self._slots[key] = len(self._entries) - 1
+            self._sift_up(len(self._entries) - 1)
+            return
+
+        entry = self._entries[slot]
+        old = entry[0]
+        entry[0] = priority
+        if priority > old:
+            self._sift_up(slot)
+        elif priority < old:
+            self._sift_down(slot)
+
+    def priority(self, key: K) -> float | None:
+        slot = self._slots.get(key)
+        return self._entries[slot][0] if slot is not None else None
+
+    def remove(self, key: K) -> None:
+        slot = self._slots.pop(key)
+        last = self._entries.pop()
+        if slot == len(self._entries):
+            return
+
+        self._entries[slot] = last
+        self._slots[last[2]] = slot
+        self._sift_up(slot)
+        self._sift_down(self._slots[last[2]])
+
+    def peek(self) -> Tuple[K, float] | None:
+        if not self._entries:
+            return None
+        priority, _, key = self._entries[0]
+        return key, priority
+
+    def top(self, n: int) -> List[Tuple[K, float]]:
+        """
+        The n highest-priority (key, priority) pairs, best first.
+        """
+        entries = self._entries
+        found: List[Tuple[K, float]] = []
+        if not entries or n <= 0:
+            return found
+
+        # Frontier of candidate slots, ordered by their entries
+        frontier = [(_inverted(entries[0]), 0)]
+        while frontier and len(found) < n:
+            _, slot = heapq.heappop(frontier)
+            priority, _, key = entries[slot]
+            found.append((key, priority))
+            for child in (2 * slot + 1, 2 * slot + 2):
+                if child < len(entries):
+                    heapq.heappush(frontier, (_inverted(entries[child]), child))
+        return found
+
+    # Internals
+    def _sift_up(self, slot: int) -> None:
+        entries, slots = self._entries, self._slots
+        entry = entries[slot]
+        while slot:
+            parent = (slot - 1) >> 1
+            if entries[parent][:2] >= entry[:2]:
+                break
+            entries[slot] = entries[parent]
+            slots[entries[slot][2]] = slot
+            slot = parent
+        entries[slot] = entry
+        slots[entry[2]] = slot
+
+    def _sift_down(self, slot: int) -> None:
+        entries, slots = self._entries, self._slots
+        size = len(entries)
+        entry = entries[slot]
+        while True:
+            child = 2 * slot + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and entries[right][:2] > entries[child][:2]:
+                child = right
+            if entries[child][:2] <= entry[:2]:
+                break
+            entries[slot] = entries[child]
+            slots[entries[slot][2]] = slot
+            slot = child
+        entries[slot] = entry
+        slots[entry[2]] = slot
+
+# Helpers
+def _inverted(entry: list) -> Tuple[float, int]:
+    # heapq is a min-heap; rank by (-priority, seq)
+    return (-entry[0], -entry[1])
@@ -0,0 +1,395 @@
+"""
+Streaming Sketches
+
+Fixed-memory summaries of unbounded streams.
+
+    QuantileSketch  log-bucketed histogram (DDSketch-style) with a
+                    relative-error guarantee on every quantile
+    DistinctCounter HyperLogLog estimate of the number of distinct
+                    strings seen
+    ScalableBloomFilter
+                    set membership with a false-positive bound that
+                    holds as the set grows
+    CountMinSketch  per-key counts that never undercount
+
+NO LangGraph logic
+"""
+
+import hashlib
+import math
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+
+class QuantileSketch:
+    """
+    Quantiles of positive values within `relative_accuracy`.
+
+    Values are counted in logarithmic buckets of ratio
+    gamma = (1 + a) / (1 - a); a bucket's midpoint is within a
+    of every value in it. Values are clamped to
+    [min_value, max_value], which bounds the bucket count:
+    ~750 buckets for 1 ms .. 1 h at 1% accuracy.
+    """
+
+    __slots__ = (
+        "relative_accuracy",
+        "min_value",
+        "max_value",
+        "count",
+        "total",
+        "_gamma",
+        "_log_gamma",
+        "_buckets",
+        "_zeros",
+    )
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        min_value: float = 1.0,
+        max_value: float = 3_600_000.0,
+    ) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        self.count = 0
+        self.total = 0.0
+
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+        # Values <= 0 are counted separately
+        self._zeros = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def max_buckets(self) -> int:
+        return self._index(self.max_value) - self._index(self.min_value) + 1
+
+    def add(self, value: float, weight: int = 1) -> None:
+        self.count += weight
+        self.total += value * weight
+
+        if value <= 0:
+            self._zeros += weight
+            return
+
+        index = self._index(min(max(value, self.min_value), self.max_value))
+        self._buckets[index] = self._buckets.get(index, 0) + weight
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other._gamma != self._gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+
+        self.count += other.count
+        self.total += other.total
+        self._zeros += other._zeros
+        for index, weight in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + weight
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Value at quantile q (0..1), or None if empty.
+        """
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self._zeros
+        if rank < seen:
+            return 0.0
+
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                return self._value(index)
+        return self._value(max(self._buckets))
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    # Helpers
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+
+class DistinctCounter:
+    """
+    HyperLogLog distinct count in 2**precision bytes.
+
+    Standard error is about 1.04 / sqrt(2**precision): ~3% at
+    the default precision of 10 (1 KiB). Small counts use linear
+    counting and are near exact. add() reports whether the
+    estimate may have changed; the estimate is cached until then.
+    """
+
+    __slots__ = ("precision", "_registers", "_estimate")
+
+    def __init__(self, precision: int = 10) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be in [4, 16]")
+
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+        self._estimate: float | None = 0.0
+
+    def __len__(self) -> int:
+        return round(self.estimate())
+
+    def add(self, item: str) -> bool:
+        h = int.from_bytes(
+            hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        # Position of the first set bit in the remaining bits
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+            self._estimate = None
+            return True
+        return False
+
+    def merge(self, other: "DistinctCounter") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge counters with different precision")
+
+        registers = self._registers
+        for index, rank in enumerate(other._registers):
+            if rank > registers[index]:
+                registers[index] = rank
+        self._estimate = None
+
+    def estimate(self) -> float:
+        if self._estimate is None:
+            self._estimate = self._compute()
+        return self._estimate
+
+    # Helpers
+    def _compute(self) -> float:
+        m = len(self._registers)
+        zeros = self._registers.count(0)
+        if zeros == m:
+            return 0.0
+
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        raw = alpha * m * m / sum(2.0 ** -rank for rank in self._registers)
+
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return raw
+
+
+class ScalableBloomFilter:
+    """
+    Growing Bloom filter (Almeida et al.): when a slice reaches
+    its capacity a larger one with a tighter error is added, so
+    the overall false-positive rate stays below `error_rate`
+    however many items arrive. Never reports a false negative.
+
+    Supports the set operations crawl memory uses: add, in,
+    len (items added that were not already present, which
+    undercounts by at most the false-positive rate), |= with
+    an iterable and copy.
+    """
+
+    __slots__ = ("error_rate", "initial_capacity", "growth", "tightening", "_slices", "_count")
+
+    def __init__(
+        self,
+        initial_capacity: int = 100_000,
+        error_rate: float = 0.001,
+        growth: int = 2,
+        tightening: float = 0.5,
+    ) -> None:
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be in (0, 1)")
+
+        self.error_rate = error_rate
+        self.initial_capacity = initial_capacity
+        self.growth = growth
+        self.tightening = tightening
+        # Slice errors p0 * r**i sum to at most error_rate
+        self._slices: List[_BloomSlice] = []
+        self._count = 0
+        self._grow()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, item: str) -> bool:
+        h1, h2 = _hash_pair(item)
+        return any(s.contains(h1, h2) for s in self._slices)
+
+    def __ior__(self, items: Iterable[str]) -> "ScalableBloomFilter":
+        self.update(items)
+        return self
+
+    def add(self, item: str) -> bool:
+        """
+        Add `item`; returns False if it was (probably) present.
+        """
+        h1, h2 = _hash_pair(item)
+        if any(s.contains(h1, h2) for s in self._slices):
+            return False
+
+        current = self._slices[-1]
+        if current.count >= current.capacity:
+            current = self._grow()
+        current.add(h1, h2)
+        self._count += 1
+        return True
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def copy(self) -> "ScalableBloomFilter":
+        """
+        Independent filter with the same contents.
+        """
+        clone = ScalableBloomFilter.__new__(ScalableBloomFilter)
+        clone.error_rate = self.error_rate
+        clone.initial_capacity = self.initial_capacity
+        clone.growth = self.growth
+        clone.tightening = self.tightening
+        clone._slices = [s.copy() for s in self._slices]
+        clone._count = self._count
+        return clone
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(s.bits) for s in self._slices)
+
+    # Helpers
+    def _grow(self) -> "_BloomSlice":
+        i = len(self._slices)
+        capacity = self.initial_capacity * self.growth ** i
+        error = self.error_rate * (1 - self.tightening) * self.tightening ** i
+        bloom = _BloomSlice(capacity, error)
+        self._slices.append(bloom)
+        return bloom
+
+
+class _BloomSlice:
+    __slots__ = ("capacity", "count", "size", "hashes", "bits")
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.count = 0
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def copy(self) -> "_BloomSlice":
+        clone = _BloomSlice.__new__(_BloomSlice)
+        clone.capacity = self.capacity
+        clone.count = self.count
+        clone.size = self.size
+        clone.hashes = self.hashes
+        clone.bits = bytearray(self.bits)
+        return clone
+
+    def add(self, h1: int, h2: int) -> None:
+        bits, size = self.bits, self.size
+        for i in range(self.hashes):
+            bit = (h1 + i * h2) % size
+            bits[bit >> 3] |= 1 << (bit & 7)
+        self.count += 1
+
+    def contains(self, h1: int, h2: int) -> bool:
+        bits, size = self.bits, self.size
+        for i in range(self.hashes):
+            bit = (h1 + i * h2) % size
+            if not bits[bit >> 3] & (1 << (bit & 7)):
+                return False
+        return True
+
+
+class CountMinSketch:
+    """
+    Approximate per-key counts in fixed memory.
+
+    Estimates never undercount; with probability 1 - delta they
+    overcount by at most epsilon x the total of all counts
+    (width = ceil(e / epsilon), depth = ceil(ln(1 / delta))).
+    Conservative updates make the typical error much smaller.
+
+    Supports the dict operations crawl memory uses: get,
+    [key], increment and copy.
+    """
+
+    __slots__ = ("width", "depth", "total", "_table")
+
+    def __init__(self, epsilon: float = 1e-5, delta: float = 0.01) -> None:
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be in (0, 1)")
+
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.total = 0
+        self._table = array("I", bytes(4 * self.width * self.depth))
+
+    def __getitem__(self, key: str) -> int:
+        return self.get(key)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) > 0
+
+    def get(self, key: str, default: int = 0) -> int:
+        estimate = min(self._table[slot] for slot in self._slots(key))
+        return estimate or default
+
+    def increment(self, key: str, count: int = 1) -> int:
+        """
+        Add `count` to `key`; returns the new estimate.
+        """
+        table = self._table
+        slots = self._slots(key)
+        # Conservative update: raise only the counters below the
+        # new estimate
+        target = min(table[slot] for slot in slots) + count
+        for slot in slots:
+            if table[slot] < target:
+                table[slot] = target
+        self.total += count
+        return target
+
+    def copy(self) -> "CountMinSketch":
+        """
+        Independent sketch with the same counts.
+        """
+        clone = CountMinSketch.__new__(CountMinSketch)
+        clone.width = self.width
+        clone.depth = self.depth
+        clone.total = self.total
+        clone._table = array("I", self._table)
+        return clone
+
+    @property
+    def nbytes(self) -> int:
+        return self._table.itemsize * len(self._table)
+
+    # Helpers
+    def _slots(self, key: str) -> List[int]:
+        h1, h2 = _hash_pair(key)
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+# Helpers
+def _hash_pair(item: str) -> Tuple[int, int]:
+    """
+    Two 64-bit hashes for double hashing (Kirsch-Mitzenmacher).
+    """
+    digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
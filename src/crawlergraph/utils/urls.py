@@ -0,0 +1,103 @@
+"""
+URL Helpers
+
+NO LangGraph logic
+"""
+
+import re
+from typing import Collection
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Path segments that are record identifiers rather than routes
+_ID_SEGMENT = re.compile(
+    r"^(?:\d+"
+    r"|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+    r"|(?=[0-9a-z_-]*\d)[0-9a-z_-]{16,}"
+    r"|(?=[0-9a-f]*\d)[0-9a-f]{8,})$",
+    re.IGNORECASE,
+)
+
+# Query parameters that only attribute traffic
+TRACKING_PARAMS = frozenset({
+    "_ga", "_gl", "dclid", "fbclid", "gclid", "gclsrc", "igshid",
+    "mc_cid", "mc_eid", "msclkid", "ref_src", "yclid",
+})
+TRACKING_PARAM_PREFIXES = ("utm_",)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Public API
+def canonicalize_url(url: str, drop_params: Collection[str] = ()) -> str:
+    """
+    One spelling per page, for visit bookkeeping:
+
+        scheme and host     lowercased, default port removed
+        path                repeated slashes collapsed, trailing
+                            slash removed ("/" for the root)
+        query               tracking and `drop_params` parameters
+                            removed, the rest sorted by name
+                            (repeated names keep their order)
+        fragment            removed
+
+        HTTPS://A.com:443/users//42/?utm_source=x&b=2&a=1#top
+            ->  https://a.com/users/42?a=1&b=2
+
+    Path case is kept: servers may treat it as significant.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+
+    netloc = parts.netloc.lower()
+    if _port(parts) == _DEFAULT_PORTS.get(scheme):
+        netloc = netloc.rsplit(":", 1)[0]
+
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/") or "/"
+
+    dropped = {name.lower() for name in drop_params}
+    params = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(key.lower()) and key.lower() not in dropped
+    ]
+    params.sort(key=lambda pair: pair[0])
+
+    return urlunsplit((scheme, netloc, path, urlencode(params), ""))
+
+def is_id_segment(segment: str) -> bool:
+    """
+    True for path segments that look like record identifiers
+    (numbers, UUIDs, long hex or token strings).
+    """
+    return _ID_SEGMENT.match(segment) is not None
+
+def url_template(url: str) -> str:
+    """
+    Coarse route template for grouping pages:
+    host + path with id-like segments replaced by "{id}",
+    plus the sorted query parameter names.
+
+        https://a.com/users/42/edit?tab=2&b=1  ->  a.com/users/{id}/edit?b&tab
+    """
+    parts = urlsplit(url)
+
+    segments = [
+        "{id}" if is_id_segment(segment) else segment.lower()
+        for segment in parts.path.split("/")
+    ]
+    template = parts.netloc.lower() + "/".join(segments)
+
+    keys = sorted({key for key, _ in parse_qsl(parts.query, keep_blank_values=True)})
+    if keys:
+        template += "?" + "&".join(keys)
+    return template
+
+# Helpers
+def _is_tracking_param(key: str) -> bool:
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PARAM_PREFIXES)
+
+def _port(parts) -> int | None:
+    try:
+        return parts.port
+    except ValueError:
+        # Malformed port; keep the netloc as given
+        return None
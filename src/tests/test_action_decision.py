@@ -13,22 +13,22 @@ def test_login_decision():
     state = make_state(PageType.LOGIN)
     updated = decide_action_node(state)
 
-    assert updated.next_action.action == ActionType.SUBMIT
+    assert updated["next_action"].action == ActionType.SUBMIT
 
 def test_listing_decision():
     state = make_state(PageType.LISTING)
     updated = decide_action_node(state)
 
-    assert updated.next_action.action == ActionType.PAGINATE
+    assert updated["next_action"].action == ActionType.PAGINATE
 
 def test_error_decision():
     state = make_state(PageType.ERROR)
     updated = decide_action_node(state)
 
-    assert updated.next_action.action == ActionType.STOP
+    assert updated["next_action"].action == ActionType.STOP
 
 def test_dashboard_decision():
     state = make_state(PageType.DASHBOARD)
     updated = decide_action_node(state)
 
-    assert updated.next_action.action == ActionType.CLICK
+    assert updated["next_action"].action == ActionType.CLICK
@@ -18,7 +18,7 @@ def test_analyze_defects_node_detects_console_error():
         "console": {"errors": ["Uncaught TypeError"]}
     })
 
-    updated_state = analyze_defects(state)
+    updates = analyze_defects(state)
 
-    assert len(updated_state.detected_defects) == 1
-    assert updated_state.detected_defects[0].subtype == "ConsoleError"
+    assert len(updates["detected_defects"]) == 1
+    assert updates["detected_defects"][0].subtype == "ConsoleError"
@@ -0,0 +1,87 @@
+import itertools
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from crawlergraph.classifiers.batch import (
+    PAGE_TYPES,
+    build_feature_columns,
+    classify_page_types_batch,
+    decode_page_types,
+)
+from crawlergraph.classifiers.compiler import compile_page_type_rules
+from crawlergraph.classifiers.page_type import classify_page_type
+from crawlergraph.classifiers.page_type_rules import FALLBACK, PAGE_TYPE_RULES, PageTypeRule
+from crawlergraph.features.dom_features import extract_dom_features
+from crawlergraph.state import PageFeatures, PageType, RuntimeSignals
+from .test_dom_feature_parity import FIXTURES
+from .test_page_type_rules import random_pages
+from .utils import load_fixture
+
+
+def assert_matches_scalar(pages):
+    codes, confidences = classify_page_types_batch(build_feature_columns(pages))
+
+    expected = [classify_page_type(f, s) for f, s in pages]
+    assert decode_page_types(codes) == [t for t, _ in expected]
+    assert confidences.tolist() == [c for _, c in expected]
+
+# Tests
+def test_random_pages_match_scalar_classifier():
+    assert_matches_scalar(random_pages(5000))
+
+def test_boolean_feature_grid_matches_scalar_classifier():
+    flags = ["has_form", "has_username_input", "has_password_input",
+             "pagination_controls", "empty_state_detected"]
+    pages = []
+    for values in itertools.product([False, True], repeat=len(flags)):
+        for tables, inputs in itertools.product([0, 1, 2], [0, 2, 3]):
+            features = PageFeatures(
+                table_count=tables,
+                input_count=inputs,
+                submit_button_count=1,
+                content_block_count=2,
+                **dict(zip(flags, values)),
+            )
+            pages.append((features, RuntimeSignals(redirect_detected=True)))
+
+    assert_matches_scalar(pages)
+
+def test_fixtures_match_scalar_classifier():
+    pages = [
+        (extract_dom_features(load_fixture(name), f"https://example.com/{name}"), RuntimeSignals())
+        for name in FIXTURES
+    ]
+
+    assert_matches_scalar(pages)
+
+def test_batch_follows_an_edited_rule_spec():
+    rules = [
+        PageTypeRule(
+            name="search_url",
+            page_type=PageType.LISTING,
+            confidence=0.65,
+            when=[("features.url_patterns", "contains_any", ["search"]),
+                  ("signals.status_code", "<", 400)],
+        ),
+        *PAGE_TYPE_RULES,
+    ]
+    pages = random_pages(2000) + [
+        (PageFeatures(url_patterns=["search"]), RuntimeSignals(status_code=status))
+        for status in (200, 404)
+    ]
+
+    codes, confidences = classify_page_types_batch(build_feature_columns(pages, rules), rules)
+
+    scalar = compile_page_type_rules(rules, FALLBACK)
+    expected = [scalar(f, s) for f, s in pages]
+    assert decode_page_types(codes) == [t for t, _ in expected]
+    assert confidences.tolist() == [c for _, c in expected]
+    assert expected[-2:] == [(PageType.LISTING, 0.65), (PageType.ERROR, 0.95)]
+
+def test_empty_batch():
+    codes, confidences = classify_page_types_batch(build_feature_columns([]))
+
+    assert codes.shape == confidences.shape == (0,)
+    assert len(PAGE_TYPES) < 128  # codes fit in int8
@@ -0,0 +1,85 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+
+from crawlergraph.features.batch import extract_dom_features_many
+from crawlergraph.features.dom_features import extract_dom_features
+from crawlergraph.io.input_schema import ObservationPayload
+from .test_dom_feature_parity import FIXTURES
+from .utils import load_fixture
+
+
+def make_observations():
+    return [
+        ObservationPayload(url=f"https://example.com/{name}", dom=load_fixture(name), signals={})
+        for name in FIXTURES
+    ]
+
+class InlineExecutor(Executor):
+    """
+    Runs tasks on submit; tracks submitted, uncollected futures.
+    """
+
+    def __init__(self):
+        self.outstanding = self.peak = 0
+
+    def submit(self, fn, *args, **kwargs):
+        future = TrackedFuture(self)
+        future.set_result(fn(*args, **kwargs))
+        self.outstanding += 1
+        self.peak = max(self.peak, self.outstanding)
+        return future
+
+class TrackedFuture(Future):
+    def __init__(self, executor):
+        super().__init__()
+        self.executor = executor
+
+    def result(self, timeout=None):
+        self.executor.outstanding -= 1
+        return super().result(timeout)
+
+# Tests
+def test_small_batch_runs_serially_and_matches_single_extraction():
+    observations = make_observations()
+
+    results = extract_dom_features_many(observations)
+
+    assert results == [extract_dom_features(o.dom, o.url) for o in observations]
+
+def test_process_pool_preserves_input_order():
+    observations = make_observations() * 2
+
+    results = extract_dom_features_many(
+        observations,
+        max_workers=2,
+        chunksize=3,
+        serial_threshold=0,
+    )
+
+    assert results == [extract_dom_features(o.dom, o.url) for o in observations]
+
+def test_reuses_caller_supplied_executor():
+    observations = make_observations()
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        first = extract_dom_features_many(observations, executor=pool)
+        second = extract_dom_features_many(observations, executor=pool)
+
+    assert first == second == [extract_dom_features(o.dom, o.url) for o in observations]
+
+def test_input_is_read_lazily_with_bounded_futures_in_flight():
+    observations = make_observations() * 5
+    executor = InlineExecutor()
+    read = []
+
+    def stream():
+        for observation in observations:
+            read.append(executor.outstanding)
+            yield observation
+
+    results = extract_dom_features_many(stream(), chunksize=2, executor=executor, max_in_flight=3)
+
+    assert results == [extract_dom_features(o.dom, o.url) for o in observations]
+    assert executor.peak == 3
+    # Read while earlier chunks are in flight, never past a full window
+    assert read[-1] > 0
+    assert max(read) <= 3
@@ -0,0 +1,75 @@
+import tracemalloc
+
+from crawlergraph.classifiers.page_type import classify_page_type
+from crawlergraph.classifiers.page_type_rules import PAGE_TYPE_RULES
+from crawlergraph.classifiers.tracing import ClassificationTracer
+from crawlergraph.state import PageFeatures, PageType, RuntimeSignals
+from .test_page_type_rules import random_pages
+
+LISTING = PageFeatures(table_count=2, pagination_controls=False)
+
+
+def test_traced_results_match_untraced():
+    tracer = ClassificationTracer()
+
+    for features, signals in random_pages(2000):
+        assert (
+            classify_page_type(features, signals, tracer=tracer)
+            == classify_page_type(features, signals)
+        )
+    assert tracer.calls == 2000
+
+def test_trace_explains_which_rule_fired_and_near_misses():
+    tracer = ClassificationTracer()
+
+    page_type, _ = classify_page_type(LISTING, RuntimeSignals(), tracer=tracer)
+    trace = tracer.last
+
+    assert page_type == PageType.LISTING
+    assert trace.fired == "multiple_tables"
+    assert [e.rule for e in trace.evaluations] == [
+        r.name for r in PAGE_TYPE_RULES[:len(trace.evaluations)]
+    ]
+    assert all(e.elapsed_ns >= 0 for e in trace.evaluations)
+    # Tables present, pagination missing
+    assert "paginated_table" in [e.rule for e in trace.near_misses()]
+
+def test_fallback_trace_has_no_fired_rule():
+    tracer = ClassificationTracer()
+
+    assert classify_page_type(PageFeatures(), RuntimeSignals(), tracer=tracer) == (PageType.UNKNOWN, 0.3)
+    assert tracer.last.fired is None
+    assert len(tracer.last.evaluations) == len(PAGE_TYPE_RULES)
+
+def test_stats_aggregate_hits_and_histograms():
+    tracer = ClassificationTracer(keep_last=False)
+
+    for _ in range(3):
+        classify_page_type(LISTING, RuntimeSignals(), tracer=tracer)
+    classify_page_type(PageFeatures(), RuntimeSignals(status_code=500), tracer=tracer)
+
+    stats = {s.rule: s for s in tracer.stats()}
+    assert stats["server_error"].evaluations == 4
+    assert stats["server_error"].hits == 1
+    assert stats["multiple_tables"].hits == 3
+    assert stats["multiple_tables"].hit_rate == 1.0
+    assert sum(stats["server_error"].histogram.values()) == 4
+    assert tracer.rules_by_hits()[:2] == ["multiple_tables", "server_error"]
+    assert tracer.last is None
+
+def test_untraced_path_does_not_allocate():
+    features, signals = LISTING, RuntimeSignals()
+    classify_page_type(features, signals)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(1000):
+        classify_page_type(features, signals)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    grown = sum(
+        stat.size_diff for stat in after.compare_to(before, "filename")
+        if "crawlergraph" in stat.traceback[0].filename or "<compiled" in stat.traceback[0].filename
+    )
+    assert grown == 0
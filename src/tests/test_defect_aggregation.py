@@ -0,0 +1,160 @@
+import pytest
+
+from crawlergraph.context import RunContext, run_config
+from crawlergraph.defects.aggregator import DefectAggregator, _Group, normalize_evidence
+from crawlergraph.defects.models import Defect, DefectCategory
+from crawlergraph.defects.rules import detect_defects
+from crawlergraph.features.fingerprints import MessageInterner, fingerprint_message
+from crawlergraph.memory.performance import OVERFLOW_TEMPLATE
+from crawlergraph.nodes.analyze_defects import analyze_defects
+from crawlergraph.state import CrawlState, PageFeatures, RuntimeSignals
+from crawlergraph.utils.sketches import DistinctCounter
+
+
+def console_error(message):
+    return detect_defects(PageFeatures(), RuntimeSignals(console_errors=[message]))
+
+# Tests
+def test_distinct_counter_estimates_within_error():
+    for n in (1, 50, 5_000, 50_000):
+        counter = DistinctCounter(precision=10)
+        for i in range(n):
+            counter.add(f"https://a.com/{i}")
+        assert counter.estimate() == pytest.approx(n, rel=0.1)
+
+def test_distinct_counter_ignores_repeats_and_merges():
+    a, b = DistinctCounter(), DistinctCounter()
+    for i in range(1000):
+        a.add(str(i % 10))
+        b.add(str(i % 20))
+    a.merge(b)
+
+    assert len(a) == 20
+
+def test_same_error_on_many_pages_is_one_group():
+    aggregator = DefectAggregator()
+    for i in range(400):
+        url = f"https://a.com/items/{i}"
+        aggregator.observe(url, console_error(f"TypeError at app.js:{i}:7 for item {i}"))
+
+    groups = aggregator.groups()
+    assert len(groups) == 1
+    assert groups[0].occurrences == 400
+    assert groups[0].pages == pytest.approx(400, rel=0.1)
+    assert groups[0].template == "a.com/items/{id}"
+    assert groups[0].reproducibility == pytest.approx(1.0, rel=0.1)
+
+def test_interned_and_raw_messages_group_together():
+    interner = MessageInterner()
+    raw = Defect(
+        category=DefectCategory.FUNCTIONAL, subtype="ConsoleError", severity=6,
+        confidence=0.85, description="d", evidence={"errors": ["boom 1"], "count": 1},
+    )
+    interned = raw.model_copy(update={
+        "evidence": {"fingerprints": {interner.intern("boom 2"): 1}, "count": 1},
+    })
+
+    assert normalize_evidence(raw.evidence) == normalize_evidence(interned.evidence)
+    assert normalize_evidence(raw.evidence) == {"fingerprints": [fingerprint_message("boom 3")]}
+
+def test_measurements_do_not_split_groups_but_identifiers_do():
+    aggregator = DefectAggregator()
+    for load_time in (3500, 8000):
+        aggregator.observe("https://a.com/x", detect_defects(
+            PageFeatures(), RuntimeSignals(page_load_time_ms=load_time),
+        ))
+    for status in (500, 503):
+        aggregator.observe("https://a.com/x", detect_defects(
+            PageFeatures(), RuntimeSignals(status_code=status),
+        ))
+
+    subtypes = sorted(g.subtype for g in aggregator.groups())
+    assert subtypes == ["ServerError", "ServerError", "SlowPageLoad"]
+
+def test_revisits_count_occurrences_not_pages():
+    aggregator = DefectAggregator()
+    for _ in range(50):
+        aggregator.observe("https://a.com/x", console_error("boom"))
+
+    group = aggregator.groups()[0]
+    assert group.occurrences == 50
+    assert group.pages == 1
+
+def test_score_ranks_widespread_and_severe_defects_first():
+    aggregator = DefectAggregator()
+    for i in range(100):
+        aggregator.observe(f"https://a.com/p/{i}", console_error("boom"))
+    aggregator.observe("https://a.com/q/1", console_error("rare"))
+    aggregator.observe("https://a.com/r/1", detect_defects(
+        PageFeatures(), RuntimeSignals(status_code=500),
+    ))
+
+    ranked = [(g.subtype, g.template) for g in aggregator.top(3)]
+    assert ranked[0] == ("ConsoleError", "a.com/p/{id}")
+    assert ranked[1] == ("ServerError", "a.com/r/{id}")
+
+def test_pages_without_the_defect_lower_reproducibility():
+    aggregator = DefectAggregator()
+    aggregator.observe("https://a.com/p/1", console_error("boom"))
+    before = aggregator.groups()[0].score
+    for i in range(2, 10):
+        aggregator.observe(f"https://a.com/p/{i}", [])
+
+    group = aggregator.groups()[0]
+    assert group.template_pages == 9
+    assert group.reproducibility == pytest.approx(1 / 9, rel=0.01)
+    assert group.score < before
+
+def test_memory_is_bounded():
+    aggregator = DefectAggregator(max_groups=20, max_templates=10)
+    for i in range(2_000):
+        aggregator.observe(f"https://site{i}.com/", console_error(f"error kind {chr(65 + i % 26)}"))
+
+    assert len(aggregator) <= 21
+    assert len(aggregator._template_pages) <= 11
+    overflow = [g for g in aggregator.groups() if g.template == OVERFLOW_TEMPLATE]
+    assert overflow and overflow[0].evidence == {}
+    assert sum(g.occurrences for g in aggregator.groups()) == 2_000
+
+def test_pages_are_not_rescored_until_read(monkeypatch):
+    aggregator = DefectAggregator()
+    for i in range(5):
+        aggregator.observe(f"https://a.com/p/{i}", console_error(f"error {'abc'[i % 3]}"))
+    aggregator.top(1)
+    rescored = []
+    rescore = _Group.rescore
+    monkeypatch.setattr(_Group, "rescore", lambda g, pages: rescored.append(g) or rescore(g, pages))
+
+    for i in range(5, 500):
+        aggregator.observe(f"https://a.com/p/{i}", [])
+    assert rescored == []
+
+    group = aggregator.top(1)[0]
+    assert len(rescored) == 3
+    assert group.template_pages == 500
+
+def test_template_score_covers_overflow_templates():
+    aggregator = DefectAggregator(max_templates=1)
+    aggregator.observe("https://a.com/about", [])
+    aggregator.observe("https://a.com/orders/1", console_error("boom"))
+
+    assert aggregator.template_score("https://a.com/orders/2") > 0.0
+    assert aggregator.template_score("https://a.com/about") == 0.0
+
+def test_node_folds_defects_into_run_context():
+    context = RunContext()
+    for i in range(3):
+        state = CrawlState(
+            run_id="r",
+            start_url="https://a.com",
+            current_url=f"https://a.com/items/{i}",
+            signals=RuntimeSignals(status_code=500),
+        )
+        analyze_defects(state, config=run_config(context))
+
+    groups = context.defects.groups()
+    assert [(g.subtype, g.occurrences) for g in groups] == [("ServerError", 3)]
+
+def test_run_context_keeps_empty_interner():
+    interner = MessageInterner()
+    assert RunContext(messages=interner).messages is interner
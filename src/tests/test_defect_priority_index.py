@@ -0,0 +1,83 @@
+import random
+
+from crawlergraph.defects.aggregator import DefectAggregator
+from crawlergraph.defects.rules import detect_defects
+from crawlergraph.state import PageFeatures, RuntimeSignals
+from crawlergraph.utils.heaps import IndexedHeap
+
+
+def brute_force_top(priorities, n):
+    # Ties keep insertion order (dicts preserve it)
+    return sorted(priorities.items(), key=lambda item: -item[1])[:n]
+
+def random_page(rng):
+    return RuntimeSignals(
+        status_code=rng.choice([200, 200, 404, 500]),
+        console_errors=[f"error {rng.choice('abcdefgh')}"] if rng.random() < 0.5 else [],
+        page_load_time_ms=rng.choice([None, 1000, 5000]),
+    )
+
+# Tests
+def test_heap_top_matches_sort_under_random_updates():
+    rng = random.Random(1)
+    heap, priorities = IndexedHeap(), {}
+
+    for step in range(5_000):
+        key = rng.randrange(300)
+        if key in priorities and rng.random() < 0.1:
+            heap.remove(key)
+            del priorities[key]
+        else:
+            priority = rng.choice([rng.random(), 0.5])
+            heap.push(key, priority)
+            priorities[key] = priority
+        if step % 250 == 0:
+            assert [p for _, p in heap.top(10)] == [p for _, p in brute_force_top(priorities, 10)]
+
+    assert len(heap) == len(priorities)
+    assert dict(heap.top(len(heap))) == priorities
+
+def test_heap_ties_rank_in_insertion_order():
+    heap = IndexedHeap()
+    for key in "abc":
+        heap.push(key, 1.0)
+    heap.push("d", 2.0)
+
+    assert [key for key, _ in heap.top(4)] == ["d", "a", "b", "c"]
+    assert heap.peek() == ("d", 2.0)
+
+def test_heap_priority_can_decrease():
+    heap = IndexedHeap()
+    heap.push("a", 5.0)
+    heap.push("b", 3.0)
+    heap.push("a", 1.0)
+
+    assert heap.top(1) == [("b", 3.0)]
+    assert heap.priority("a") == 1.0
+    assert "a" in heap and "z" not in heap
+
+def test_live_top_matches_full_rescore_during_crawl():
+    rng = random.Random(4)
+    aggregator = DefectAggregator()
+
+    for i in range(2_000):
+        url = f"https://a.com/{rng.choice(['p', 'q', 'r'])}/{rng.randrange(300)}"
+        aggregator.observe(url, detect_defects(PageFeatures(), random_page(rng)))
+
+        if i % 200 == 0:
+            live = aggregator.top(5)
+            expected = sorted(
+                (g.rescore(aggregator._pages_of(g)) for g in aggregator._groups.values()),
+                reverse=True,
+            )[:5]
+            assert [g.score for g in live] == expected
+
+def test_top_n_is_a_prefix_of_groups():
+    rng = random.Random(9)
+    aggregator = DefectAggregator()
+    for i in range(500):
+        aggregator.observe(f"https://a.com/x/{i}", detect_defects(PageFeatures(), random_page(rng)))
+
+    everything = aggregator.groups()
+    assert [g.fingerprint for g in aggregator.top(3)] == [g.fingerprint for g in everything[:3]]
+    assert aggregator.get(everything[0].fingerprint).score == everything[0].score
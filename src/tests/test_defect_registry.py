@@ -0,0 +1,188 @@
+import random
+
+import pytest
+
+from crawlergraph.context import RunContext, run_config
+from crawlergraph.defects.batch import detect_defects_batch
+from crawlergraph.defects.registry import (
+    DefectRule,
+    DefectRuleConfig,
+    DefectRuleRegistry,
+    THRESHOLD,
+    build_defect_registry,
+)
+from crawlergraph.defects.models import DefectCategory
+from crawlergraph.defects.rules import DEFECT_RULES, detect_defects
+from crawlergraph.io.input_schema import CrawlConfig, LangGraphInput, ObservationPayload
+from crawlergraph.loop_state import LoopState
+from crawlergraph.nodes.analyze_defects import analyze_defects
+from crawlergraph.state import CrawlState, PageFeatures, RuntimeSignals
+
+
+def _reference_subtypes(signals):
+    """
+    The hand-written rules the registry replaced.
+    """
+    found = []
+    if signals.status_code >= 500:
+        found.append("ServerError")
+    if 400 <= signals.status_code < 500:
+        found.append("ClientError")
+    if signals.console_error_count:
+        found.append("ConsoleError")
+    if signals.failed_requests > 0:
+        found.append("NetworkFailure")
+    if signals.layout_overlaps:
+        found.append("LayoutOverlap")
+    if signals.page_load_time_ms and signals.page_load_time_ms > 3000:
+        found.append("SlowPageLoad")
+    if signals.long_tasks_ms and signals.long_tasks_ms > 200:
+        found.append("LongMainThreadTasks")
+    return found
+
+def _comparable(defect):
+    return defect.model_dump(exclude={"detected_at"})
+
+def random_signals(count, seed=11):
+    rng = random.Random(seed)
+    pages = []
+    for _ in range(count):
+        signals = RuntimeSignals(
+            status_code=rng.choice([200, 200, 302, 404, 499, 500, 503]),
+            console_errors=["boom"] * rng.choice([0, 0, 1, 3]),
+            failed_requests=rng.choice([0, 0, 2]),
+            layout_overlaps=rng.random() < 0.2,
+            page_load_time_ms=rng.choice([None, 0, 1200, 3000, 3001, 9000]),
+            long_tasks_ms=rng.choice([None, 0, 150, 200, 201, 800]),
+        )
+        pages.append((PageFeatures(), signals))
+    return pages
+
+# Tests
+def test_registry_matches_reference_rules():
+    for features, signals in random_signals(3000):
+        defects = detect_defects(features, signals)
+        assert [d.subtype for d in defects] == _reference_subtypes(signals)
+
+def test_evidence_matches_previous_format():
+    signals = RuntimeSignals(status_code=503, console_errors=["a"], page_load_time_ms=5000)
+    defects = {d.subtype: d for d in detect_defects(PageFeatures(), signals)}
+
+    assert defects["ServerError"].evidence == {"status_code": 503}
+    assert defects["ConsoleError"].evidence == {"errors": ["a"], "count": 1}
+    assert defects["SlowPageLoad"].evidence == {"page_load_time_ms": 5000}
+
+def test_batch_matches_scalar_detection():
+    pages = random_signals(2000, seed=5)
+    registry = build_defect_registry(
+        DEFECT_RULES, DefectRuleConfig(thresholds={"SlowPageLoad": 1000}),
+    )
+
+    batch = detect_defects_batch(pages, registry)
+
+    scalar = [registry.detect(f, s) for f, s in pages]
+    assert [[_comparable(d) for d in row] for row in batch] == [
+        [_comparable(d) for d in row] for row in scalar
+    ]
+
+def test_batch_handles_no_pages():
+    assert detect_defects_batch([]) == []
+
+def test_rules_can_be_disabled_by_config():
+    registry = build_defect_registry(DEFECT_RULES, DefectRuleConfig(disabled=["ClientError"]))
+    signals = RuntimeSignals(status_code=404, failed_requests=1)
+
+    assert [d.subtype for d in registry.detect(PageFeatures(), signals)] == ["NetworkFailure"]
+
+def test_thresholds_can_be_overridden_by_config():
+    config = CrawlConfig(defect_rules={"thresholds": {"SlowPageLoad": 1000, "NetworkFailure": 3}})
+    registry = build_defect_registry(DEFECT_RULES, config.defect_rules)
+    signals = RuntimeSignals(page_load_time_ms=1500, failed_requests=2)
+
+    assert [d.subtype for d in registry.detect(PageFeatures(), signals)] == ["SlowPageLoad"]
+    assert [d.subtype for d in detect_defects(PageFeatures(), signals)] == ["NetworkFailure"]
+
+def test_unknown_subtype_in_config_raises():
+    with pytest.raises(ValueError, match="NoSuchRule"):
+        DefectRuleRegistry(DEFECT_RULES, DefectRuleConfig(disabled=["NoSuchRule"]))
+
+def test_threshold_rule_without_threshold_raises():
+    rule = DefectRule(
+        category=DefectCategory.PERFORMANCE,
+        subtype="SlowTeapot",
+        severity=1,
+        confidence=0.5,
+        description="Slow teapot",
+        when=[("signals.page_load_time_ms", ">", THRESHOLD)],
+    )
+
+    with pytest.raises(ValueError, match="SlowTeapot"):
+        DefectRuleRegistry([rule])
+    assert DefectRuleRegistry([rule], DefectRuleConfig(thresholds={"SlowTeapot": 10})).rules[0].threshold == 10
+    assert DefectRuleRegistry([rule], DefectRuleConfig(disabled=["SlowTeapot"])).rules == []
+
+def test_outlier_subtypes_can_be_configured():
+    registry = build_defect_registry(
+        DEFECT_RULES, DefectRuleConfig(disabled=["SlowPageLoadForTemplate"]),
+    )
+    assert not registry.is_enabled("SlowPageLoadForTemplate")
+
+def test_registries_are_cached_per_config():
+    config = DefectRuleConfig(disabled=["LayoutOverlap"])
+    assert build_defect_registry(DEFECT_RULES, config) is build_defect_registry(
+        DEFECT_RULES, DefectRuleConfig(disabled=["LayoutOverlap"]),
+    )
+
+def test_only_fired_rules_build_defects():
+    built = []
+
+    def evidence(features, signals):
+        built.append(signals.status_code)
+        return {}
+
+    rules = [DefectRule(
+        category=DefectCategory.FUNCTIONAL,
+        subtype="Teapot",
+        severity=1,
+        confidence=0.5,
+        description="I'm a teapot",
+        when=[("signals.status_code", "==", 418)],
+        evidence=evidence,
+    )]
+    registry = DefectRuleRegistry(rules)
+
+    assert registry.detect(PageFeatures(), RuntimeSignals()) == []
+    assert len(detect_defects_batch(
+        [(PageFeatures(), RuntimeSignals(status_code=s)) for s in (200, 418, 500)], registry,
+    )[1]) == 1
+    assert built == [418]
+
+def test_node_uses_run_registry():
+    registry = build_defect_registry(DEFECT_RULES, DefectRuleConfig(disabled=["ServerError"]))
+    state = CrawlState(
+        run_id="r",
+        start_url="https://a.com",
+        current_url="https://a.com",
+        signals=RuntimeSignals(status_code=500),
+    )
+
+    result = analyze_defects(state, config=run_config(RunContext(defect_registry=registry)))
+
+    assert result["detected_defects"] == []
+
+def test_payload_config_disables_rules_end_to_end():
+    context = RunContext()
+    payload = LangGraphInput(
+        run_id="r",
+        start_url="https://a.com",
+        config=CrawlConfig(defect_rules={"disabled": ["ServerError"]}),
+        observation=ObservationPayload(
+            url="https://a.com", dom="<html><body></body></html>", signals={"status_code": 500},
+        ),
+    )
+
+    state = LoopState.from_input(payload, context)
+    result = analyze_defects(state, config=run_config(context))
+
+    assert not context.defect_registry.is_enabled("ServerError")
+    assert result["detected_defects"] == []
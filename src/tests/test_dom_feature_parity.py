@@ -0,0 +1,182 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from crawlergraph.features.dom_features import extract_dom_features
+from crawlergraph.features.parsers import (
+    available_parser_backends,
+    resolve_parser_backend,
+)
+from crawlergraph.io.input_schema import CrawlConfig
+from crawlergraph.state import PageFeatures
+from .utils import FIXTURE_DIR, load_fixture
+
+FIXTURES = sorted(p.name for p in FIXTURE_DIR.glob("*.html"))
+BACKENDS = ["html.parser", "lxml", "selectolax"]
+
+# Tricky markup the single-pass visitor must agree on
+EDGE_CASES = [
+    "<div><b>Err</b>or while loading</div>",
+    "<p>fail<i>ed</i></p><div>ok</div>",
+    "<section>Invalid input</section>",
+    "<div class='alert-Danger ERROR-box'></div>",
+    "<div><span>no</span><span>results</span></div>",
+    "<div><span>no</span> <span>results</span></div>",
+    "<a href='#'>  Next  </a>",
+    "<a href='#'><span>Pre</span>vious</a>",
+    "<a href='#'>next page</a>",
+    "<nav aria-label='Page navigation'></nav>",
+    "<script>var error = 'no results';</script><div></div>",
+    "<div><!-- error --></div>",
+    "<form><input type='email' placeholder='E-mail'><input type='submit'></form>",
+    "<input type='TEXT' name='username'><button>Go</button>",
+    "<table><tr><td>1</td></tr></table><table></table>",
+    "<div><div><p>deeply <span>nested</span></p></div> forbidden</div>",
+    "",
+]
+
+# Malformed markup the HTML5 backends parse differently
+DIVERGENT_CASES = [
+    '<textarea><input type="password"><button type="submit">x</button></textarea>',
+    '<title><input type="password"></title><body><p>x</p>',
+]
+
+# Reference: the original multi-scan extractor
+def _reference_features(dom: str, url: str | None = None) -> PageFeatures:
+    soup = BeautifulSoup(dom, "html.parser")
+
+    has_username = False
+    for c in soup.find_all("input", {"type": ["text", "email"]}):
+        attrs = " ".join([
+            c.get("name", ""),
+            c.get("id", ""),
+            c.get("placeholder", ""),
+            c.get("aria-label", ""),
+        ]).lower()
+        if any(k in attrs for k in ["user", "email", "login", "username"]):
+            has_username = True
+            break
+
+    pagination = False
+    for nav in soup.find_all("nav"):
+        label = nav.get("aria-label", "").lower()
+        if any(k in label for k in ["next", "previous", "page", "pagination"]):
+            pagination = True
+    for a in soup.find_all("a"):
+        if (a.get_text() or "").lower().strip() in {"next", "prev", "previous"}:
+            pagination = True
+
+    error_keywords = ["error", "failed", "invalid", "unauthorized", "forbidden"]
+    error_banners = False
+    for el in soup.find_all(["div", "span", "p"]):
+        cls = " ".join(el.get("class", [])).lower()
+        text = (el.get_text() or "").lower()
+        if any(k in cls for k in error_keywords) or any(k in text for k in error_keywords):
+            error_banners = True
+            break
+
+    body_text = soup.get_text(separator=" ").lower()
+    empty_phrases = ["no results", "nothing found", "empty", "no data", "no records"]
+
+    return PageFeatures(
+        has_form=soup.find("form") is not None,
+        has_username_input=has_username,
+        has_password_input=soup.find("input", {"type": "password"}) is not None,
+        input_count=len(soup.find_all("input")),
+        submit_button_count=(
+            len(soup.find_all("button"))
+            + len(soup.find_all("input", {"type": "submit"}))
+        ),
+        table_count=len(soup.find_all("table")),
+        pagination_controls=pagination,
+        error_banners=error_banners,
+        empty_state_detected=any(p in body_text for p in empty_phrases),
+        content_block_count=len(
+            soup.find_all(["section", "article", "main", "aside", "div"])
+        ),
+        url_patterns=_reference_url_patterns(url),
+    )
+
+def _reference_url_patterns(url):
+    if not url:
+        return []
+
+    patterns = []
+    lowered = url.lower()
+
+    if "login" in lowered:
+        patterns.append("login")
+    if "auth" in lowered:
+        patterns.append("auth")
+    if "signin" in lowered:
+        patterns.append("signin")
+    if "signup" in lowered:
+        patterns.append("signup")
+    if "page=" in lowered or "offset=" in lowered:
+        patterns.append("pagination")
+    if any(k in lowered for k in ["error", "403", "404", "500"]):
+        patterns.append("error")
+
+    return patterns
+
+# Tests
+@pytest.mark.parametrize("name", FIXTURES)
+def test_single_pass_matches_reference_on_fixtures(name):
+    dom = load_fixture(name)
+    url = "https://example.com/login?page=2"
+
+    assert extract_dom_features(dom, url) == _reference_features(dom, url)
+
+@pytest.mark.parametrize("dom", EDGE_CASES)
+def test_single_pass_matches_reference_on_edge_cases(dom):
+    assert extract_dom_features(dom) == _reference_features(dom)
+
+def test_deeply_nested_dom_does_not_recurse():
+    dom = "<div>" * 5000 + "error" + "</div>" * 5000
+
+    features = extract_dom_features(dom)
+
+    assert features.error_banners is True
+    assert features.content_block_count == 5000
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("name", FIXTURES)
+def test_parser_backends_match_reference_on_fixtures(backend, name):
+    if backend not in available_parser_backends():
+        pytest.skip(f"{backend} not installed")
+
+    dom = load_fixture(name)
+    url = "https://example.com/login?page=2"
+
+    assert extract_dom_features(dom, url, parser=backend) == _reference_features(dom, url)
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("dom", EDGE_CASES)
+def test_parser_backends_match_reference_on_edge_cases(backend, dom):
+    if backend not in available_parser_backends():
+        pytest.skip(f"{backend} not installed")
+
+    assert extract_dom_features(dom, parser=backend) == _reference_features(dom)
+
+@pytest.mark.parametrize("backend", ["lxml", "selectolax"])
+@pytest.mark.parametrize("dom", DIVERGENT_CASES)
+def test_html5_backends_read_raw_text_elements_as_text(backend, dom):
+    if backend not in available_parser_backends():
+        pytest.skip(f"{backend} not installed")
+
+    stdlib = extract_dom_features(dom)
+    html5 = extract_dom_features(dom, parser=backend)
+
+    assert stdlib.has_password_input and stdlib.input_count == 1
+    assert not html5.has_password_input and html5.input_count == 0
+
+def test_unknown_parser_backend_rejected():
+    with pytest.raises(ValueError):
+        resolve_parser_backend("html5lib")
+
+def test_crawl_config_selects_parser_backend():
+    config = CrawlConfig(parser_backend="lxml")
+    dom = "<form><input type='password'></form>"
+
+    features = extract_dom_features(dom, parser=config.parser_backend)
+
+    assert features.has_password_input is True
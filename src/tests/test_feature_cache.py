@@ -0,0 +1,188 @@
+import pytest
+
+from crawlergraph.context import RunContext, run_config
+from crawlergraph.features.cache import (
+    FeatureCache,
+    cached_classify_page_type,
+    cached_extract_dom_features,
+    new_feature_cache,
+)
+from crawlergraph.features.dom_features import extract_dom_features
+from crawlergraph.features.parsers import available_parser_backends
+from crawlergraph.features.runtime_features import extract_runtime_features
+from crawlergraph.io.input_schema import CrawlConfig, LangGraphInput, ObservationPayload
+from crawlergraph.loop_state import LoopState
+from crawlergraph.memory.loop_guards import compute_page_hash, compute_skeleton_hash
+from crawlergraph.nodes.classify_page import classify_page
+from crawlergraph.state import PageType
+
+LOGIN_DOM = """
+<form>
+  <input type="text" name="username" />
+  <input type="password" name="password" />
+  <button type="submit">Login</button>
+</form>
+"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_revisit_hits_cache_and_recomputes_url_hints():
+    cache = FeatureCache()
+
+    first = cached_extract_dom_features(cache, LOGIN_DOM, "https://a.com/login")
+    second = cached_extract_dom_features(cache, LOGIN_DOM, "https://a.com/signup")
+
+    assert first == extract_dom_features(LOGIN_DOM, "https://a.com/login")
+    assert second == extract_dom_features(LOGIN_DOM, "https://a.com/signup")
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert stats.hit_rate == 0.5
+
+def test_lru_eviction_is_counted():
+    cache = FeatureCache(max_entries=2)
+
+    for dom in ["<p>a</p>", "<p>b</p>", "<p>c</p>"]:
+        cached_extract_dom_features(cache, dom)
+
+    assert len(cache) == 2
+    assert cache.stats().evictions == 1
+
+    cached_extract_dom_features(cache, "<p>a</p>")
+    assert cache.stats().misses == 4
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = FeatureCache(ttl_seconds=60, clock=clock)
+
+    cached_extract_dom_features(cache, LOGIN_DOM)
+    clock.now += 61
+    cached_extract_dom_features(cache, LOGIN_DOM)
+
+    stats = cache.stats()
+    assert stats.expirations == 1
+    assert stats.hits == 0
+
+def test_zero_ttl_expires_immediately(tmp_path):
+    clock = FakeClock()
+    cache = FeatureCache(ttl_seconds=0, disk_path=str(tmp_path / "features.db"), clock=clock)
+
+    cached_extract_dom_features(cache, LOGIN_DOM)
+    cached_extract_dom_features(cache, LOGIN_DOM)
+
+    assert cache.stats().hits == 0
+    assert cache.stats().expirations == 2
+    cache.close()
+
+def test_config_ttl_reaches_the_cache():
+    clock = FakeClock()
+    cache = new_feature_cache(CrawlConfig(feature_cache_ttl_seconds=60))
+    cache._clock = clock
+
+    cached_extract_dom_features(cache, LOGIN_DOM)
+    clock.now += 61
+    cached_extract_dom_features(cache, LOGIN_DOM)
+
+    assert cache.ttl_seconds == 60
+    assert cache.stats().expirations == 1
+
+def test_clear_empties_the_disk_tier(tmp_path):
+    path = str(tmp_path / "features.db")
+    writer = FeatureCache(disk_path=path)
+    reader = FeatureCache(disk_path=path)
+
+    cached_extract_dom_features(writer, LOGIN_DOM)
+    writer.clear()
+    cached_extract_dom_features(reader, LOGIN_DOM)
+
+    assert len(writer) == 0
+    assert reader.stats().disk_hits == 0
+
+    writer.close()
+    reader.close()
+
+def test_disk_tier_is_shared_between_caches(tmp_path):
+    path = str(tmp_path / "features.db")
+    writer = FeatureCache(disk_path=path)
+    reader = FeatureCache(disk_path=path)
+
+    expected = cached_extract_dom_features(writer, LOGIN_DOM)
+    features = cached_extract_dom_features(reader, LOGIN_DOM)
+
+    assert features == expected
+    assert reader.stats().disk_hits == 1
+
+    writer.close()
+    reader.close()
+
+def test_classification_cache_keys_on_signals():
+    cache = FeatureCache()
+    page_hash = compute_page_hash(LOGIN_DOM)
+    features = cached_extract_dom_features(cache, LOGIN_DOM, page_hash=page_hash)
+
+    ok = extract_runtime_features({"status_code": 200})
+    failed = extract_runtime_features({"status_code": 500})
+
+    assert cached_classify_page_type(cache, page_hash, features, ok)[0] == PageType.LOGIN
+    assert cached_classify_page_type(cache, page_hash, features, failed)[0] == PageType.ERROR
+    assert cached_classify_page_type(cache, page_hash, features, ok)[0] == PageType.LOGIN
+
+    assert cache.stats().hits == 1
+
+def test_parser_and_streaming_mode_are_part_of_the_key(tmp_path):
+    if "lxml" not in available_parser_backends():
+        pytest.skip("lxml not installed")
+    # lxml reads <textarea> content as text; html.parser as markup
+    dom = '<form><textarea><input type="password"></textarea></form>'
+    path = str(tmp_path / "features.db")
+    soup_worker, lxml_worker = FeatureCache(disk_path=path), FeatureCache(disk_path=path)
+
+    cached_extract_dom_features(soup_worker, dom)
+    features = cached_extract_dom_features(lxml_worker, dom, parser="lxml")
+    cached_extract_dom_features(lxml_worker, dom, parser="lxml", streaming_threshold=0)
+
+    assert features == extract_dom_features(dom, parser="lxml")
+    assert not features.has_password_input
+    assert lxml_worker.stats().disk_hits == 0
+    assert len(lxml_worker) == 2
+
+    soup_worker.close()
+    lxml_worker.close()
+
+def test_run_context_cache_skips_revisited_pages():
+    context = RunContext()
+    payload = LangGraphInput(
+        run_id="r",
+        start_url="https://a.com",
+        config=CrawlConfig(),
+        observation=ObservationPayload(url="https://a.com/login", dom=LOGIN_DOM, signals={}),
+    )
+
+    states = [LoopState.from_input(payload, context) for _ in range(2)]
+    results = [classify_page(state, run_config(context)) for state in states]
+
+    assert states[1].page_features == extract_dom_features(LOGIN_DOM, "https://a.com/login")
+    assert states[1].skeleton_hash == compute_skeleton_hash(LOGIN_DOM)
+    assert results[1]["page_type"] == PageType.LOGIN
+    assert (context.feature_cache.stats().hits, context.feature_cache.stats().misses) == (2, 2)
+
+def test_feature_cache_can_be_disabled():
+    context = RunContext()
+    payload = LangGraphInput(
+        run_id="r",
+        start_url="https://a.com",
+        config=CrawlConfig(feature_cache_entries=None),
+        observation=ObservationPayload(url="https://a.com", dom=LOGIN_DOM, signals={}),
+    )
+
+    state = LoopState.from_input(payload, context)
+
+    assert context.feature_cache is None
+    assert state.skeleton_hash == compute_skeleton_hash(LOGIN_DOM)
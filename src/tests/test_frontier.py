@@ -0,0 +1,249 @@
+import random
+
+from crawlergraph.actions.frontier import Frontier
+from crawlergraph.actions.scoring import (
+    DefectLikelihoodScorer,
+    NoveltyScorer,
+    WeightedScorer,
+    bfs_score,
+    dfs_score,
+)
+from crawlergraph.context import RunContext, run_config
+from crawlergraph.defects.aggregator import DefectAggregator
+from crawlergraph.defects.models import Defect, DefectCategory
+from crawlergraph.graph import build_graph
+from crawlergraph.io.input_schema import CrawlConfig, LangGraphInput, ObservationPayload
+from crawlergraph.loop_state import LoopState
+from crawlergraph.memory.url_templates import TemplateMiner
+from crawlergraph.nodes.decide_action import decide_action_node
+from crawlergraph.state import ActionDecision, ActionType, PageType, StopReason
+from crawlergraph.utils.sketches import ScalableBloomFilter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def click(target):
+    return ActionDecision(action=ActionType.CLICK, target=target, rationale="test", confidence=0.7)
+
+def drain(frontier):
+    popped = []
+    while (entry := frontier.pop()) is not None:
+        popped.append(entry)
+    return popped
+
+def by_score(scores):
+    return lambda entry: scores[entry.url]
+
+def observe(url, links=(), dom="<p>Nothing to do here</p>", **config):
+    return LangGraphInput(
+        run_id="r",
+        start_url="https://a.com",
+        config=CrawlConfig(**config),
+        observation=ObservationPayload(url=url, dom=dom, signals={}, links=list(links)),
+    )
+
+# Tests
+def test_bfs_pops_shallowest_first_in_push_order():
+    frontier = Frontier()
+    for url, depth in [("/a", 2), ("/b", 0), ("/c", 1), ("/d", 0)]:
+        frontier.push(f"https://a.com{url}", depth=depth)
+
+    assert [e.url for e in drain(frontier)] == [
+        "https://a.com/b", "https://a.com/d", "https://a.com/c", "https://a.com/a",
+    ]
+    assert len(frontier) == 0
+
+def test_dfs_and_best_first_scorers():
+    frontier = Frontier(scorer=dfs_score)
+    frontier.push("https://a.com/a", depth=1)
+    frontier.push("https://b.com/b", depth=3)
+
+    assert frontier.pop().url == "https://b.com/b"
+
+def test_dedup_by_url_and_action_and_visited():
+    frontier = Frontier(visited={"https://a.com/seen"})
+
+    assert frontier.push("https://A.com/x/?utm_source=mail")
+    assert not frontier.push("https://a.com/x")
+    assert not frontier.push("https://a.com/seen")
+    assert frontier.push("https://a.com/seen", click("#more"))
+    assert not frontier.push("https://a.com/seen", click("#more"))
+    assert frontier.push("https://a.com/seen", click("#next"))
+    assert len(frontier) == 3
+
+def test_bloom_filter_dedup():
+    frontier = Frontier(seen=ScalableBloomFilter(initial_capacity=1_000))
+    urls = [f"https://a.com/p/{i}" for i in range(500)]
+
+    assert all(frontier.push(url) for url in urls)
+    assert not any(frontier.push(url) for url in urls)
+
+def test_host_delay_interleaves_hosts():
+    clock = FakeClock()
+    frontier = Frontier(min_delay=1.0, clock=clock)
+    for i in range(3):
+        frontier.push(f"https://a.com/{i}")
+    frontier.push("https://b.com/0", depth=1)
+
+    assert frontier.pop().url == "https://a.com/0"
+    assert frontier.pop().url == "https://b.com/0"
+    assert frontier.pop() is None
+    assert frontier.next_ready_at() == 1.0
+
+    clock.now = 1.0
+    assert frontier.pop().url == "https://a.com/1"
+    assert frontier.pop() is None
+
+def test_in_flight_limit_until_done():
+    frontier = Frontier(max_in_flight=1)
+    frontier.push("https://a.com/0")
+    frontier.push("https://a.com/1")
+
+    first = frontier.pop()
+    assert frontier.pop() is None
+    frontier.done(first)
+    assert frontier.pop().url == "https://a.com/1"
+
+def test_spilled_frontier_keeps_pop_order(tmp_path):
+    rng = random.Random(5)
+    scores = {}
+    for i in range(2_000):
+        scores[f"https://h{i % 7}.com/p/{i}"] = rng.random()
+    frontier = Frontier(
+        scorer=by_score(scores), max_in_memory=50, spill_path=str(tmp_path / "frontier.db"),
+    )
+
+    for url in scores:
+        frontier.push(url)
+        assert frontier.in_memory <= 50
+
+    popped = [e.url for e in drain(frontier)]
+    assert popped == sorted(scores, key=scores.get, reverse=True)
+    frontier.close()
+
+def test_spilled_ties_stay_fifo_without_refilling_everything(tmp_path):
+    frontier = Frontier(max_in_memory=10, spill_path=str(tmp_path / "frontier.db"))
+    urls = [f"https://a.com/p/{i}" for i in range(3_000)]
+    for url in urls:
+        frontier.push(url, depth=1)
+
+    popped = []
+    while (entry := frontier.pop()) is not None:
+        popped.append(entry.url)
+        assert frontier.in_memory <= 10 + 1024
+
+    assert popped == urls
+
+def test_spilled_actions_round_trip(tmp_path):
+    frontier = Frontier(max_in_memory=1, spill_path=str(tmp_path / "frontier.db"))
+    frontier.push("https://a.com/0")
+    frontier.push("https://a.com/1", click("#more"), depth=0, source="h1")
+
+    drain_order = drain(frontier)
+
+    assert drain_order[1].action == click("#more")
+    assert drain_order[1].source == "h1"
+
+def test_novelty_prefers_unvisited_templates():
+    templates = TemplateMiner()
+    for i in range(5):
+        templates.observe(f"https://a.com/orders/{i}")
+    frontier = Frontier(scorer=NoveltyScorer(templates))
+    frontier.push("https://a.com/orders/99")
+    frontier.push("https://a.com/settings")
+
+    assert frontier.pop().url == "https://a.com/settings"
+
+def test_defect_likelihood_and_weighted_scores():
+    defects = DefectAggregator()
+    defects.observe("https://a.com/orders/1", [
+        Defect(category=DefectCategory.FUNCTIONAL, subtype="ServerError", severity=8,
+               confidence=0.9, description="500", evidence={"status_code": 500}),
+    ])
+    scorer = DefectLikelihoodScorer(defects)
+    frontier = Frontier(scorer=WeightedScorer((1.0, scorer), (0.01, bfs_score)))
+    frontier.push("https://a.com/about")
+    frontier.push("https://a.com/orders/2", depth=3)
+
+    assert frontier.pop().url == "https://a.com/orders/2"
+    assert defects.template_score("https://a.com/about") == 0.0
+
+def test_action_candidates_are_keyed_by_source_fingerprint():
+    frontier = Frontier()
+
+    assert frontier.push("https://a.com/cart", click("#checkout"), source="empty-cart")
+    assert frontier.push("https://a.com/cart", click("#checkout"), source="full-cart")
+    assert not frontier.push("https://a.com/cart/", click("#checkout"), source="full-cart")
+
+def test_taken_candidates_are_not_queued_or_popped():
+    frontier = Frontier()
+    frontier.push("https://a.com/a", click("#more"), source="p1")
+    frontier.push("https://a.com/b", depth=1)
+
+    frontier.mark_taken("https://a.com/a", click("#more"), source="p1")
+    frontier.mark_taken("https://a.com/c")
+
+    assert not frontier.push("https://a.com/c")
+    assert [e.url for e in drain(frontier)] == ["https://a.com/b"]
+    assert len(frontier) == 0
+
+def test_decide_action_marks_decisions_taken():
+    context = RunContext(frontier=Frontier())
+    dashboard = LoopState(
+        run_id="r", current_url="https://a.com/home", page_hash="h1", page_type=PageType.DASHBOARD,
+    )
+    error = LoopState(run_id="r", current_url="https://a.com/broken", page_type=PageType.ERROR)
+
+    decision = decide_action_node(dashboard, run_config(context))["next_action"]
+    decide_action_node(error, run_config(context))
+
+    assert len(context.frontier) == 0
+    assert not context.frontier.push("https://a.com/home", decision, source="h1")
+    assert context.frontier.push("https://a.com/home", decision, source="h2")
+    assert context.frontier.push("https://a.com/broken")
+
+def test_from_input_installs_frontier_from_config():
+    context = RunContext()
+    LoopState.from_input(observe("https://a.com", frontier_scorer="dfs"), context)
+
+    assert context.frontier.scorer is dfs_score
+    assert not context.frontier.push("https://a.com/")
+
+    disabled = RunContext()
+    LoopState.from_input(observe("https://a.com", frontier_scorer=None), disabled)
+    assert disabled.frontier is None
+
+def test_dead_end_takes_the_best_queued_candidate():
+    context = RunContext()
+    graph = build_graph()
+
+    first = LoopState.from_input(observe("https://a.com/", links=["/docs", "https://a.com/about"]), context)
+    final = graph.invoke(first, config=run_config(context))
+
+    # The graph passes over the page twice; the first pass's pick is kept
+    assert final["next_action"].action == ActionType.NAVIGATE
+    assert final["next_action"].target == "https://a.com/docs"
+    assert final["stop_reason"] != StopReason.NO_VALID_ACTIONS
+    assert len(context.frontier) == 1
+
+    second = LoopState.from_input(observe("https://a.com/docs"), context)
+    final = graph.invoke(second, config=run_config(context))
+    assert final["next_action"].target == "https://a.com/about"
+
+    third = LoopState.from_input(observe("https://a.com/about"), context)
+    final = graph.invoke(third, config=run_config(context))
+    assert final["next_action"].action == ActionType.STOP
+
+def test_dead_end_takes_alternative_actions_of_the_page():
+    context = RunContext()
+    dom = "<main><section>Intro</section><section>More</section></main>"
+
+    state = LoopState.from_input(observe("https://a.com/", dom=dom), context)
+    decision = decide_action_node(state, run_config(context))["next_action"]
+
+    assert (decision.action, decision.url) == (ActionType.CLICK, "https://a.com/")
@@ -0,0 +1,183 @@
+from crawlergraph.features.dom_features import extract_dom_features
+from crawlergraph.features.incremental import (
+    extract_dom_snapshot,
+    update_dom_snapshot,
+)
+from crawlergraph.context import RunContext
+from crawlergraph.io.input_schema import CrawlConfig, DomMutation, LangGraphInput, ObservationPayload
+from crawlergraph.loop_state import LoopState
+
+BASE = """
+<main>
+  <section><div class="card">Orders</div></section>
+  <form id="filters"><input type="text" name="q"><button>Go</button></form>
+  <table><tr><td>1</td></tr></table>
+  <a href="#"></a>
+</main>
+"""
+
+def added(html=None, tag="div", text=""):
+    return DomMutation(kind="added", tag=tag, html=html, text=text)
+
+def removed(html=None, tag="div", text=""):
+    return DomMutation(kind="removed", tag=tag, html=html, text=text)
+
+
+def test_snapshot_features_match_full_extract():
+    assert extract_dom_snapshot(BASE).features == extract_dom_features(BASE)
+
+def test_added_modal_updates_counts_incrementally():
+    modal = '<div class="modal"><form><input type="password"><button>OK</button></form></div>'
+    snapshot = extract_dom_snapshot(BASE)
+
+    updated = update_dom_snapshot(snapshot, [added(modal)], BASE + modal, churn_threshold=1.0)
+
+    assert updated.incremental is True
+    assert updated.features == extract_dom_features(BASE + modal)
+
+def observe(dom, mutations=None, **config):
+    return LangGraphInput(
+        run_id="r",
+        start_url="https://app.example.com",
+        config=CrawlConfig(**config),
+        observation=ObservationPayload(
+            url="https://app.example.com/orders", dom=dom, signals={}, mutations=mutations,
+        ),
+    )
+
+
+def test_removed_form_clears_has_form():
+    form = '<form id="filters"><input type="text" name="q"><button>Go</button></form>'
+    textless = '<form id="filters"><input type="text" name="q"><input type="submit"></form>'
+    base = BASE.replace(form, textless)
+    snapshot = extract_dom_snapshot(base)
+    dom = base.replace(textless, "")
+
+    updated = update_dom_snapshot(snapshot, [removed(textless)], dom, churn_threshold=1.0)
+
+    assert updated.incremental is True
+    assert updated.features.has_form is False
+    assert updated.features == extract_dom_features(dom)
+
+def test_added_error_banner_sets_flag():
+    banner = '<div class="alert">Request failed</div>'
+    snapshot = extract_dom_snapshot(BASE)
+
+    updated = update_dom_snapshot(snapshot, [added(banner)], BASE + banner)
+
+    assert updated.incremental is True
+    assert updated.features.error_banners is True
+
+def test_ambiguous_text_change_falls_back_to_full_extract():
+    snapshot = extract_dom_snapshot(BASE)
+    dom = BASE.replace('<a href="#"></a>', '<a href="#">Next</a>')
+
+    updated = update_dom_snapshot(snapshot, [added(tag="#text", text="Next")], dom)
+
+    assert updated.incremental is False
+    assert updated.features.pagination_controls is True
+
+def test_churn_threshold_forces_full_extract():
+    rows = "".join(f"<tr><td>{i}</td></tr>" for i in range(20))
+    table = f"<table>{rows}</table>"
+    snapshot = extract_dom_snapshot(BASE)
+
+    updated = update_dom_snapshot(snapshot, [added(table)], BASE + table, churn_threshold=0.25)
+
+    assert updated.incremental is False
+    assert updated.features == extract_dom_features(BASE + table)
+
+def test_url_change_refreshes_url_hints():
+    snapshot = extract_dom_snapshot(BASE, url="https://app.example.com/orders")
+
+    updated = update_dom_snapshot(snapshot, [], BASE, url="https://app.example.com/orders?page=2")
+
+    assert updated.features.url_patterns == ["pagination"]
+
+def test_removed_text_joining_a_phrase_falls_back():
+    before = "<main><div>No<b>matching</b>results</div></main>"
+    after = "<main><div>No<b></b>results</div></main>"
+    snapshot = extract_dom_snapshot(before)
+
+    updated = update_dom_snapshot(snapshot, [removed(tag="#text", text="matching")], after, churn_threshold=1.0)
+
+    assert updated.incremental is False
+    assert updated.features.empty_state_detected is True
+    assert updated.features == extract_dom_features(after)
+
+def test_added_text_splitting_a_phrase_falls_back():
+    before = "<main><div>No</div><div>results</div></main>"
+    after = "<main><div>No</div><p>matching</p><div>results</div></main>"
+    snapshot = extract_dom_snapshot(before)
+
+    updated = update_dom_snapshot(snapshot, [added("<p>matching</p>")], after, churn_threshold=1.0)
+
+    assert snapshot.empty_state_detected is True
+    assert updated.incremental is False
+    assert updated.features == extract_dom_features(after)
+
+def test_added_text_completing_a_keyword_falls_back():
+    before = "<main><div>Request fai<i></i></div></main>"
+    after = "<main><div>Request fai<i></i>led</div></main>"
+    snapshot = extract_dom_snapshot(before)
+
+    updated = update_dom_snapshot(snapshot, [added(tag="#text", text="led")], after, churn_threshold=1.0)
+
+    assert updated.incremental is False
+    assert updated.features.error_banners is True
+
+def test_removed_break_joining_a_phrase_falls_back():
+    before = "<main><div>no<br>results</div></main>"
+    after = "<main><div>noresults</div></main>"
+    snapshot = extract_dom_snapshot(before)
+
+    updated = update_dom_snapshot(snapshot, [removed("<br>", tag="br")], after, churn_threshold=1.0)
+
+    assert snapshot.empty_state_detected is True
+    assert updated.incremental is False
+    assert updated.features == extract_dom_features(after)
+
+def test_common_row_inserts_stay_incremental():
+    page = """
+    <main>
+      <nav aria-label="pagination"><a href="?page=2">Next</a></nav>
+      <table><tr><td>Row 1</td><td>Bob</td><td>Pending</td></tr>{rows}</table>
+      <aside>{aside}</aside>
+    </main>
+    """
+    row = "<tr><td>Row 999</td></tr>"
+    inserts = [
+        (added(row, tag="tr"), row, ""),
+        (added(tag="#text", text="Alice"), "Alice", ""),
+        (added(tag="#text", text="Shipped"), "Shipped", ""),
+        (added(tag="#text", text="Settings"), "", "Settings"),
+    ]
+
+    snapshot = extract_dom_snapshot(page.format(rows="", aside=""))
+    for mutation, rows, aside in inserts:
+        dom = page.format(rows=rows, aside=aside)
+        updated = update_dom_snapshot(snapshot, [mutation], dom, churn_threshold=1.0)
+
+        assert updated.incremental is True
+        assert updated.features == extract_dom_features(dom)
+
+def test_from_input_applies_mutations_to_the_previous_snapshot():
+    modal = '<div class="modal"><form><input type="password"></form></div>'
+    context = RunContext()
+
+    LoopState.from_input(observe(BASE), context)
+    state = LoopState.from_input(observe(BASE + modal, [added(modal)], mutation_churn_threshold=1.0), context)
+
+    assert context.dom_snapshot.incremental is True
+    assert state.page_features == extract_dom_features(BASE + modal, "https://app.example.com/orders")
+    assert state.skeleton_hash is None
+
+def test_from_input_honours_the_churn_threshold():
+    modal = '<div class="modal"><form><input type="password"></form></div>'
+    context = RunContext()
+
+    LoopState.from_input(observe(BASE), context)
+    LoopState.from_input(observe(BASE + modal, [added(modal)], mutation_churn_threshold=0.01), context)
+
+    assert context.dom_snapshot.incremental is False
+    assert context.dom_snapshot.features.has_password_input is True
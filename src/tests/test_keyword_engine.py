@@ -0,0 +1,78 @@
+import pickle
+
+import pytest
+
+from crawlergraph.features.cache import FeatureCache, cached_extract_dom_features
+from crawlergraph.features.dom_features import extract_dom_features
+from crawlergraph.features.keywords import (
+    DEFAULT_KEYWORDS,
+    CategoryMatcher,
+    KeywordSets,
+    build_keyword_engine,
+)
+from crawlergraph.io.input_schema import CrawlConfig
+from .test_dom_feature_parity import _reference_url_patterns
+
+URLS = [
+    None,
+    "",
+    "https://a.com/",
+    "https://a.com/LOGIN",
+    "https://a.com/oauth/signin?next=/signup",
+    "https://a.com/list?offset=20&page=3",
+    "https://a.com/404",
+    "https://a.com/errors/login?code=500",
+    "https://a.com/authorize?page=1",
+]
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_url_patterns_match_original_rules(url):
+    assert DEFAULT_KEYWORDS.url_patterns(url) == _reference_url_patterns(url)
+
+def test_overlapping_and_prefix_keywords_are_all_reported():
+    matcher = CategoryMatcher({
+        "short": ["err"],
+        "long": ["error"],
+        "inner": ["rro"],
+    })
+
+    assert matcher.categories("an error") == ["short", "long", "inner"]
+    assert matcher.categories("err") == ["short"]
+    assert matcher.categories("fine") == []
+
+def test_localized_empty_state_via_config():
+    config = CrawlConfig(keywords=KeywordSets(
+        empty_state=KeywordSets().empty_state + ["keine ergebnisse", "結果がありません"],
+    ))
+    keywords = build_keyword_engine(config.keywords)
+
+    german = "<main><p>Keine Ergebnisse gefunden</p></main>"
+    japanese = "<div>検索結果がありません</div>"
+
+    assert not extract_dom_features(german).empty_state_detected
+    assert extract_dom_features(german, keywords=keywords).empty_state_detected
+    assert extract_dom_features(japanese, keywords=keywords).empty_state_detected
+    assert extract_dom_features(
+        japanese, keywords=keywords, streaming_threshold=0
+    ).empty_state_detected
+
+def test_engines_are_reused_and_picklable():
+    sets = KeywordSets(error=["fehler"])
+    engine = build_keyword_engine(sets)
+
+    assert build_keyword_engine(KeywordSets(error=["fehler"])) is engine
+    assert build_keyword_engine() is DEFAULT_KEYWORDS
+    assert pickle.loads(pickle.dumps(engine)).fingerprint == engine.fingerprint
+
+def test_cache_keys_on_keyword_configuration():
+    cache = FeatureCache()
+    dom = "<div>Fehler beim Laden</div>"
+    german = build_keyword_engine(KeywordSets(error=["fehler"]))
+
+    default = cached_extract_dom_features(cache, dom)
+    localized = cached_extract_dom_features(cache, dom, keywords=german)
+
+    assert not default.error_banners
+    assert localized.error_banners
+    assert cache.stats().misses == 2
@@ -0,0 +1,102 @@
+from crawlergraph.context import RunContext, run_config
+from crawlergraph.graph import build_graph
+from crawlergraph.io.input_schema import CrawlConfig, LangGraphInput, ObservationPayload
+from crawlergraph.io.output_schema import LangGraphOutput
+from crawlergraph.loop_state import FIELDS, LoopState
+from crawlergraph.state import CrawlState, PageFeatures, PageType, RuntimeSignals, StopReason
+
+
+LOGIN_DOM = """
+<form action="/login">
+  <input type="text" name="username">
+  <input type="password" name="password">
+  <button type="submit">Sign in</button>
+</form>
+"""
+
+# Tests
+def test_fields_mirror_crawl_state():
+    assert set(FIELDS) == set(CrawlState.model_fields)
+
+def test_crawl_state_round_trip():
+    state = CrawlState(
+        run_id="r",
+        current_url="https://a.com",
+        visited_pages={"https://a.com"},
+        page_type=PageType.LISTING,
+    )
+
+    loop = LoopState.from_crawl_state(state)
+    back = loop.to_crawl_state()
+
+    assert back.model_dump() == state.model_dump()
+    # Shallow: collections are shared, not copied
+    assert loop.visited_pages is state.visited_pages
+
+def test_from_input_extracts_features_and_limits():
+    context = RunContext()
+    payload = LangGraphInput(
+        run_id="r",
+        start_url="https://a.com",
+        config=CrawlConfig(max_pages=7, max_depth=2),
+        observation=ObservationPayload(
+            url="https://a.com/login",
+            dom=LOGIN_DOM,
+            signals={"console": {"errors": ["boom"]}},
+        ),
+    )
+
+    state = LoopState.from_input(payload, context)
+
+    assert state.page_features.has_password_input
+    assert state.signals.console_error_count == 1
+    assert len(context.messages) == 1
+    assert (state.max_pages, state.max_depth) == (7, 2)
+
+def test_graph_runs_on_loop_state_and_stops_on_policy_stop():
+    context = RunContext()
+    state = LoopState(
+        run_id="r",
+        current_url="https://a.com/broken",
+        signals=RuntimeSignals(status_code=500),
+    )
+
+    result = build_graph().invoke(state, config=run_config(context))
+
+    assert result["page_type"] == PageType.ERROR
+    assert result["stop_reason"] == StopReason.TERMINAL_ERROR
+    assert result["visited_pages"] == {"https://a.com/broken"}
+
+def test_graph_stops_when_no_action_applies():
+    result = build_graph().invoke(LoopState(run_id="r", current_url="https://a.com"))
+
+    assert result["stop_reason"] == StopReason.NO_VALID_ACTIONS
+
+def test_graph_stops_at_page_budget():
+    state = LoopState(
+        run_id="r",
+        current_url="https://a.com/home",
+        page_features=PageFeatures(content_block_count=4),
+        max_pages=1,
+    )
+
+    result = build_graph().invoke(state)
+
+    assert result["page_type"] == PageType.DASHBOARD
+    assert result["stop_reason"] == StopReason.MAX_PAGES_REACHED
+
+def test_output_boundary_validates():
+    context = RunContext()
+    state = LoopState(
+        run_id="r",
+        current_url="https://a.com/broken",
+        signals=RuntimeSignals(status_code=500),
+    )
+    result = LoopState(**build_graph().invoke(state, config=run_config(context)))
+
+    output = result.to_output(context)
+
+    assert isinstance(output, LangGraphOutput)
+    assert output.stop_reason == StopReason.TERMINAL_ERROR
+    assert [d.subtype for d in output.defects] == ["ServerError"]
+    assert [g.subtype for g in output.defect_groups] == ["ServerError"]
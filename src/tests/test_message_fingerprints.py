@@ -0,0 +1,120 @@
+import json
+
+import pytest
+
+from crawlergraph.defects.rules import detect_defects
+from crawlergraph.features.fingerprints import (
+    MessageInterner,
+    fingerprint_message,
+    normalize_message,
+)
+from crawlergraph.features.runtime_collector import RuntimeSignalCollector
+from crawlergraph.features.runtime_features import extract_runtime_features
+from crawlergraph.io.output_schema import LangGraphOutput, PageSummary
+from crawlergraph.state import PageFeatures, PageType
+
+STACK = (
+    "Uncaught TypeError: Cannot read properties of undefined (reading 'id')\n"
+    "    at render (https://app.example.com/static/js/main.{build}.js:{line}:{col})\n"
+    "    at Object.{n} (https://app.example.com/static/js/vendor.js:2:{col})"
+)
+
+
+def stack(i):
+    return STACK.format(build="%08x" % (0xDEADBEEF + i), line=100 + i, col=17 * i, n=i)
+
+@pytest.mark.parametrize("a, b", [
+    ("GET https://a.com/api/users/17 500", "GET https://a.com/api/users/9 500"),
+    ("request 3f2c1a9be00d failed", "request 00aa11bb22cc failed"),
+    ("widget 0x7ffde1 crashed", "widget 0x10 crashed"),
+    ("session 123e4567-e89b-12d3-a456-426614174000 expired",
+     "session 00000000-0000-0000-0000-000000000000 expired"),
+    ("SyntaxError at app.js:10:5", "SyntaxError at app.js:88:21"),
+    ("Retry  in 30s", "Retry in 5s"),
+])
+def test_volatile_parts_are_normalized_away(a, b):
+    assert fingerprint_message(a) == fingerprint_message(b)
+
+def test_distinct_messages_keep_distinct_fingerprints():
+    assert fingerprint_message("TypeError: x is undefined") != fingerprint_message(
+        "ReferenceError: x is not defined"
+    )
+    assert normalize_message("failed after 3 retries") == "failed after <n> retries"
+
+@pytest.mark.parametrize("message, normalized", [
+    ("SyntaxError at app.js:10:5", "SyntaxError at app.js:<pos>"),
+    ("at eval (<anonymous>:1:5)", "at eval (<anonymous>:<pos>)"),
+    ("connect to localhost:8080 refused", "connect to localhost:<n> refused"),
+    ("maintenance window at 12:30", "maintenance window at <n>:<n>"),
+])
+def test_positions_are_only_line_column_suffixes(message, normalized):
+    assert normalize_message(message) == normalized
+
+def test_interner_counts_occurrences_and_keeps_first_sample():
+    interner = MessageInterner()
+
+    fingerprints = {interner.intern(stack(i)) for i in range(20)}
+
+    assert len(fingerprints) == 1 == len(interner)
+    entry = interner.get(fingerprints.pop())
+    assert entry.count == 20
+    assert entry.sample == stack(0)
+
+def test_interned_signals_keep_exact_counts_and_drive_defects():
+    interner = MessageInterner()
+    signals = extract_runtime_features(
+        {"console": {"errors": [stack(1), stack(2), "boom"]}},
+        interner=interner,
+    )
+
+    assert signals.console_errors == []
+    assert sorted(signals.console_error_fingerprints.values()) == [1, 2]
+    assert signals.console_error_count == 3
+
+    defect = next(d for d in detect_defects(PageFeatures(), signals) if d.subtype == "ConsoleError")
+    assert defect.evidence["count"] == 3
+    assert set(defect.evidence["fingerprints"]) <= set(interner.table())
+
+def test_collector_interns_with_bounded_distinct_fingerprints():
+    interner = MessageInterner()
+    collector = RuntimeSignalCollector(buffer_size=2, interner=interner)
+
+    for i in range(100):
+        collector.on_console("error", stack(i))
+        collector.on_console("error", f"unique failure kind {'x' * (i % 5)}")
+
+    signals = collector.snapshot()
+    assert signals.console_error_count == 200
+    assert len(signals.console_error_fingerprints) == 2
+    assert signals.console_errors == []
+
+def test_interning_shrinks_serialized_output_by_an_order_of_magnitude():
+    pages = [
+        {"console": {"errors": [stack(p * 50 + i) for i in range(50)]}}
+        for p in range(40)
+    ]
+    interner = MessageInterner()
+
+    def output(defects, messages):
+        return LangGraphOutput(
+            graph_version="v1",
+            run_id="run",
+            page=PageSummary(url="https://app.example.com", page_type=PageType.ERROR, confidence=0.8),
+            next_action=None,
+            defects=defects,
+            stop_reason=None,
+            messages=messages,
+        ).model_dump_json()
+
+    raw_size = sum(
+        len(output(detect_defects(PageFeatures(), extract_runtime_features(raw)), {}))
+        for raw in pages
+    )
+    interned_defects = [
+        detect_defects(PageFeatures(), extract_runtime_features(raw, interner=interner))
+        for raw in pages
+    ]
+    interned_size = sum(len(output(defects, {})) for defects in interned_defects)
+    interned_size += len(json.dumps({fp: e.model_dump() for fp, e in interner.table().items()}))
+
+    assert interned_size * 10 < raw_size
@@ -0,0 +1,194 @@
+import random
+
+from crawlergraph.context import RunContext, run_config
+from crawlergraph.io.input_schema import CrawlConfig, LangGraphInput, ObservationPayload
+from crawlergraph.loop_state import LoopState
+from crawlergraph.memory.loop_guards import compute_page_hash
+from crawlergraph.memory.near_duplicates import (
+    NearDuplicateIndex,
+    compute_simhash,
+    hamming_distance,
+    max_distance_for,
+    similarity,
+    structural_tokens,
+)
+from crawlergraph.memory.update_memory import update_memory
+from crawlergraph.nodes.loop_guard import loop_guard_node
+from crawlergraph.nodes.update_memory import update_memory_node
+from crawlergraph.reducers import apply_updates
+from crawlergraph.state import StopReason
+
+LOGIN_DOM = (
+    '<html><body><form action="/login"><label>User</label>'
+    '<input name="u" type="text"><input name="p" type="password">'
+    '<button type="submit">Go</button></form></body></html>'
+)
+
+
+def calendar_dom(month, token, weeks=5):
+    rows = "".join(
+        '<tr class="week">'
+        + "".join(
+            f'<td data-day="{day}"><a href="/cal?d={month}-{day}&sid={token}">{day}</a></td>'
+            for day in range(7)
+        )
+        + "</tr>"
+        for _ in range(weeks)
+    )
+    return (
+        f'<html><head><title>{month}</title><meta name="csrf" content="{token}"></head>'
+        f'<body><nav><a href="/">Home</a><a href="/cal?m={month + 1}">Next</a></nav>'
+        f'<form method="post"><input type="hidden" name="csrf" value="{token}"></form>'
+        f'<table id="cal">{rows}</table><footer>Generated at {token}</footer></body></html>'
+    )
+
+def product_dom(sku):
+    return (
+        f'<html><head><title>Product {sku}</title></head><body>'
+        f'<nav><a href="/">Home</a><a href="/cart">Cart</a></nav>'
+        f'<main class="product"><h1>Item {sku}</h1><img src="/img/{sku}.jpg" alt="Item {sku}">'
+        f'<p class="price">{sku}.99</p><p>Description of item {sku}.</p>'
+        f'<form action="/cart/add"><input type="hidden" name="sku" value="{sku}">'
+        f'<button type="submit">Add to cart</button></form></main></body></html>'
+    )
+
+def flip_bits(value, count, rng):
+    for bit in rng.sample(range(64), count):
+        value ^= 1 << bit
+    return value
+
+# Tests
+def test_tokens_ignore_text_and_attribute_values():
+    assert structural_tokens('<A HREF="/x?sid=1" class=a>t</A><br/>') == ["a[class,href]", "br[]"]
+    assert structural_tokens(calendar_dom(1, "abc")) == structural_tokens(calendar_dom(7, "zzz"))
+
+def test_trap_iterations_are_near_duplicates():
+    first = compute_simhash(calendar_dom(1, "abc", weeks=5))
+    later = compute_simhash(calendar_dom(2, "xyz", weeks=6))
+
+    assert compute_page_hash(calendar_dom(1, "abc")) != compute_page_hash(calendar_dom(2, "xyz"))
+    assert similarity(first, later) >= 0.95
+
+def test_different_structures_are_not_near_duplicates():
+    assert similarity(compute_simhash(LOGIN_DOM), compute_simhash(calendar_dom(1, "abc"))) < 0.8
+    assert compute_simhash("no tags here") == 0
+
+def test_threshold_maps_to_distance():
+    assert max_distance_for(1.0) == 0
+    assert max_distance_for(0.95) == 3
+    assert NearDuplicateIndex(threshold=0.9).max_distance == 6
+
+def test_index_matches_brute_force():
+    rng = random.Random(7)
+    index = NearDuplicateIndex(threshold=0.95)
+    representatives = []
+    for _ in range(300):
+        fingerprint = rng.getrandbits(64)
+        index.observe(fingerprint)
+        representatives.append(fingerprint)
+
+    for _ in range(500):
+        base = rng.choice(representatives)
+        probe = flip_bits(base, rng.randint(0, 8), rng)
+        expected = min(hamming_distance(probe, r) for r in representatives) <= 3
+        assert (index.query(probe) is not None) == expected
+
+def test_index_clusters_near_duplicates():
+    rng = random.Random(1)
+    index = NearDuplicateIndex(threshold=0.95)
+    base = rng.getrandbits(64)
+
+    # The first page represents the cluster
+    sizes = [index.observe(base)] + [index.observe(flip_bits(base, 3, rng)) for _ in range(4)]
+
+    assert sizes == [1, 2, 3, 4, 5]
+    assert len(index) == 1
+    assert index.cluster_size(base) == 5
+    assert index.observe(base ^ ((1 << 64) - 1)) == 1
+    assert len(index) == 2
+
+def test_full_index_stops_adding_clusters():
+    index = NearDuplicateIndex(max_clusters=1)
+    index.observe(0)
+
+    assert index.observe((1 << 64) - 1) == 1
+    assert len(index) == 1
+
+def test_loop_guard_stops_on_near_duplicate_trap():
+    context = RunContext(near_duplicates=NearDuplicateIndex(max_cluster_pages=3))
+    config = run_config(context)
+
+    reasons = []
+    for month in range(5):
+        state = LoopState(
+            run_id="r",
+            current_url=f"https://a.com/cal?m={month}",
+            page_simhash=compute_simhash(calendar_dom(month, f"t{month}")),
+        )
+        reasons.append(loop_guard_node(state, config).get("stop_reason"))
+
+    assert reasons == [None, None, None, StopReason.LOOP_DETECTED, StopReason.LOOP_DETECTED]
+
+def test_loop_guard_without_index_ignores_simhash():
+    state = LoopState(run_id="r", current_url="https://a.com", page_simhash=1)
+
+    assert "stop_reason" not in loop_guard_node(state, run_config(RunContext()))
+
+def test_same_layout_pages_do_not_stop_a_default_run():
+    context = RunContext()
+    config = run_config(context)
+
+    for sku in range(29):
+        payload = LangGraphInput(
+            run_id="r",
+            start_url="https://shop.com",
+            config=CrawlConfig(),
+            observation=ObservationPayload(
+                url=f"https://shop.com/products/{sku}", dom=product_dom(sku), signals={},
+            ),
+        )
+        state = LoopState.from_input(payload, context)
+        apply_updates(state, update_memory_node(state, config))
+
+        assert "stop_reason" not in loop_guard_node(state, config)
+    assert context.near_duplicates is None
+
+def test_from_input_fingerprints_page_and_installs_index():
+    context = RunContext()
+    dom = calendar_dom(1, "abc")
+    payload = LangGraphInput(
+        run_id="r",
+        start_url="https://a.com",
+        config=CrawlConfig(near_duplicate_threshold=0.9, near_duplicate_max_pages=4),
+        observation=ObservationPayload(url="https://a.com/cal", dom=dom, signals={}),
+    )
+
+    state = LoopState.from_input(payload, context)
+
+    assert state.page_hash == compute_page_hash(dom)
+    assert state.page_simhash == compute_simhash(dom)
+    assert context.near_duplicates.threshold == 0.9
+    assert context.near_duplicates.max_cluster_pages == 4
+
+def test_disabled_threshold_skips_simhash():
+    context = RunContext()
+    payload = LangGraphInput(
+        run_id="r",
+        start_url="https://a.com",
+        config=CrawlConfig(near_duplicate_threshold=None),
+        observation=ObservationPayload(url="https://a.com", dom=LOGIN_DOM, signals={}),
+    )
+
+    state = LoopState.from_input(payload, context)
+
+    assert state.page_simhash is None
+    assert context.near_duplicates is None
+
+def test_update_memory_records_fingerprints():
+    state = LoopState(run_id="r", current_url="https://a.com")
+
+    update_memory(state, LOGIN_DOM)
+
+    assert state.page_hash == compute_page_hash(LOGIN_DOM)
+    assert state.page_simhash == compute_simhash(LOGIN_DOM)
+    assert state.url_visit_counts["https://a.com/"] == 1
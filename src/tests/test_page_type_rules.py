@@ -0,0 +1,153 @@
+import itertools
+import random
+from typing import Tuple
+
+import pytest
+
+from crawlergraph.classifiers.compiler import compile_page_type_rules
+from crawlergraph.classifiers.page_type import classify_page_type
+from crawlergraph.classifiers.page_type_rules import FALLBACK, PAGE_TYPE_RULES, PageTypeRule
+from crawlergraph.state import PageFeatures, PageType, RuntimeSignals
+from crawlergraph.utils.conditions import Condition
+
+URL_HINTS = [[], ["login"], ["signin", "pagination"], ["otp"], ["error", "auth"], ["verify"]]
+
+# Reference: the hand-written cascade the rule spec replaced
+def _reference_classify(
+    features: PageFeatures,
+    signals: RuntimeSignals
+) -> Tuple[PageType, float]:
+    if signals.status_code >= 500:
+        return PageType.ERROR, 0.99
+    if 400 <= signals.status_code < 500:
+        return PageType.ERROR, 0.95
+    if signals.console_errors and signals.status_code == 200:
+        return PageType.ERROR, 0.8
+
+    if (
+        features.has_password_input
+        and features.has_username_input
+        and features.submit_button_count > 0
+    ):
+        return PageType.LOGIN, 0.95
+    if "login" in features.url_patterns or "signin" in features.url_patterns:
+        return PageType.LOGIN, 0.85
+
+    if any(k in features.url_patterns for k in {"otp", "verify", "challenge", "two-factor"}):
+        return PageType.AUTH_CHALLENGE, 0.8
+    if (
+        features.has_form
+        and features.input_count <= 2
+        and not features.has_password_input
+        and signals.redirect_detected
+    ):
+        return PageType.AUTH_CHALLENGE, 0.75
+
+    if features.empty_state_detected:
+        return PageType.EMPTY, 0.9
+
+    if features.table_count > 0 and features.pagination_controls:
+        return PageType.LISTING, 0.9
+    if features.table_count > 1:
+        return PageType.LISTING, 0.8
+
+    if (
+        features.table_count == 1
+        and not features.pagination_controls
+        and not features.has_form
+    ):
+        return PageType.DETAIL, 0.75
+
+    if (
+        features.has_form
+        and features.input_count >= 3
+        and not features.has_password_input
+        and features.content_block_count <= 3
+    ):
+        return PageType.FORM, 0.8
+
+    if features.pagination_controls and features.table_count == 0:
+        return PageType.PAGINATION, 0.7
+
+    if (
+        features.content_block_count >= 2
+        and not features.has_form
+        and not features.pagination_controls
+        and features.table_count == 0
+        and not features.empty_state_detected
+    ):
+        return PageType.DASHBOARD, 0.6
+
+    return PageType.UNKNOWN, 0.3
+
+def random_pages(count, seed=7):
+    rng = random.Random(seed)
+    pages = []
+    for _ in range(count):
+        features = PageFeatures(
+            has_form=rng.random() < 0.5,
+            has_username_input=rng.random() < 0.3,
+            has_password_input=rng.random() < 0.3,
+            input_count=rng.randint(0, 5),
+            submit_button_count=rng.randint(0, 2),
+            content_block_count=rng.randint(0, 5),
+            table_count=rng.randint(0, 3),
+            pagination_controls=rng.random() < 0.4,
+            error_banners=rng.random() < 0.2,
+            empty_state_detected=rng.random() < 0.2,
+            url_patterns=rng.choice(URL_HINTS),
+        )
+        signals = RuntimeSignals(
+            status_code=rng.choice([200, 200, 200, 301, 404, 451, 500, 503]),
+            redirect_detected=rng.random() < 0.3,
+            console_errors=["boom"] if rng.random() < 0.2 else [],
+        )
+        pages.append((features, signals))
+    return pages
+
+# Tests
+def test_compiled_rules_match_reference_on_random_pages():
+    for features, signals in random_pages(5000):
+        assert classify_page_type(features, signals) == _reference_classify(features, signals)
+
+def test_compiled_rules_match_reference_on_boolean_grid():
+    flags = ["has_form", "has_username_input", "has_password_input",
+             "pagination_controls", "empty_state_detected"]
+    for values in itertools.product([False, True], repeat=len(flags)):
+        for tables, inputs, blocks in itertools.product([0, 1, 2], [0, 2, 3], [1, 2, 4]):
+            features = PageFeatures(
+                table_count=tables,
+                input_count=inputs,
+                content_block_count=blocks,
+                submit_button_count=1,
+                **dict(zip(flags, values)),
+            )
+            for redirect in (False, True):
+                signals = RuntimeSignals(redirect_detected=redirect)
+                assert classify_page_type(features, signals) == _reference_classify(features, signals)
+
+def test_each_field_is_read_once():
+    source = compile_page_type_rules(PAGE_TYPE_RULES, FALLBACK).__source__
+
+    assert source.count("signals.status_code") == 1
+    assert source.count("features.table_count") == 1
+
+def test_condition_accepts_tuples_and_rejects_unknown_operators():
+    condition = Condition.model_validate(("features.table_count", ">", 1))
+
+    assert condition.evaluate({"features": PageFeatures(table_count=2)})
+    with pytest.raises(ValueError):
+        Condition.model_validate(("features.table_count", "~", 1))
+    with pytest.raises(ValueError):
+        Condition.model_validate(("table_count", ">", 1))
+
+def test_rules_reading_unknown_inputs_are_rejected():
+    rule = PageTypeRule(
+        name="bad",
+        page_type=PageType.ERROR,
+        confidence=0.5,
+        when=[("browser.status", "true")],
+    )
+
+    with pytest.raises(ValueError):
+        compile_page_type_rules([rule], FALLBACK)
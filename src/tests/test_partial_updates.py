@@ -0,0 +1,132 @@
+from langgraph.errors import GraphRecursionError
+
+from crawlergraph.graph import build_graph
+from crawlergraph.loop_state import LoopState
+from crawlergraph.memory.update_memory import update_memory
+from crawlergraph.nodes.classify_page import classify_page
+from crawlergraph.nodes.decide_action import decide_action_node
+from crawlergraph.nodes.loop_guard import loop_guard_node
+from crawlergraph.nodes.update_memory import update_memory_node
+from crawlergraph.reducers import add_counts, add_members, append_records, apply_updates
+from crawlergraph.state import (
+    ActionType,
+    CrawlState,
+    PageFeatures,
+    PageType,
+    RuntimeSignals,
+    StopReason,
+)
+
+
+def dashboard(**kwargs):
+    return LoopState(
+        run_id="r",
+        current_url="https://a.com/home",
+        page_features=PageFeatures(content_block_count=4),
+        max_pages=10**6,
+        **kwargs,
+    )
+
+# Tests
+def test_nodes_return_only_changed_keys():
+    state = dashboard(visited_pages={f"https://a.com/{i}" for i in range(1000)})
+
+    assert set(classify_page(state)) == {"page_type", "page_confidence"}
+    assert set(update_memory_node(state)) == {"normalized_url", "visited_pages", "url_visit_counts"}
+    assert update_memory_node(state)["visited_pages"] == {"https://a.com/home"}
+    assert loop_guard_node(state) == {}
+
+def test_nodes_do_not_mutate_their_input():
+    state = dashboard(page_hash="h1")
+    before = state.as_dict().copy()
+
+    decide_action_node(state)
+    update_memory_node(state)
+    loop_guard_node(state)
+
+    assert state.visited_pages == set() and state.action_history == []
+    assert state.loop_counters == {}
+    assert state.as_dict() == before
+
+def test_loop_guard_reports_stop_reason_only_when_stopping():
+    state = dashboard(page_hash="h1", loop_counters={"h1": 1})
+
+    assert loop_guard_node(state) == {
+        "stop_reason": StopReason.LOOP_DETECTED,
+        "loop_counters": {"h1": 1},
+    }
+
+def test_apply_updates_uses_reducers():
+    state = CrawlState(run_id="r", current_url="https://a.com/", url_visit_counts={"https://a.com/": 2})
+
+    apply_updates(state, {"url_visit_counts": {"https://a.com/": 1}, "page_type": PageType.FORM})
+    update_memory(state)
+
+    assert state.url_visit_counts == {"https://a.com/": 4}
+    assert state.visited_pages == {"https://a.com/"}
+    assert state.page_type == PageType.FORM
+
+def test_graph_accumulates_collections_across_steps():
+    steps = 6
+    values = []
+    try:
+        for chunk in build_graph().stream(
+            dashboard(), {"recursion_limit": steps * 5}, stream_mode="values",
+        ):
+            values.append(chunk)
+    except GraphRecursionError:
+        pass
+
+    final = values[-1]
+    assert len(final["action_history"]) == steps
+    assert final["url_visit_counts"] == {"https://a.com/home": steps}
+    assert all(r.action == ActionType.CLICK for r in final["action_history"])
+    assert "stop_reason" not in final or final["stop_reason"] is None
+
+def test_streamed_chunks_are_not_changed_by_later_steps():
+    chunks, seen = [], []
+    try:
+        for chunk in build_graph().stream(dashboard(), {"recursion_limit": 20}, stream_mode="values"):
+            chunks.append(chunk)
+            seen.append((len(chunk["action_history"]), dict(chunk["url_visit_counts"])))
+    except GraphRecursionError:
+        pass
+
+    assert [(len(c["action_history"]), c["url_visit_counts"]) for c in chunks] == seen
+    assert seen[0] == (0, {}) and seen[-1][0] > 1
+
+def test_reducers_leave_their_inputs_alone():
+    history, visited, counts = [], {"a"}, {"a": 1}
+
+    assert append_records(history, ["x"]) == ["x"] and history == []
+    assert add_members(visited, {"b"}) == {"a", "b"} and visited == {"a"}
+    assert add_counts(counts, {"a": 2}) == {"a": 3} and counts == {"a": 1}
+
+def test_graph_input_collections_are_merged_not_replaced():
+    state = LoopState(
+        run_id="r",
+        current_url="https://a.com/x",
+        visited_pages={"https://a.com/old"},
+        url_visit_counts={"https://a.com/x": 2},
+        signals=RuntimeSignals(status_code=500),
+    )
+
+    final = build_graph().invoke(state)
+
+    assert final["visited_pages"] == {"https://a.com/old", "https://a.com/x"}
+    assert final["url_visit_counts"] == {"https://a.com/x": 3}
+    assert [r.action for r in final["action_history"]] == [ActionType.STOP]
+    # The caller's collections are untouched
+    assert state.visited_pages == {"https://a.com/old"}
+
+def test_crawl_state_graph_uses_the_same_reducers():
+    state = CrawlState(
+        run_id="r",
+        current_url="https://a.com/x",
+        visited_pages={"https://a.com/old"},
+    )
+
+    final = build_graph(CrawlState).invoke(state)
+
+    assert final["visited_pages"] == {"https://a.com/old", "https://a.com/x"}
+    assert final["stop_reason"] == StopReason.NO_VALID_ACTIONS
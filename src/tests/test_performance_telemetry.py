@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from crawlergraph.context import RunContext, run_config
+from crawlergraph.defects.rules import detect_defects
+from crawlergraph.memory.performance import OVERFLOW_TEMPLATE, PerformanceAggregator
+from crawlergraph.nodes.analyze_defects import analyze_defects
+from crawlergraph.state import CrawlState, PageFeatures, PageType, RuntimeSignals
+from crawlergraph.utils.sketches import QuantileSketch
+from crawlergraph.utils.urls import url_template
+
+
+def test_sketch_quantiles_are_within_relative_accuracy():
+    rng = random.Random(3)
+    values = sorted(rng.lognormvariate(6, 1) for _ in range(20_000))
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for v in values:
+        sketch.add(v)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+
+def test_sketch_memory_is_bounded_by_value_range():
+    sketch = QuantileSketch()
+    for v in range(1, 200_000, 7):
+        sketch.add(v)
+
+    assert len(sketch._buckets) <= sketch.max_buckets < 1000
+
+def test_sketches_merge():
+    a, b, both = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for v in range(1, 1000):
+        (a if v % 2 else b).add(v)
+        both.add(v)
+    a.merge(b)
+
+    assert a.quantile(0.9) == both.quantile(0.9)
+    assert a.count == 999
+
+def test_url_template_groups_record_pages():
+    assert url_template("https://a.com/users/42/edit?tab=2") == url_template("https://A.com/users/7/edit?tab=9")
+    assert url_template("https://a.com/users/42") != url_template("https://a.com/orders/42")
+
+def test_percentiles_per_page_type_and_template():
+    perf = PerformanceAggregator()
+    for i in range(100):
+        perf.observe(PageType.LISTING, f"https://a.com/orders/{i}", RuntimeSignals(page_load_time_ms=1000 + i))
+
+    by_type = perf.percentiles("page_load_time_ms", page_type=PageType.LISTING)
+    by_template = perf.percentiles("page_load_time_ms", template="a.com/orders/{id}")
+
+    assert by_type == by_template
+    assert by_type.count == 100
+    assert by_type.p50 == pytest.approx(1049.5, rel=0.01)
+    assert perf.percentiles("long_tasks_ms", page_type=PageType.LISTING) is None
+    assert "LISTING" in perf.summary().by_page_type["page_load_time_ms"]
+
+def test_template_outlier_flagged_below_fixed_threshold():
+    perf = PerformanceAggregator(min_samples=20)
+    for i in range(50):
+        perf.observe(PageType.DETAIL, f"https://a.com/items/{i}", RuntimeSignals(page_load_time_ms=400))
+
+    slow = RuntimeSignals(page_load_time_ms=1500)
+    defects = detect_defects(PageFeatures(), slow, url="https://a.com/items/99", performance=perf)
+
+    assert [d.subtype for d in defects] == ["SlowPageLoadForTemplate"]
+    assert defects[0].evidence["template"] == "a.com/items/{id}"
+    # Unknown templates and too-few samples are not judged
+    assert detect_defects(PageFeatures(), slow, url="https://a.com/new/1", performance=perf) == []
+
+def test_templates_beyond_cap_share_overflow_group():
+    perf = PerformanceAggregator(max_templates=2)
+    for name in ["a", "b", "c", "d"]:
+        perf.observe(PageType.DASHBOARD, f"https://a.com/{name}", RuntimeSignals(page_load_time_ms=100))
+
+    assert perf.percentiles("page_load_time_ms", template=OVERFLOW_TEMPLATE).count == 2
+
+def test_overflow_templates_are_judged_against_overflow_group():
+    perf = PerformanceAggregator(max_templates=1, min_samples=20)
+    perf.observe(PageType.DETAIL, "https://a.com/home", RuntimeSignals(page_load_time_ms=100))
+    for i in range(30):
+        perf.observe(PageType.DETAIL, f"https://a.com/section-{i}/x", RuntimeSignals(page_load_time_ms=400))
+
+    outliers = perf.outliers("https://a.com/never-seen/x", RuntimeSignals(page_load_time_ms=1500))
+
+    assert [(o.template, o.samples) for o in outliers] == [(OVERFLOW_TEMPLATE, 30)]
+
+def test_node_uses_run_context_from_config():
+    context = RunContext(performance=PerformanceAggregator(min_samples=5))
+    config = run_config(context)
+
+    for i in range(10):
+        state = CrawlState(run_id="r", current_url=f"https://a.com/p/{i}")
+        state.signals = RuntimeSignals(page_load_time_ms=200)
+        analyze_defects(state, config)
+
+    state = CrawlState(run_id="r", current_url="https://a.com/p/11")
+    state.signals = RuntimeSignals(page_load_time_ms=900)
+    updates = analyze_defects(state, config)
+
+    assert [d.subtype for d in updates["detected_defects"]] == ["SlowPageLoadForTemplate"]
+    assert context.performance.percentiles("page_load_time_ms", template="a.com/p/{id}").count == 11
@@ -0,0 +1,144 @@
+import sqlite3
+
+import pytest
+
+from crawlergraph.context import RunContext, run_config
+from crawlergraph.defects.models import Defect, DefectCategory
+from crawlergraph.io import result_store
+from crawlergraph.io.result_store import (
+    PageRecord,
+    ParquetResultStore,
+    ResultStore,
+    SQLiteResultStore,
+    open_result_store,
+)
+from crawlergraph.nodes.analyze_defects import analyze_defects
+from crawlergraph.state import CrawlState, PageType, RuntimeSignals
+
+
+def defect(category, subtype, severity=5, **evidence):
+    return Defect(
+        category=category,
+        subtype=subtype,
+        severity=severity,
+        confidence=0.8,
+        description=subtype,
+        evidence=evidence,
+    )
+
+def fill(store, pages=300):
+    for i in range(pages):
+        page_type = [PageType.LOGIN, PageType.LISTING, PageType.ERROR][i % 3]
+        defects = [defect(DefectCategory.FUNCTIONAL, "ConsoleError", errors=[f"e{i}"])]
+        if i % 5 == 0:
+            defects.append(defect(DefectCategory.SECURITY, "MixedContent", severity=8, url=f"/{i}"))
+        store.append(
+            PageRecord(run_id="r1", url=f"https://a.com/{i}", page_type=page_type, confidence=0.9),
+            defects,
+        )
+
+@pytest.fixture(params=["sqlite", "parquet"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        s = SQLiteResultStore(tmp_path / "results.db", batch_size=64)
+    else:
+        pytest.importorskip("pyarrow")
+        s = ParquetResultStore(tmp_path / "results", batch_size=64)
+    yield s
+    s.close()
+
+# Tests
+def test_filters_defects_by_category_and_page_type(store):
+    fill(store)
+
+    found = list(store.query_defects(category=DefectCategory.SECURITY, page_type=PageType.LOGIN))
+
+    expected = [i for i in range(300) if i % 5 == 0 and i % 3 == 0]
+    assert [d.url for d in found] == [f"https://a.com/{i}" for i in expected]
+    assert all(d.subtype == "MixedContent" and d.page_type == PageType.LOGIN for d in found)
+    assert found[0].evidence == {"url": f"/{expected[0]}"}
+
+def test_filters_accept_lists_and_minimums(store):
+    fill(store)
+
+    assert len(list(store.query_defects(min_severity=8))) == 60
+    assert len(list(store.query_defects(subtype=["ConsoleError", "MixedContent"]))) == 360
+    assert len(list(store.query_pages(page_type=[PageType.LOGIN, PageType.ERROR]))) == 200
+    assert len(list(store.query_pages(min_defects=2))) == 60
+
+def test_records_round_trip(store):
+    page = PageRecord(
+        run_id="r", url="https://a.com/", page_type=PageType.FORM, confidence=0.8,
+        status_code=404, page_load_time_ms=1234, defect_count=1,
+    )
+    original = defect(DefectCategory.UI, "LayoutOverlap", nested={"a": [1, 2]})
+    store.append(page, [original])
+
+    [stored_page] = store.query_pages(run_id="r")
+    [stored_defect] = store.query_defects(run_id="r")
+
+    assert stored_page == page
+    assert stored_defect.model_dump(include=set(Defect.model_fields)) == original.model_dump()
+
+def test_sqlite_writes_in_batches_with_wal(tmp_path):
+    path = tmp_path / "results.db"
+    store = SQLiteResultStore(path, batch_size=100)
+    fill(store, pages=40)
+
+    # 40 pages + 48 defects buffered; nothing written yet
+    reader = sqlite3.connect(path)
+    assert reader.execute("SELECT count(*) FROM defects").fetchone() == (0,)
+    assert reader.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+    fill(store, pages=10)
+    assert reader.execute("SELECT count(*) FROM pages").fetchone()[0] > 0
+    store.close()
+    assert reader.execute("SELECT count(*) FROM pages").fetchone() == (50,)
+
+def test_store_is_append_only_across_sessions(tmp_path):
+    for _ in range(2):
+        with open_result_store(tmp_path / "results.db") as store:
+            fill(store, pages=10)
+
+    with open_result_store(tmp_path / "results.db") as store:
+        assert len(list(store.query_pages())) == 20
+
+def test_backend_is_chosen_by_path_not_by_installed_packages(tmp_path, monkeypatch):
+    with open_result_store(tmp_path / "results") as store:
+        assert isinstance(store, SQLiteResultStore)
+
+    monkeypatch.setattr(result_store, "pa", None)
+    with pytest.raises(ImportError):
+        open_result_store(tmp_path / "results.parquet")
+
+def test_part_names_are_unique_and_ordered():
+    names = [result_store._part_name() for _ in range(1_000)]
+
+    assert len(set(names)) == 1_000
+    stamps = [name.split("-")[1] for name in names]
+    assert stamps == sorted(stamps)
+
+def test_backends_must_implement_the_hooks():
+    class Partial(ResultStore):
+        def _write_pages(self, rows):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()
+
+def test_node_writes_page_results_to_store(tmp_path):
+    store = SQLiteResultStore(tmp_path / "results.db")
+    context = RunContext(store=store)
+    for i in range(3):
+        state = CrawlState(
+            run_id="run",
+            start_url="https://a.com",
+            current_url=f"https://a.com/{i}",
+            page_type=PageType.ERROR,
+            signals=RuntimeSignals(status_code=500),
+        )
+        analyze_defects(state, config=run_config(context))
+
+    assert [p.defect_count for p in store.query_pages(run_id="run")] == [1, 1, 1]
+    assert {d.subtype for d in store.query_defects(page_type=PageType.ERROR)} == {"ServerError"}
+    store.close()
@@ -0,0 +1,80 @@
+import tracemalloc
+
+import pytest
+
+from crawlergraph.classifiers.page_type import classify_page_type
+from crawlergraph.defects.rules import detect_defects
+from crawlergraph.features.runtime_collector import RuntimeSignalCollector
+from crawlergraph.features.runtime_features import extract_runtime_features
+from crawlergraph.state import PageFeatures, PageType, RuntimeSignals
+
+
+def test_snapshot_matches_batch_extraction():
+    raw = {
+        "status_code": 302,
+        "console": {"errors": ["a", "b"], "warnings": ["w"]},
+        "network": {"errors": ["timeout"], "failed_requests": 2},
+        "layout": {"overlaps": True},
+        "performance": {"long_tasks_ms": 250, "page_load_time_ms": 3100},
+    }
+    collector = RuntimeSignalCollector()
+    for event in [
+        {"type": "navigation", "status_code": 302, "page_load_time_ms": 3100},
+        {"type": "console", "level": "error", "text": "a"},
+        {"type": "console", "level": "warning", "text": "w"},
+        {"type": "console", "level": "info", "text": "ignored"},
+        {"type": "console", "level": "error", "text": "b"},
+        {"type": "network_error", "text": "timeout"},
+        {"type": "request_failed", "count": 2},
+        {"type": "long_task", "duration_ms": 150},
+        {"type": "long_task", "duration_ms": 100},
+        {"type": "layout", "overlaps": True},
+    ]:
+        collector.ingest(event)
+
+    assert collector.snapshot() == extract_runtime_features(raw)
+
+def test_noisy_page_keeps_recent_messages_and_exact_counts():
+    collector = RuntimeSignalCollector(buffer_size=3, max_message_chars=8)
+
+    for i in range(10_000):
+        collector.on_console("error", f"reconnect failed #{i}")
+
+    signals = collector.snapshot()
+    assert signals.console_error_count == 10_000
+    assert signals.console_errors == ["reconnec"] * 3
+    assert len(collector.console_errors) == 3
+
+def test_memory_stays_bounded():
+    collector = RuntimeSignalCollector(buffer_size=10)
+    for i in range(1_000):
+        collector.on_network_error(f"ws closed {i}")
+
+    tracemalloc.start()
+    for i in range(20_000):
+        collector.on_network_error(f"ws closed {i}" * 10)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < 64 * 1024
+    assert collector.network_error_count == 21_000
+
+def test_counts_drive_classification_and_defects_without_messages():
+    collector = RuntimeSignalCollector(buffer_size=0)
+    collector.on_console("error", "Uncaught TypeError")
+    signals = collector.snapshot()
+
+    assert signals.console_errors == []
+    assert classify_page_type(PageFeatures(), signals)[0] == PageType.ERROR
+    assert "ConsoleError" in [d.subtype for d in detect_defects(PageFeatures(), signals)]
+
+def test_counts_default_to_message_lengths():
+    signals = RuntimeSignals(console_errors=["x", "y"], network_errors=["z"])
+
+    assert signals.console_error_count == 2
+    assert signals.network_error_count == 1
+    assert signals.console_warning_count == 0
+
+def test_unknown_event_type_is_rejected():
+    with pytest.raises(ValueError):
+        RuntimeSignalCollector().ingest({"type": "websocket"})
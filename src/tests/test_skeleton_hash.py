@@ -0,0 +1,112 @@
+from pathlib import Path
+
+import pytest
+
+from crawlergraph.features import skeleton as skeleton_module
+from crawlergraph.features.cache import FeatureCache, cached_extract_dom_features
+from crawlergraph.features.dom_features import extract_dom_features
+from crawlergraph.features.skeleton import SkeletonHasher
+from crawlergraph.io.input_schema import CrawlConfig, LangGraphInput, ObservationPayload
+from crawlergraph.loop_state import LoopState
+from crawlergraph.memory.loop_guards import (
+    check_loop_conditions,
+    compute_page_hash,
+    compute_skeleton_hash,
+)
+from crawlergraph.memory.update_memory import update_memory
+from crawlergraph.nodes.loop_guard import loop_guard_node
+from crawlergraph.reducers import apply_updates
+from crawlergraph.state import CrawlState, StopReason
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+FIXTURES = sorted(p.name for p in FIXTURE_DIR.glob("*.html"))
+
+
+def news_page(headline, token):
+    return (
+        f'<html><body><form><input type="hidden" name="csrf" value="{token}"></form>'
+        f'<article class="story"><h1>{headline}</h1><p>Updated {token}</p></article></body></html>'
+    )
+
+# Tests
+def test_text_and_attribute_values_do_not_change_skeleton():
+    first, second = news_page("Rain", "t1"), news_page("Sun", "t2")
+
+    assert compute_page_hash(first) != compute_page_hash(second)
+    assert compute_skeleton_hash(first) == compute_skeleton_hash(second)
+
+def test_structure_and_attribute_names_change_skeleton():
+    base = compute_skeleton_hash("<div><p>x</p></div>")
+
+    assert compute_skeleton_hash("<div><span>x</span></div>") != base
+    assert compute_skeleton_hash("<div><p></p><p></p></div>") != base
+    assert compute_skeleton_hash('<div id="a"><p>x</p></div>') != base
+    assert compute_skeleton_hash('<div><p class="a" id="b">x</p></div>') == compute_skeleton_hash(
+        '<div><p id="c" class="d">y</p></div>'
+    )
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_extraction_yields_the_standalone_hash(name):
+    dom = (FIXTURE_DIR / name).read_text(encoding="utf-8")
+
+    hashes = []
+    for threshold in (None, 0):
+        hasher = SkeletonHasher()
+        extract_dom_features(dom, streaming_threshold=threshold, skeleton=hasher)
+        hashes.append(hasher.hexdigest())
+
+    assert hashes == [compute_skeleton_hash(dom)] * 2
+
+def test_blake2b_fallback_without_xxhash(monkeypatch):
+    dom = "<ul>" + "<li>x</li>" * 2_000 + "</ul>"
+    with_xxhash = compute_skeleton_hash(dom)
+    monkeypatch.setattr(skeleton_module, "xxhash", None)
+
+    fallback = compute_skeleton_hash(dom)
+
+    assert len(fallback) == 16
+    assert fallback == compute_skeleton_hash(dom.replace("x", "y"))
+    assert fallback != with_xxhash
+
+def test_from_input_records_both_fingerprints():
+    dom = news_page("Rain", "t1")
+    payload = LangGraphInput(
+        run_id="r",
+        start_url="https://a.com",
+        config=CrawlConfig(loop_fingerprint="skeleton"),
+        observation=ObservationPayload(url="https://a.com/news", dom=dom, signals={}),
+    )
+
+    state = LoopState.from_input(payload)
+
+    assert state.page_hash == compute_page_hash(dom)
+    assert state.skeleton_hash == compute_skeleton_hash(dom)
+    assert state.loop_fingerprint == "skeleton"
+
+def test_loop_guard_keys_on_the_configured_fingerprint():
+    fingerprints = {"page_hash": "content-1", "skeleton_hash": "skeleton-1"}
+    content = LoopState(run_id="r", current_url="https://a.com", **fingerprints)
+    skeleton = LoopState(run_id="r", current_url="https://a.com", loop_fingerprint="skeleton", **fingerprints)
+
+    assert loop_guard_node(content)["loop_counters"] == {"content-1": 1}
+    apply_updates(skeleton, loop_guard_node(skeleton))
+    assert skeleton.loop_counters == {"skeleton-1": 1}
+    assert loop_guard_node(skeleton)["stop_reason"] == StopReason.LOOP_DETECTED
+
+def test_check_loop_conditions_on_skeleton():
+    state = CrawlState(run_id="r", current_url="https://a.com", loop_fingerprint="skeleton")
+    update_memory(state, news_page("Rain", "t1"))
+
+    assert check_loop_conditions(state, news_page("Sun", "t2")) is True
+    assert state.stop_reason == "Duplicate page content detected"
+
+def test_cache_can_key_on_skeleton():
+    cache = FeatureCache()
+    first, second = news_page("Rain", "t1"), news_page("Sun", "t2")
+
+    cached_extract_dom_features(cache, first, key_on="skeleton")
+    cached_extract_dom_features(cache, second, skeleton_hash=compute_skeleton_hash(second), key_on="skeleton")
+    cached_extract_dom_features(cache, second)
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 2)
@@ -0,0 +1,75 @@
+import pytest
+
+from crawlergraph.features.dom_features import extract_dom_features
+from crawlergraph.features.streaming import (
+    StreamingFeatureExtractor,
+    extract_dom_features_streaming,
+)
+from crawlergraph.io.input_schema import CrawlConfig
+from .test_dom_feature_parity import EDGE_CASES, FIXTURES, _reference_features
+from .utils import load_fixture
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_streaming_matches_reference_on_fixtures(name):
+    dom = load_fixture(name)
+    url = "https://example.com/login?page=2"
+
+    features = extract_dom_features_streaming(dom, url, chunk_size=4096)
+
+    assert features == _reference_features(dom, url)
+
+@pytest.mark.parametrize("dom", EDGE_CASES + [
+    "<div>no results<input>more</input></div>",
+    "<p>a<br/>b</p><span>x</span>",
+    "<div><span>unclosed error</div>",
+    "</div><div>stray end tag</div>",
+    "<a href='#'>Ne<!-- c -->xt</a>",
+    "<div><input><br><input></input></br></input></input><form></form></div>",
+])
+def test_streaming_matches_reference_with_tiny_chunks(dom):
+    chunks = [dom[i:i + 3] for i in range(0, len(dom), 3)]
+
+    assert extract_dom_features_streaming(chunks) == _reference_features(dom)
+
+def test_large_listing_is_routed_to_streaming(monkeypatch):
+    rows = "".join(f"<tr><td>Row {i}</td></tr>" for i in range(10_000))
+    dom = f"<html><body><table>{rows}</table><a href='?page=2'>Next</a></body></html>"
+
+    parsed = extract_dom_features(dom, streaming_threshold=None)
+
+    def no_tree(*args, **kwargs):
+        raise AssertionError("large input should not build a tree")
+
+    monkeypatch.setattr("crawlergraph.features.dom_features.parse_into", no_tree)
+    streamed = extract_dom_features(dom, streaming_threshold=len(dom))
+
+    assert streamed == parsed
+    assert streamed.table_count == 1
+    assert streamed.pagination_controls is True
+
+def test_many_void_elements_stay_linear():
+    rows = "".join(f"<tr><td><input name='q{i}'><br></td></tr>" for i in range(20_000))
+    dom = f"<table>{rows}</table>"
+    extractor = StreamingFeatureExtractor()
+
+    extractor.feed(dom)
+    features = extractor.finish()
+
+    assert (features.input_count, features.table_count) == (20_000, 1)
+    # One counter per void tag, not one entry per occurrence
+    assert extractor._closed_void == {"input": 20_000, "br": 20_000}
+
+def test_streaming_stops_buffering_text_once_settled():
+    extractor = StreamingFeatureExtractor()
+    extractor.feed("<div class='error'>no results</div><a>next</a>")
+    extractor.feed("<p>" + "filler " * 1000 + "</p>")
+
+    assert extractor.visitor.wants_text is False
+    assert extractor._pending_text == []
+
+    features = extractor.finish()
+    assert features.error_banners and features.empty_state_detected
+
+def test_crawl_config_streaming_threshold_default():
+    assert CrawlConfig().streaming_threshold_chars > 0
@@ -0,0 +1,147 @@
+import random
+
+from crawlergraph.context import RunContext, run_config
+from crawlergraph.graph import build_graph
+from crawlergraph.io.input_schema import CrawlConfig, LangGraphInput, ObservationPayload
+from crawlergraph.loop_state import LoopState
+from crawlergraph.memory.transitions import TransitionGraph, action_key
+from crawlergraph.nodes.loop_guard import loop_guard_node
+from crawlergraph.state import ActionDecision, ActionType, StopReason
+
+
+def click(target):
+    return ActionDecision(action=ActionType.CLICK, target=target, rationale="test", confidence=0.7)
+
+def reaches(edges, start, goal):
+    seen, stack = {start}, [start]
+    while stack:
+        node = stack.pop()
+        if node == goal:
+            return True
+        for w in edges.get(node, ()):
+            if w not in seen:
+                seen.add(w)
+                stack.append(w)
+    return False
+
+def assert_topological(graph):
+    for u, targets in enumerate(graph._out):
+        for v in targets:
+            assert graph._order[u] < graph._order[v]
+
+# Tests
+def test_multi_page_cycle_is_detected_when_it_closes():
+    graph = TransitionGraph()
+
+    assert graph.add("A", "next", "B") == 0
+    assert graph.add("B", "next", "C") == 0
+    assert graph.add("C", "home", "A") == 1
+    assert graph.closes_cycle("C", "home")
+    assert not graph.closes_cycle("A", "next")
+    assert graph.add("C", "home", "A") == 2
+
+def test_self_loop_and_repeated_edges():
+    graph = TransitionGraph()
+
+    assert graph.add("A", "reload", "A") == 1
+    assert graph.add("A", "next", "B") == 0
+    assert graph.add("A", "next", "B") == 0
+    assert (len(graph), graph.edge_count) == (2, 2)
+
+def test_matches_brute_force_on_random_edges():
+    rng = random.Random(3)
+    graph = TransitionGraph()
+    accepted = {}
+
+    for _ in range(2_000):
+        u, v = str(rng.randrange(150)), str(rng.randrange(150))
+        closes = u == v or reaches(accepted, v, u)
+        # Only edges that close a cycle are not inserted
+        assert (graph.add(u, "a", v) > 0) == closes
+        if not closes:
+            accepted.setdefault(u, set()).add(v)
+
+    assert_topological(graph)
+
+def test_reverse_order_insertions_stay_topological():
+    graph = TransitionGraph()
+    for i in range(500, 0, -1):
+        assert graph.add(f"p{i - 1}", "next", f"p{i}") == 0
+
+    assert_topological(graph)
+    assert graph.add("p500", "home", "p0") == 1
+
+def test_large_forward_crawl_is_cheap():
+    graph = TransitionGraph()
+    for i in range(200_000):
+        graph.add(f"p{i}", "next", f"p{i + 1}")
+
+    assert len(graph) == 200_001
+    assert graph.add("p200000", "home", "p199990") == 1
+
+def test_advance_links_consecutive_pages():
+    graph = TransitionGraph()
+    laps = [
+        [graph.advance(page, "next") for page in ("A", "B", "C")]
+        for _ in range(3)
+    ]
+
+    assert laps == [[0, 0, 0], [1, 0, 0], [2, 0, 0]]
+    graph.advance("D", None)
+    assert graph.advance("A", "next") == 0
+
+def test_loop_guard_stops_on_repeated_cycle():
+    context = RunContext(transitions=TransitionGraph(max_cycle_repeats=1))
+    config = run_config(context)
+
+    reasons = []
+    for page in ["A", "B", "C"] * 3:
+        state = LoopState(
+            run_id="r",
+            current_url=f"https://a.com/{page}",
+            page_hash=page,
+            next_action=click(f"#from-{page}"),
+        )
+        reasons.append(loop_guard_node(state, config).get("stop_reason"))
+
+    assert reasons == [None] * 6 + [StopReason.LOOP_DETECTED, None, None]
+    assert context.transitions.closes_cycle("C", action_key(click("#from-C")))
+
+def test_from_input_installs_transition_graph():
+    context = RunContext()
+    payload = LangGraphInput(
+        run_id="r",
+        start_url="https://a.com",
+        config=CrawlConfig(max_cycle_repeats=5),
+        observation=ObservationPayload(url="https://a.com", dom="<p>x</p>", signals={}),
+    )
+
+    LoopState.from_input(payload, context)
+
+    assert context.transitions.max_cycle_repeats == 5
+
+def test_graph_records_one_transition_per_observation():
+    context = RunContext()
+    config = CrawlConfig(max_cycle_repeats=None)
+    listing = (
+        "<main><table><tr><td>Page {}</td></tr></table>"
+        "<nav aria-label='pagination'><a href='?p=2'>Next</a></nav></main>"
+    )
+
+    hashes = {}
+    for page in ["A", "B", "C"] * 3:
+        payload = LangGraphInput(
+            run_id="r",
+            start_url="https://a.com",
+            config=config,
+            observation=ObservationPayload(url=f"https://a.com/{page}", dom=listing.format(page), signals={}),
+        )
+        final = build_graph().invoke(LoopState.from_input(payload, context), config=run_config(context))
+        hashes[page] = final["page_hash"]
+        action = action_key(final["next_action"])
+
+    # The graph passes over each observation twice; only C -> A closes a cycle
+    assert (len(context.transitions), context.transitions.edge_count) == (3, 3)
+    assert context.transitions.closes_cycle(hashes["C"], action)
+    assert not context.transitions.closes_cycle(hashes["A"], action)
+    assert not context.transitions.closes_cycle(hashes["B"], action)
@@ -0,0 +1,135 @@
+from crawlergraph.context import RunContext, run_config
+from crawlergraph.graph import build_graph
+from crawlergraph.io.input_schema import CrawlConfig, LangGraphInput, ObservationPayload
+from crawlergraph.loop_state import LoopState
+from crawlergraph.memory.update_memory import update_memory
+from crawlergraph.memory.url_templates import TemplateMiner
+from crawlergraph.nodes.loop_guard import loop_guard_node
+from crawlergraph.nodes.update_memory import update_memory_node
+from crawlergraph.reducers import apply_updates
+from crawlergraph.state import PageFeatures, StopReason
+from crawlergraph.utils.urls import canonicalize_url
+
+
+def observe(url, config=None, dom=""):
+    return LangGraphInput(
+        run_id="r",
+        start_url="https://a.com",
+        config=config or CrawlConfig(),
+        observation=ObservationPayload(url=url, dom=dom, signals={}),
+    )
+
+def visit(url, context):
+    state = LoopState.from_input(observe(url), context)
+    apply_updates(state, update_memory_node(state, run_config(context)))
+    return state, loop_guard_node(state, run_config(context)).get("stop_reason")
+
+# Tests
+def test_canonicalize_url():
+    assert (
+        canonicalize_url("HTTPS://A.com:443/users//42/?utm_source=x&b=2&a=1&fbclid=z#top")
+        == "https://a.com/users/42?a=1&b=2"
+    )
+    assert canonicalize_url("https://a.com") == canonicalize_url("https://a.com/") == "https://a.com/"
+    assert canonicalize_url("http://a.com:8080/x?q=2&q=1") == "http://a.com:8080/x?q=2&q=1"
+    assert canonicalize_url("https://a.com/Path?sid=1", drop_params=["SID"]) == "https://a.com/Path"
+
+def test_id_segments_share_a_template():
+    miner = TemplateMiner()
+
+    results = [miner.observe(f"https://a.com/orders/{i}") for i in range(1, 6)]
+
+    assert results[-1] == ("a.com/orders/{id}", 5)
+    assert miner.template("https://a.com/orders/90000") == "a.com/orders/{id}"
+
+def test_fan_out_is_generalized_with_visits_merged():
+    miner = TemplateMiner(max_fanout=3)
+    for slug in ("red-shoe", "blue-hat", "green-cap"):
+        miner.observe(f"https://a.com/products/{slug}/reviews")
+
+    template, visits = miner.observe("https://a.com/products/grey-scarf/reviews")
+
+    assert (template, visits) == ("a.com/products/{*}/reviews", 4)
+    assert miner.template("https://a.com/products/anything/reviews") == template
+    assert miner.templates() == {"a.com/products/{*}/reviews": 4}
+
+def test_query_names_and_hosts_split_templates():
+    miner = TemplateMiner()
+    miner.observe("https://a.com/search?q=1")
+    miner.observe("https://a.com/search?q=2")
+    miner.observe("https://a.com/search?page=2&q=2")
+    miner.observe("https://b.com/search?q=1")
+
+    assert miner.visits("https://a.com/search?q=9") == 2
+    assert miner.visits("https://a.com/search?page=1&q=9") == 1
+    assert miner.visits("https://b.com/search?q=3") == 1
+    assert miner.visits("https://c.com/search?q=3") == 0
+
+def test_update_memory_keys_visits_by_canonical_url():
+    miner = TemplateMiner()
+    state = LoopState(run_id="r", current_url="https://A.com/x/?utm_medium=mail")
+
+    update_memory(state, templates=miner)
+    state.current_url = "https://a.com/x"
+    update_memory(state, templates=miner)
+
+    assert state.normalized_url == "https://a.com/x"
+    assert state.url_visit_counts == {"https://a.com/x": 2}
+    assert miner.visits("https://a.com/x") == 2
+
+def test_loop_guard_enforces_template_budget():
+    context = RunContext(templates=TemplateMiner(max_visits=3))
+
+    reasons = [visit(f"https://a.com/orders/{i}", context)[1] for i in range(5)]
+    _, other = visit("https://a.com/about", context)
+
+    assert reasons == [None, None, None, StopReason.TEMPLATE_BUDGET_REACHED, StopReason.TEMPLATE_BUDGET_REACHED]
+    assert other is None
+
+def test_unlimited_budget_only_counts():
+    context = RunContext(templates=TemplateMiner(max_visits=None))
+
+    reasons = [visit(f"https://a.com/orders/{i}", context)[1] for i in range(5)]
+
+    assert reasons == [None] * 5
+    assert context.templates.visits("https://a.com/orders/1") == 5
+
+def test_graph_stops_on_template_budget_from_input():
+    context = RunContext()
+    config = CrawlConfig(max_visits_per_template=2)
+
+    reasons = []
+    for i in range(4):
+        payload = observe(f"https://a.com/orders/{i}?utm_source=x", config, dom=f"<p>Order {i}</p>")
+        state = LoopState.from_input(payload, context)
+        state.page_features = PageFeatures(content_block_count=4)
+        final = build_graph().invoke(state, config=run_config(context))
+        reasons.append(final["stop_reason"])
+
+    assert final["normalized_url"] == "https://a.com/orders/3"
+    assert reasons[2:] == [StopReason.TEMPLATE_BUDGET_REACHED] * 2
+    assert StopReason.TEMPLATE_BUDGET_REACHED not in reasons[:2]
+    # The graph passes over each observation twice; each counts once
+    assert context.templates.visits("https://a.com/orders/9") == 4
+
+def test_top_level_sections_keep_separate_budgets():
+    miner = TemplateMiner(max_fanout=16)
+    for i in range(17):
+        miner.observe(f"https://a.com/section-{chr(97 + i)}/overview")
+    for i in range(60):
+        miner.observe(f"https://a.com/orders/{i}")
+
+    assert miner.observe("https://a.com/users/5") == ("a.com/users/{id}", 1)
+    assert miner.template("https://a.com/orders/1") == "a.com/orders/{id}"
+    assert miner.visits("https://a.com/orders/1") == 60
+
+def test_top_level_pages_are_generalized():
+    miner = TemplateMiner(max_fanout=3)
+    miner.observe("https://a.com/orders/1")
+    for name in ("alice", "bob", "carol", "dave"):
+        template, visits = miner.observe(f"https://a.com/{name}")
+
+    assert (template, visits) == ("a.com/{*}", 4)
+    assert miner.template("https://a.com/erin") == "a.com/{*}"
+    assert miner.template("https://a.com/orders/2") == "a.com/orders/{id}"
+    assert miner.template("https://a.com/settings/profile") == "a.com/settings/profile"
@@ -0,0 +1,122 @@
+import random
+
+import pytest
+
+from crawlergraph.graph import build_graph
+from crawlergraph.io.input_schema import CrawlConfig, LangGraphInput, ObservationPayload
+from crawlergraph.loop_state import LoopState
+from crawlergraph.memory.loop_guards import check_loop_conditions
+from crawlergraph.memory.update_memory import update_memory
+from crawlergraph.memory.visit_index import new_visit_index
+from crawlergraph.reducers import apply_updates
+from crawlergraph.state import PageFeatures, StopReason
+from crawlergraph.utils.sketches import CountMinSketch, ScalableBloomFilter
+
+
+def urls(count, prefix="https://a.com/p/"):
+    return [f"{prefix}{i}" for i in range(count)]
+
+def compact_state(url="https://a.com/", **kwargs):
+    visited, counts = new_visit_index(CrawlConfig(visit_index="compact"))
+    return LoopState(
+        run_id="r", current_url=url, visited_pages=visited, url_visit_counts=counts, **kwargs,
+    )
+
+# Tests
+def test_bloom_has_no_false_negatives_while_growing():
+    bloom = ScalableBloomFilter(initial_capacity=1_000, error_rate=0.01)
+    added = urls(20_000)
+    bloom.update(added)
+
+    assert all(url in bloom for url in added)
+    assert len(bloom._slices) > 1
+
+def test_bloom_false_positive_rate_is_bounded():
+    bloom = ScalableBloomFilter(initial_capacity=2_000, error_rate=0.01)
+    bloom.update(urls(30_000))
+
+    probes = urls(50_000, prefix="https://b.com/q/")
+    false_positives = sum(url in bloom for url in probes)
+
+    assert false_positives / len(probes) < 0.01
+
+def test_bloom_length_counts_new_items():
+    bloom = ScalableBloomFilter(error_rate=0.001)
+    bloom |= urls(5_000)
+    bloom |= urls(5_000)
+
+    assert 5_000 * (1 - 0.001) <= len(bloom) <= 5_000
+
+def test_bloom_is_much_smaller_than_a_set():
+    bloom = ScalableBloomFilter(initial_capacity=100_000, error_rate=0.001)
+    bloom.update(urls(100_000))
+
+    assert bloom.nbytes / 100_000 < 2
+
+def test_count_min_never_undercounts_and_is_within_bound():
+    rng = random.Random(2)
+    sketch = CountMinSketch(epsilon=1e-3, delta=0.01)
+    exact = {}
+    for _ in range(50_000):
+        key = f"k{int(rng.paretovariate(1.2)) % 20_000}"
+        exact[key] = exact.get(key, 0) + 1
+        sketch.increment(key)
+
+    errors = [sketch.get(key) - count for key, count in exact.items()]
+    assert min(errors) >= 0
+    bound = 1e-3 * sketch.total
+    assert sum(e > bound for e in errors) / len(errors) <= 0.01
+    assert sketch.get("never seen") <= bound
+
+def test_new_visit_index_follows_config():
+    assert new_visit_index(CrawlConfig()) == (set(), {})
+    visited, counts = new_visit_index(CrawlConfig(visit_index="compact", visit_index_error_rate=0.01))
+    assert visited.error_rate == 0.01
+    assert isinstance(counts, CountMinSketch)
+
+def test_update_memory_and_loop_guard_work_with_compact_index():
+    state = compact_state()
+    for _ in range(3):
+        update_memory(state)
+
+    assert state.current_url in state.visited_pages
+    assert len(state.visited_pages) == 1
+    assert state.url_visit_counts.get(state.current_url, 0) == 3
+    assert check_loop_conditions(state, "<html></html>") is True
+    assert state.stop_reason == "Too many visits to same URL"
+
+def test_graph_runs_with_compact_index_from_input():
+    payload = LangGraphInput(
+        run_id="r",
+        start_url="https://a.com",
+        config=CrawlConfig(visit_index="compact", max_pages=1),
+        observation=ObservationPayload(
+            url="https://a.com/home",
+            dom="<div><p>a</p></div><div><p>b</p></div><div><p>c</p></div>",
+            signals={},
+        ),
+    )
+    state = LoopState.from_input(payload)
+    state.page_features = PageFeatures(content_block_count=4)
+
+    final = build_graph().invoke(state)
+
+    assert isinstance(final["visited_pages"], ScalableBloomFilter)
+    assert "https://a.com/home" in final["visited_pages"]
+    assert final["url_visit_counts"]["https://a.com/home"] == 1
+    assert final["stop_reason"] == StopReason.MAX_PAGES_REACHED
+
+def test_apply_updates_adopts_and_copies_compact_backends():
+    visited, counts = new_visit_index(CrawlConfig(visit_index="compact"))
+    state = LoopState(run_id="r", current_url="https://a.com/")
+
+    apply_updates(state, {"visited_pages": visited, "url_visit_counts": counts})
+    assert state.visited_pages is visited and state.url_visit_counts is counts
+
+    apply_updates(state, {"visited_pages": {"https://a.com/x"}, "url_visit_counts": {"https://a.com/x": 2}})
+    assert "https://a.com/x" in state.visited_pages and "https://a.com/x" not in visited
+    assert state.url_visit_counts["https://a.com/x"] == 2 and counts["https://a.com/x"] == 0
+
+def test_compact_state_cannot_become_crawl_state():
+    with pytest.raises(ValueError):
+        compact_state().to_crawl_state()